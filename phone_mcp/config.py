@@ -14,8 +14,36 @@ RECORDING_PATH = "/sdcard/Movies/"
 # Command execution timeout (seconds)
 COMMAND_TIMEOUT = 30
 
+# Timeout for single input events (tap, swipe, keyevent) (seconds)
+INPUT_COMMAND_TIMEOUT = 5
+
+# Timeout for launching an activity with "am start" (seconds)
+ACTIVITY_START_TIMEOUT = 10
+
+# Timeout for read-only device queries such as dumpsys, getprop and df (seconds)
+DEVICE_QUERY_TIMEOUT = 10
+
+# Timeout for installing an APK (seconds)
+INSTALL_TIMEOUT = 120
+
+# Idle time after which the shared adb shell session is closed (seconds)
+SHELL_IDLE_TIMEOUT = 300
+
+# Maximum number of adb shell sessions kept open for concurrent commands
+SHELL_POOL_SIZE = 4
+
+# How long a successful device connection check is reused (seconds)
+CONNECTION_CHECK_TTL = 2.0
+
+# Timeout for re-checking the last known device with "adb shell echo" (seconds)
+FAST_CONNECTION_CHECK_TIMEOUT = 0.5
+
 # Whether to automatically retry connection
 AUTO_RETRY_CONNECTION = True
 
 # Maximum number of retry attempts
 MAX_RETRY_COUNT = 3
+
+# Whether create_contact_ui taps the usual save button location (top-right
+# corner) directly instead of analyzing the screen to find the button first
+AGGRESSIVE_FAST_PATH = False
@@ -1,6 +1,101 @@
 import asyncio
+import functools
+import json
+import logging
+import re
+import shlex
 import subprocess
-from .config import COMMAND_TIMEOUT, AUTO_RETRY_CONNECTION, MAX_RETRY_COUNT
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+from .config import (
+    COMMAND_TIMEOUT,
+    AUTO_RETRY_CONNECTION,
+    MAX_RETRY_COUNT,
+    SHELL_IDLE_TIMEOUT,
+    SHELL_POOL_SIZE,
+    CONNECTION_CHECK_TTL,
+    FAST_CONNECTION_CHECK_TIMEOUT,
+)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger("phone_mcp")
+
+DEVICE_READY_MESSAGE = "Device is connected and ready."
+
+# Device serial that adb commands in the current task target; None means adb's default device
+adb_serial: ContextVar[Optional[str]] = ContextVar("adb_serial", default=None)
+
+
+def adb_prefix() -> list[str]:
+    """Return the adb argv prefix for the current task's device (``adb`` or ``adb -s SERIAL``)."""
+    serial = adb_serial.get()
+    return ["adb", "-s", serial] if serial else ["adb"]
+
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, using orjson when it is installed.
+
+    Non-ASCII characters are kept as-is in both code paths.
+
+    Args:
+        obj: Object to serialize.
+        indent (bool): Pretty-print with a two-space indent.
+
+    Returns:
+        str: JSON string.
+    """
+    if HAS_ORJSON:
+        try:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # orjson is stricter than json (e.g. very large ints); fall back
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def json_loads(data):
+    """Parse a JSON string, using orjson when it is installed.
+
+    Raises:
+        ValueError: If data is not valid JSON.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def mcp_tool_errors(default_msg: str):
+    """Decorate a coroutine tool so unexpected exceptions become a JSON error.
+
+    Args:
+        default_msg (str): Prefix of the error message, e.g. "Failed to launch app".
+
+    Returns:
+        Callable: Decorator returning {"status": "error", "message": "<default_msg>: <error>"}
+        when the wrapped coroutine raises.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in {fn.__name__}: {str(e)}")
+                return json_dumps({
+                    "status": "error",
+                    "message": f"{default_msg}: {str(e)}"
+                })
+        return wrapper
+    return decorator
 
 
 async def run_command(cmd: str, timeout: int = None) -> tuple[bool, str]:
@@ -20,6 +115,10 @@ async def run_command(cmd: str, timeout: int = None) -> tuple[bool, str]:
     if timeout is None:
         timeout = COMMAND_TIMEOUT
 
+    serial = adb_serial.get()
+    if serial and cmd.startswith("adb "):
+        cmd = f"adb -s {shlex.quote(serial)} {cmd[4:]}"
+
     try:
         process = await asyncio.create_subprocess_shell(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
@@ -33,7 +132,10 @@ async def run_command(cmd: str, timeout: int = None) -> tuple[bool, str]:
             if process.returncode == 0:
                 return True, stdout.decode("utf-8")
             else:
-                return False, stderr.decode("utf-8")
+                error = stderr.decode("utf-8")
+                if _DEVICE_LOST_RE.search(error):
+                    invalidate_device_connection()
+                return False, error
         except asyncio.TimeoutError:
             # Try to terminate the process if it timed out
             try:
@@ -46,16 +148,335 @@ async def run_command(cmd: str, timeout: int = None) -> tuple[bool, str]:
         return False, str(e)
 
 
+class AdbShellSession:
+    """A long-lived ``adb shell`` process that runs device commands one at a time.
+
+    Spawning ``adb shell <cmd>`` for every action costs a new adb client and a
+    new shell transport, which dominates short commands such as ``input tap``.
+    This session keeps one shell open, writes each command to its stdin and
+    frames the result with a unique sentinel line carrying the exit status.
+
+    Commands are serialized with a lock so their output cannot interleave.
+    If the shell dies or a command times out, the process is discarded and a
+    fresh one is started on the next call; a shell found dead when a command
+    is written is replaced and the command retried once. The shell is closed
+    after SHELL_IDLE_TIMEOUT seconds without commands.
+    """
+
+    def __init__(self):
+        self._process = None
+        self._lock = None
+        self._loop = None
+        self._idle_handle = None
+        self._sentinel = f"__PHONE_MCP_END_{uuid.uuid4().hex}__"
+
+    def _bind_loop(self):
+        """Reset per-loop state when used from a different event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._discard()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+    def _cancel_idle_timer(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _schedule_idle_close(self):
+        self._cancel_idle_timer()
+        if self._process is not None:
+            self._idle_handle = self._loop.call_later(
+                SHELL_IDLE_TIMEOUT, lambda: self._loop.create_task(self._close_idle())
+            )
+
+    async def _close_idle(self):
+        """Idle-timer callback: close the shell unless a command is using it"""
+        # A command that started after the timer fired holds the lock and
+        # reschedules the timer when it finishes
+        if self._lock.locked():
+            return
+        async with self._lock:
+            await self.close()
+
+    def _discard(self):
+        """Forget the current shell process, killing it if still running"""
+        self._cancel_idle_timer()
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _ensure_process(self):
+        if self._process is None or self._process.returncode is not None:
+            self._process = await asyncio.create_subprocess_exec(
+                "adb", "shell",
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        return self._process
+
+    async def run(self, cmd: str, timeout: int = None) -> tuple[bool, str]:
+        """Run a command in the shared device shell.
+
+        Args:
+            cmd (str): Command to run on the device, without the ``adb shell`` prefix.
+            timeout (int, optional): Timeout in seconds. Defaults to COMMAND_TIMEOUT.
+
+        Returns:
+            tuple[bool, str]: (True if the exit status was 0, combined stdout/stderr)
+
+        Raises:
+            OSError: If the adb executable cannot be started.
+        """
+        if timeout is None:
+            timeout = COMMAND_TIMEOUT
+
+        self._bind_loop()
+        async with self._lock:
+            self._cancel_idle_timer()
+            # Group the command so redirections apply to all of it, and keep it
+            # from reading the remaining stdin, which carries later commands
+            script = f"{{ {cmd}\n}} </dev/null 2>&1\necho {self._sentinel}$?\n".encode("utf-8")
+            try:
+                process = await self._write(script)
+                result = await asyncio.wait_for(self._read_result(process), timeout=timeout)
+            except asyncio.TimeoutError:
+                await self.close()
+                return False, f"Command timed out after {timeout} seconds"
+            except (ConnectionError, EOFError) as e:
+                await self.close()
+                return False, f"adb shell session closed: {e}"
+            self._schedule_idle_close()
+            return result
+
+    async def _write(self, script: bytes):
+        """Send a script to the shell, replacing a shell that died while idle"""
+        for attempt in range(2):
+            process = await self._ensure_process()
+            try:
+                process.stdin.write(script)
+                await process.stdin.drain()
+                return process
+            except ConnectionError:
+                # Nothing reached the device, so the command is safe to resend
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _read_result(self, process) -> tuple[bool, str]:
+        sentinel = self._sentinel.encode("ascii")
+        lines = []
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                raise EOFError("no output from adb shell")
+            index = line.find(sentinel)
+            if index == -1:
+                lines.append(line)
+                continue
+            # Output without a trailing newline ends up in front of the sentinel
+            lines.append(line[:index])
+            status = line[index + len(sentinel):].strip()
+            output = b"".join(lines).decode("utf-8", errors="replace")
+            return status == b"0", output
+
+    async def close(self):
+        """Terminate the shell process if one is running"""
+        self._cancel_idle_timer()
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+                process.kill()
+                await process.wait()
+            except (ProcessLookupError, ConnectionError):
+                pass
+
+
+class AdbShellPool:
+    """A fixed set of AdbShellSession objects shared by concurrent callers.
+
+    A single session runs one command at a time, so independent tool calls
+    would queue behind each other. The pool hands each command an idle
+    session from an asyncio queue and takes it back afterwards. The most
+    recently used session is handed out first, so sequential callers keep
+    reusing one warm shell and extra shells are only started under
+    concurrency.
+    """
+
+    def __init__(self, size: int = SHELL_POOL_SIZE):
+        self._sessions = [AdbShellSession() for _ in range(max(1, size))]
+        self._idle = None
+        self._loop = None
+
+    def _bind_loop(self):
+        """Rebuild the idle queue when used from a different event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.LifoQueue()
+            for session in reversed(self._sessions):
+                self._idle.put_nowait(session)
+
+    async def run(self, cmd: str, timeout: int = None) -> tuple[bool, str]:
+        """Run a command in an idle session; same contract as AdbShellSession.run"""
+        self._bind_loop()
+        idle = self._idle
+        session = await idle.get()
+        try:
+            return await session.run(cmd, timeout=timeout)
+        finally:
+            idle.put_nowait(session)
+
+    async def close(self):
+        """Terminate every shell process in the pool"""
+        for session in self._sessions:
+            await session.close()
+
+
+adb_session = AdbShellPool()
+
+
+async def run_shell(cmd: str, timeout: int = None) -> tuple[bool, str]:
+    """Run a device shell command through a pooled persistent adb shell session.
+
+    Falls back to a one-off ``adb shell`` invocation via run_command when the
+    session cannot be used, or when adb_serial selects a specific device for
+    the current task. Only shell commands belong here; host-side adb
+    commands (push, pull, install, devices) still go through run_command.
+
+    Args:
+        cmd (str): Command to run on the device, without the ``adb shell`` prefix.
+        timeout (int, optional): Timeout in seconds. Defaults to COMMAND_TIMEOUT.
+
+    Returns:
+        tuple[bool, str]: Same contract as run_command
+    """
+    if adb_serial.get() is None:
+        try:
+            return await adb_session.run(cmd, timeout=timeout)
+        except OSError as e:
+            logger.debug(f"adb shell session unavailable, falling back: {str(e)}")
+    # The shared session talks to the default device only
+    return await run_command(f"adb shell {shlex.quote(cmd)}", timeout=timeout)
+
+
+async def adb_batch(commands: list[str], timeout: int = None) -> tuple[bool, str]:
+    """Run several device shell commands as one ``&&`` chain in a single round-trip.
+
+    The chain stops at the first failing command.
+
+    Args:
+        commands (list[str]): Commands without the ``adb shell`` prefix.
+        timeout (int, optional): Timeout in seconds for the whole chain.
+
+    Returns:
+        tuple[bool, str]: Same contract as run_command
+    """
+    return await run_shell(" && ".join(commands), timeout=timeout)
+
+
+# adb client errors meaning the cached "ready" verdict no longer holds
+_DEVICE_LOST_RE = re.compile(r"device (?:'[^']*' )?not found|device offline|no devices")
+
+# Time of the last "ready" verdict and the check currently in flight, keyed
+# by adb_serial (None for the default device) and only valid for the event
+# loop they were recorded on
+_connection_loop = None
+_connection_ready_at = {}
+_connection_check_tasks = {}
+
+# Serial of the device found by the last full "adb devices" probe
+_last_serial = None
+
+# Bumped whenever cached connection verdicts are dropped, so per-device caches
+# elsewhere can tell that the device may have changed
+_connection_generation = 0
+
+
 async def check_device_connection() -> str:
     """Check if an Android device is connected via ADB.
 
     Verifies that an Android device is properly connected and recognized
-    by ADB, which is required for all other functions to work.
+    by ADB, which is required for all other functions to work. A "ready"
+    verdict is reused for CONNECTION_CHECK_TTL seconds, and concurrent
+    callers share a single in-flight probe; both are kept per adb_serial,
+    so each device selected by a task gets its own verdict. Once a device has been found,
+    the probe first pings that device directly and only falls back to a
+    full ``adb devices`` scan if the ping fails.
 
     Returns:
         str: Status message indicating whether a device is connected and
              ready, or an error message if no device is found.
     """
+    global _connection_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _connection_loop:
+        _connection_loop = loop
+        _connection_ready_at.clear()
+        _connection_check_tasks.clear()
+
+    serial = adb_serial.get()
+    ready_at = _connection_ready_at.get(serial)
+    if ready_at is not None and time.monotonic() - ready_at < CONNECTION_CHECK_TTL:
+        return DEVICE_READY_MESSAGE
+
+    task = _connection_check_tasks.get(serial)
+    if task is None or task.done():
+        # The task copies the current context, so it probes this serial
+        task = _connection_check_tasks[serial] = asyncio.ensure_future(_probe_device_connection())
+    status = await asyncio.shield(task)
+    if status == DEVICE_READY_MESSAGE:
+        _connection_ready_at[serial] = time.monotonic()
+    else:
+        _connection_ready_at.pop(serial, None)
+    return status
+
+
+def invalidate_device_connection() -> None:
+    """Forget the cached "ready" verdicts so the next checks probe adb again."""
+    global _connection_generation
+    _connection_generation += 1
+    _connection_ready_at.clear()
+
+
+def device_cache_key() -> Optional[tuple]:
+    """Key for caching facts about the device this task's adb commands go to.
+
+    Combines the requested serial (else the one found by the last full
+    connection check) with a counter bumped by invalidate_device_connection,
+    so entries stop matching once the device was lost or replaced.
+
+    Returns:
+        tuple: (serial, generation), or None if the serial is not known yet
+    """
+    serial = adb_serial.get() or _last_serial
+    return (serial, _connection_generation) if serial else None
+
+
+async def _probe_device_connection() -> str:
+    """Ping the last known device, else run ``adb devices`` (restarting the server if needed).
+
+    When adb_serial is set, only that device counts as connected.
+    """
+    global _last_serial
+    requested = adb_serial.get()
+    serial = requested or _last_serial
+    if serial:
+        token = adb_serial.set(serial)
+        try:
+            success, output = await run_command(
+                "adb shell echo ready", timeout=FAST_CONNECTION_CHECK_TIMEOUT
+            )
+        finally:
+            adb_serial.reset(token)
+        if success and output.strip() == "ready":
+            return DEVICE_READY_MESSAGE
+
     retry_count = 0
     while True:
         success, output = await run_command("adb devices")
@@ -67,12 +488,22 @@ async def check_device_connection() -> str:
             # Check if there are lines besides "List of devices attached" and if there are devices with "device" status
             device_connected = False
             for line in lines[1:]:  # Skip the first line "List of devices attached"
-                if line.strip() and "\tdevice" in line:
+                line_serial, _, state = line.strip().partition("\t")
+                if state.strip() != "device":
+                    continue
+                if requested is None:
+                    device_connected = True
+                    _last_serial = line_serial
+                    break
+                if line_serial == requested:
                     device_connected = True
                     break
 
             if device_connected:
-                return "Device is connected and ready."
+                return DEVICE_READY_MESSAGE
+            elif requested is not None:
+                # Restarting the adb server would also drop the other devices
+                return f"Device {requested} not found. Please connect it and ensure USB debugging is enabled."
             else:
                 if AUTO_RETRY_CONNECTION and retry_count < MAX_RETRY_COUNT:
                     # Try restarting ADB server
@@ -33,7 +33,7 @@ from .adb_tools import (
 )
 
 # Basic UI inspection
-from .ui import dump_ui, find_element_by_text, find_element_by_id, tap_element
+from .ui import dump_ui, find_element_by_text, find_element_by_id, tap_element, tap_many
 
 # Enhanced UI functionality
 from .ui_enhanced import (
@@ -76,6 +76,7 @@ __all__ = [
     "find_element_by_text",
     "find_element_by_id",
     "tap_element",
+    "tap_many",
     "find_element_by_content_desc",
     "find_element_by_class",
     "find_clickable_elements",
@@ -1,13 +1,42 @@
 """App-related phone control functions."""
 
-import json
 import re
+import shlex
 import logging
-from ..core import run_command, check_device_connection
-from typing import Optional, Dict
+from ..core import run_command, run_shell, check_device_connection, adb_serial, json_dumps, mcp_tool_errors
+from typing import Optional, Dict, Tuple
 
 logger = logging.getLogger("phone_mcp")
 
+# (adb serial, package name) -> "package/activity" launcher component, resolved
+# once per package and device
+_launcher_activity_cache: Dict[Tuple[Optional[str], str], str] = {}
+
+
+async def _resolve_launcher_activity(package_name: str) -> Optional[str]:
+    """Resolve the launcher component of a package, caching the result
+
+    Returns:
+        str: Component in "package/activity" form, or None if it cannot be resolved
+    """
+    cache_key = (adb_serial.get(), package_name)
+    component = _launcher_activity_cache.get(cache_key)
+    if component:
+        return component
+
+    success, output = await run_shell(
+        "cmd package resolve-activity --brief -c android.intent.category.LAUNCHER "
+        f"{shlex.quote(package_name)}"
+    )
+    if not success or not output.strip():
+        return None
+    # --brief prints the match details first and the component on the last line
+    component = output.strip().splitlines()[-1].strip()
+    if "/" not in component:
+        return None
+    _launcher_activity_cache[cache_key] = component
+    return component
+
 
 async def list_installed_apps(
     only_system=False, only_third_party=True, page=1, page_size=10, basic=True
@@ -48,10 +77,10 @@ async def list_installed_apps(
         page = int(page)
         page_size = int(page_size)
     except (ValueError, TypeError):
-        return json.dumps({
+        return json_dumps({
             "status": "error",
             "message": "Invalid page or page_size parameter. Must be integers."
-        }, indent=2)
+        }, indent=True)
 
     # Check for connected device
     connection_status = await check_device_connection()
@@ -69,13 +98,13 @@ async def list_installed_apps(
     success, output = await run_command(cmd)
 
     if not success:
-        return json.dumps(
+        return json_dumps(
             {
                 "status": "error",
                 "message": "Failed to get installed apps",
                 "output": output,
             },
-            indent=2,
+            indent=True,
         )
 
     # Process the output - convert package list to array
@@ -156,7 +185,7 @@ async def list_installed_apps(
     elif only_third_party:
         result["type"] = "third_party"
     
-    return json.dumps(result, indent=2)
+    return json_dumps(result, indent=True)
 
 
 async def list_app_activities(package_name: str):
@@ -178,13 +207,13 @@ async def list_app_activities(package_name: str):
     success, output = await run_command(cmd)
 
     if not success:
-        return json.dumps(
+        return json_dumps(
             {
                 "status": "error",
                 "message": f"Failed to get activities for {package_name}",
                 "output": output,
             },
-            indent=2,
+            indent=True,
         )
 
     activities = []
@@ -198,14 +227,14 @@ async def list_app_activities(package_name: str):
                 activity = parts[0].strip()
                 activities.append(activity)
 
-    return json.dumps(
+    return json_dumps(
         {
             "status": "success",
             "package": package_name,
             "count": len(activities),
             "activities": activities,
         },
-        indent=2,
+        indent=True,
     )
 
 
@@ -297,6 +326,7 @@ async def set_alarm(hour: int, minute: int, label: str = "Alarm") -> str:
         return f"Failed to set alarm: {output}"
 
 
+@mcp_tool_errors("Failed to launch app")
 async def launch_app_activity(package_name: str, activity_name: str = None) -> str:
     """Launch an app using package name and optionally an activity name
     
@@ -333,34 +363,66 @@ async def launch_app_activity(package_name: str, activity_name: str = None) -> s
         # Launch Android settings
         result = await launch_app_activity("com.android.settings")
     """
-    try:
-        if activity_name:
-            # Launch specific activity
-            cmd = f"adb shell am start -n {package_name}/{activity_name}"
-        else:
-            # Launch app's main activity
-            cmd = f"adb shell monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
-        
-        success, output = await run_command(cmd)
-        
-        if success:
-            return json.dumps({
-                "status": "success",
-                "message": f"Successfully launched {package_name}"
-            })
-        else:
-            return json.dumps({
-                "status": "error",
-                "message": f"Failed to launch app: {output}"
-            })
-    except Exception as e:
-        logger.error(f"Error launching app {package_name}: {str(e)}")
-        return json.dumps({
+    if activity_name:
+        # Launch specific activity
+        component = f"{package_name}/{activity_name}"
+    else:
+        # Launch app's main activity; monkey is only used when the launcher
+        # activity cannot be resolved, as it starts a much slower process
+        component = await _resolve_launcher_activity(package_name)
+    if component:
+        # -W returns once the activity has been launched
+        parts = ["am", "start", "-W", "-n", component]
+    else:
+        parts = ["monkey", "-p", package_name, "-c", "android.intent.category.LAUNCHER", "1"]
+    cmd = " ".join(shlex.quote(p) for p in parts)
+    
+    success, output = await run_shell(cmd)
+    
+    if success:
+        return json_dumps({
+            "status": "success",
+            "message": f"Successfully launched {package_name}"
+        })
+    else:
+        return json_dumps({
             "status": "error",
-            "message": f"Failed to launch app: {str(e)}"
+            "message": f"Failed to launch app: {output}"
         })
 
 
+async def _launch_intent_dict(intent_action: str, intent_type: Optional[str] = None,
+                              extras: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Launch an intent and return the result as a dict (see launch_intent)"""
+    # Construct the command as a token list; every token is quoted for the
+    # device shell, so values may contain spaces, quotes, $ or backslashes
+    parts = ["am", "start", "-a", intent_action]
+    
+    # Add type if provided
+    if intent_type:
+        parts += ["-t", intent_type]
+    
+    # Add extras if provided
+    if extras:
+        for key, value in extras.items():
+            parts += ["--es", key, str(value)]
+    
+    cmd = " ".join(shlex.quote(p) for p in parts)
+    success, output = await run_shell(cmd)
+    
+    if success:
+        return {
+            "status": "success",
+            "message": f"Successfully launched intent: {intent_action}"
+        }
+    else:
+        return {
+            "status": "error",
+            "message": f"Failed to launch intent: {output}"
+        }
+
+
+@mcp_tool_errors("Failed to launch intent")
 async def launch_intent(intent_action: str, intent_type: Optional[str] = None, extras: Optional[Dict[str, str]] = None) -> str:
     """Launch an activity using Android intent system
     
@@ -413,36 +475,4 @@ async def launch_intent(intent_action: str, intent_type: Optional[str] = None, e
             {"android.intent.extra.TEXT": "Hello world!"}
         )
     """
-    try:
-        # Construct base command
-        cmd = f"adb shell am start -a {intent_action}"
-        
-        # Add type if provided
-        if intent_type:
-            cmd += f" -t {intent_type}"
-        
-        # Add extras if provided
-        if extras:
-            for key, value in extras.items():
-                # Escape quotes in value
-                value = value.replace('"', '\\"')
-                cmd += f' --es {key} "{value}"'
-        
-        success, output = await run_command(cmd)
-        
-        if success:
-            return json.dumps({
-                "status": "success",
-                "message": f"Successfully launched intent: {intent_action}"
-            })
-        else:
-            return json.dumps({
-                "status": "error",
-                "message": f"Failed to launch intent: {output}"
-            })
-    except Exception as e:
-        logger.error(f"Error launching intent {intent_action}: {str(e)}")
-        return json.dumps({
-            "status": "error",
-            "message": f"Failed to launch intent: {str(e)}"
-        })
+    return json_dumps(await _launch_intent_dict(intent_action, intent_type, extras))
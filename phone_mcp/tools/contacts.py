@@ -4,9 +4,44 @@ This module provides functions to access and manage contacts on the phone.
 """
 
 import asyncio
-import json
 import re
-from ..core import run_command
+import shlex
+from itertools import chain
+from ..core import run_command, run_shell, adb_batch, json_dumps, mcp_tool_errors
+from ..config import AGGRESSIVE_FAST_PATH
+from .ui import invalidate_screen_caches
+
+# Labels of the button that saves a contact form
+_CONFIRM_SET = frozenset({"Save", "Done", "Confirm", "OK", "✓", "√"})
+# Any confirmation label inside a longer text, ignoring case. Word labels must
+# stand alone so that e.g. "Facebook" does not count as "OK".
+_CONFIRM_RE = re.compile(r"\b(?:Save|Done|Confirm|OK)\b|[✓√]", re.IGNORECASE)
+
+# How often and how long to poll the contacts provider for a saved contact
+_SAVE_CONFIRM_ATTEMPTS = 8
+_SAVE_CONFIRM_INTERVAL = 0.25  # seconds
+
+# Save buttons of contact editors usually sit near the top-right corner, at
+# about 90% of the width and 10% of the height
+_CORNER_X_PER_10 = 9
+_CORNER_Y_PER_10 = 1
+
+
+async def _confirm_corner_coords() -> tuple[int, int]:
+    """Tap coordinates for the top-right save button location, from the memoized screen size"""
+    from .interactions import get_screen_size_cached
+    
+    size = await get_screen_size_cached()
+    width = size.get("width") or 1080
+    height = size.get("height") or 1920
+    return width * _CORNER_X_PER_10 // 10, height * _CORNER_Y_PER_10 // 10
+
+
+async def _fast_tap(x: int, y: int) -> bool:
+    """Tap through the persistent shell, skipping tap_screen's checks and delay"""
+    success, _ = await run_shell(f"input tap {x} {y}")
+    invalidate_screen_caches()
+    return success
 
 
 async def _check_contact_permissions():
@@ -83,7 +118,7 @@ async def get_contacts(limit=20):
                     contacts.append(contact)
 
             if contacts:
-                return json.dumps(contacts, indent=2)
+                return json_dumps(contacts, indent=True)
 
         # If our first approach fails, try the original fallback approaches
         # Other methods are kept as fallbacks but the main method should work on most devices
@@ -110,7 +145,7 @@ async def get_contacts(limit=20):
                 # Limit the results if needed
                 if len(contacts) > limit:
                     contacts = contacts[:limit]
-                return json.dumps(contacts, indent=2)
+                return json_dumps(contacts, indent=True)
 
         # Further fallback methods continue...
         # These are kept for device compatibility but rarely needed now
@@ -202,7 +237,7 @@ async def get_contacts(limit=20):
         if limit and len(contacts) > limit:
             contacts = contacts[:limit]
 
-        return json.dumps(contacts, indent=2)
+        return json_dumps(contacts, indent=True)
     except Exception as e:
         return f"Error retrieving contacts: {str(e)}"
 
@@ -281,7 +316,58 @@ async def create_contact(name: str, phone_number: str, email: str = None) -> str
         return f"Error creating contact: {str(e)}"
 
 
-async def create_contact_ui(name: str, phone: str) -> str:
+async def _count_contacts_named(name: str) -> int:
+    """Number of non-deleted raw contacts whose display name is exactly name"""
+    where = "display_name='{}' AND deleted=0".format(name.replace("'", "''"))
+    success, output = await run_shell(
+        "content query --uri content://com.android.contacts/raw_contacts"
+        f" --projection _id --where {shlex.quote(where)}"
+    )
+    return output.count("Row: ") if success else 0
+
+
+async def _create_contact_batched(name: str, phone: str) -> tuple[bool, bool]:
+    """Launch the contact form and try to save it in one adb shell round-trip
+    
+    Chains the INSERT intent, a short wait and a tap on the usual save button
+    location (see _confirm_corner_coords). The tap is skipped if the intent
+    reports an error, and the save counts as confirmed only once the contacts
+    provider holds one more contact with this name than before.
+    
+    Returns:
+        tuple[bool, bool]: (form launched, contact saved)
+    """
+    existing = await _count_contacts_named(name)
+    tap_x, tap_y = await _confirm_corner_coords()
+    intent_cmd = " ".join([
+        "am start -a android.intent.action.INSERT -t vnd.android.cursor.dir/contact",
+        "--es name", shlex.quote(name),
+        "--es phone", shlex.quote(phone),
+    ])
+    success, output = await adb_batch([
+        # am start can print an error and still exit 0; stop the chain then
+        f"out=$({intent_cmd} 2>&1)",
+        'echo "$out"',
+        'case "$out" in *Error*) false;; esac',
+        "sleep 1",
+        f"input tap {tap_x} {tap_y}",
+    ])
+    invalidate_screen_caches()
+    if not success:
+        # Report the form as launched when only the tap failed, so the
+        # fallback does not open a second editor
+        return "Starting" in output and "Error" not in output, False
+    
+    for attempt in range(_SAVE_CONFIRM_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(_SAVE_CONFIRM_INTERVAL)
+        if await _count_contacts_named(name) > existing:
+            return True, True
+    return True, False
+
+
+@mcp_tool_errors("Failed to create contact")
+async def create_contact_ui(name: str, phone: str, fast_path: bool = True) -> str:
     """Create a new contact with the given name and phone number using UI automation
     
     This function uses UI automation to create a new contact on the device. It:
@@ -291,9 +377,14 @@ async def create_contact_ui(name: str, phone: str) -> str:
     4. Analyzes the screen to find confirmation buttons
     5. Taps the confirmation button to save the contact
     
+    With fast_path, steps 1-5 are first attempted as a single batched adb shell
+    command that taps the usual save button location; the screen analysis steps
+    only run if the contacts provider does not show the new contact afterwards.
+    
     Args:
         name (str): The contact's full name
         phone (str): The phone number for the contact
+        fast_path (bool, optional): Try the batched launch-and-save first. Defaults to True.
     
     Returns:
         str: JSON string with operation result containing:
@@ -327,109 +418,95 @@ async def create_contact_ui(name: str, phone: str) -> str:
         This is China Mobile's customer service number, which is suitable for testing
         environments and easy to recognize.
     """
-    try:
-        # Import app launcher functions
-        from .apps import launch_intent
-        from .ui_enhanced import wait_for_element
-        from .screen_interface import analyze_screen, tap_screen
-        import json
-        import logging
-        
-        logger = logging.getLogger("phone_mcp")
-        
-        # Step 1: Launch the contact creation intent
+    # Import app launcher functions
+    from .apps import _launch_intent_dict
+    from .ui_enhanced import wait_for_element_eventdriven
+    from .screen_interface import _analyze_screen_dict, _tap_element_by_text
+    import logging
+    
+    logger = logging.getLogger("phone_mcp")
+    
+    launched = False
+    if fast_path:
+        launched, saved = await _create_contact_batched(name, phone)
+        if saved:
+            return json_dumps({
+                "status": "success",
+                "message": f"Successfully created contact {name} with phone {phone}"
+            })
+        logger.debug("Batched contact save not confirmed, falling back to screen analysis")
+    
+    # Step 1: Launch the contact creation intent (unless the batch already did)
+    if not launched:
         extras = {
             "name": name,
             "phone": phone
         }
-        intent_result = await launch_intent(
+        intent_data = await _launch_intent_dict(
             "android.intent.action.INSERT", 
             "vnd.android.cursor.dir/contact",
             extras
         )
-        
-        intent_data = json.loads(intent_result)
         if intent_data.get("status") != "success":
-            return intent_result
-        
-        # Step 2: Wait for the contact form to appear
-        await wait_for_element("text", "Contact", timeout=5)  # Wait for Contact form
-        
-        # Step 3: Analyze screen to find confirmation button
-        screen_result = await analyze_screen()
-        screen_data = json.loads(screen_result)
-        
+            return json_dumps(intent_data)
+    
+    # Step 2: Wait for the contact form to appear
+    await wait_for_element_eventdriven("text", "Contact", timeout_seconds=5)  # Wait for Contact form
+    
+    # Step 3: Analyze screen to find confirmation button. If the analysis is
+    # skipped or fails, the corner tap below still works since it only
+    # needs the screen size.
+    screen_data = {}
+    if not AGGRESSIVE_FAST_PATH:
+        screen_data = await _analyze_screen_dict()
         if screen_data.get("status") != "success":
-            return json.dumps({
-                "status": "error",
-                "message": "Failed to analyze screen to find confirmation button"
-            })
-        
-        # Look for confirmation button - common patterns
-        confirmation_buttons = ["Save", "Done", "Confirm", "OK", "✓", "√"]
-        found_button = None
-        
-        # Check suggested actions first
-        for action in screen_data.get("suggested_actions", []):
-            if action.get("action") == "tap_element":
-                text = action.get("element_text", "")
-                if text in confirmation_buttons or any(btn in text for btn in confirmation_buttons):
-                    found_button = text
-                    break
-        
-        # If not found in suggested actions, search in all clickable elements
-        if not found_button:
-            clickables = screen_data.get("screen_analysis", {}).get("notable_clickables", [])
-            for element in clickables:
-                text = element.get("text", "")
-                if text in confirmation_buttons or any(btn in text for btn in confirmation_buttons):
-                    found_button = text
-                    break
+            logger.warning(f"Screen analysis failed: {screen_data.get('message')}")
+            screen_data = {}
+    
+    # Look for confirmation button - common patterns. Suggested actions and
+    # clickable elements are scanned in one pass; an exact label wins at
+    # once, otherwise the best partial match is kept (prefix over substring).
+    candidates = chain(
+        (action.get("element_text", "") for action in screen_data.get("suggested_actions", [])
+         if action.get("action") == "tap_element"),
+        (element.get("text", "") for element in
+         screen_data.get("screen_analysis", {}).get("notable_clickables", [])),
+    )
+    found_button = None
+    best_rank = 3
+    for text in candidates:
+        if text in _CONFIRM_SET:
+            found_button = text
+            break
+        match = _CONFIRM_RE.search(text)
+        if match:
+            rank = 1 if match.start() == 0 else 2
+            if rank < best_rank:
+                found_button, best_rank = text, rank
+    
+    # As a last resort, look for confirmation buttons in top-right corner
+    if not found_button:
+        # Try to tap top-right corner where save button is often located
+        tap_x, tap_y = await _confirm_corner_coords()
         
-        # As a last resort, look for confirmation buttons in top-right corner
-        if not found_button:
-            # Try to tap top-right corner where save button is often located
-            size = screen_data.get("screen_size", {})
-            width = size.get("width", 1080)
-            
-            # Create tap action at approximately 90% of width and 10% of height
-            tap_x = int(width * 0.9)
-            tap_y = int(size.get("height", 1920) * 0.1)
-            
-            tap_result = await tap_screen(tap_x, tap_y)
-            tap_data = json.loads(tap_result)
-            
-            return json.dumps({
-                "status": "partial_success" if tap_data.get("status") == "success" else "error",
-                "message": "Attempted to tap potential confirmation button location. Please verify contact creation."
-            })
+        tapped = await _fast_tap(tap_x, tap_y)
         
-        # Step 4: Click the confirmation button if found
-        if found_button:
-            # Import in a narrower scope to avoid circular imports
-            from .screen_interface import interact_with_screen
-            tap_result = await interact_with_screen("tap", {"element_text": found_button})
-            tap_data = json.loads(tap_result)
-            
-            if tap_data.get("status") == "success":
-                return json.dumps({
-                    "status": "success",
-                    "message": f"Successfully created contact {name} with phone {phone}"
-                })
-            else:
-                return json.dumps({
-                    "status": "error",
-                    "message": f"Failed to tap confirmation button: {tap_data.get('message')}"
-                })
-        else:
-            return json.dumps({
-                "status": "error",
-                "message": "Could not find confirmation button"
-            })
+        return json_dumps({
+            "status": "partial_success" if tapped else "error",
+            "message": "Attempted to tap potential confirmation button location. Please verify contact creation."
+        })
     
-    except Exception as e:
-        logger.error(f"Error creating contact: {str(e)}")
-        return json.dumps({
+    # Step 4: Click the confirmation button
+    tap_data = await _tap_element_by_text(found_button)
+    
+    if tap_data.get("status") == "success":
+        return json_dumps({
+            "status": "success",
+            "message": f"Successfully created contact {name} with phone {phone}"
+        })
+    else:
+        return json_dumps({
             "status": "error",
-            "message": f"Failed to create contact: {str(e)}"
+            "message": f"Failed to tap confirmation button: {tap_data.get('message')}"
         })
+
@@ -5,7 +5,10 @@ This module provides functions to interact with the device screen and input.
 import asyncio
 import json
 import re
-from ..core import run_command, check_device_connection
+import shlex
+from ..core import run_command, run_shell, check_device_connection
+from ..config import COMMAND_TIMEOUT
+from .ui import invalidate_screen_caches
 import logging
 import urllib.parse
 try:
@@ -17,6 +20,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Screen size shared by every caller, see get_screen_size_cached()
+_screen_size_cache = None
+# Lock serializing the first query, only valid for the event loop it was created on
+_screen_size_lock = None
+_screen_size_loop = None
+
 
 async def get_screen_size():
     """Get the screen size of the device.
@@ -64,6 +73,44 @@ async def get_screen_size():
     )
 
 
+async def get_screen_size_cached():
+    """Return the device screen size as a dict, querying get_screen_size only once per session
+
+    Screen resolution does not change while a device stays connected, so the
+    size is kept until clear_screen_size_cache() is called (e.g. after rotation
+    or switching devices).
+
+    Returns:
+        dict: Parsed get_screen_size result. Only results with a valid width
+              and height are cached.
+    """
+    global _screen_size_cache, _screen_size_lock, _screen_size_loop
+    if _screen_size_cache is not None:
+        return _screen_size_cache
+
+    loop = asyncio.get_running_loop()
+    if _screen_size_loop is not loop:
+        _screen_size_loop = loop
+        _screen_size_lock = asyncio.Lock()
+    async with _screen_size_lock:
+        if _screen_size_cache is None:
+            try:
+                size = json.loads(await get_screen_size())
+            except ValueError:
+                return {}
+            if isinstance(size, dict) and size.get("width") and size.get("height"):
+                _screen_size_cache = size
+            else:
+                return size if isinstance(size, dict) else {}
+    return _screen_size_cache
+
+
+def clear_screen_size_cache():
+    """Forget the cached screen size so the next call queries the device again"""
+    global _screen_size_cache
+    _screen_size_cache = None
+
+
 async def tap_screen(x: int, y: int, delay_seconds: float = 2.0):
     """Tap on the specified coordinates on the device screen.
 
@@ -80,22 +127,18 @@ async def tap_screen(x: int, y: int, delay_seconds: float = 2.0):
     if "ready" not in connection_status:
         return connection_status
 
-    # First get screen size to validate coordinates
-    size_response = await get_screen_size()
-    try:
-        size_data = json.loads(size_response)
-        if size_data.get("status") == "success":
-            width, height = size_data.get("width"), size_data.get("height")
-
-            # Validate coordinates are within screen boundaries
-            if x < 0 or x > width or y < 0 or y > height:
-                return f"Invalid coordinates ({x},{y}). Device screen size is {width}x{height}."
-    except:
-        # Continue even if we couldn't validate the coordinates
-        pass
-
-    cmd = f"adb shell input tap {x} {y}"
-    success, output = await run_command(cmd)
+    # First get screen size to validate coordinates (queried once per session)
+    size_data = await get_screen_size_cached()
+    if size_data.get("status") == "success":
+        width, height = size_data.get("width"), size_data.get("height")
+
+        # Validate coordinates are within screen boundaries
+        if x < 0 or x > width or y < 0 or y > height:
+            return f"Invalid coordinates ({x},{y}). Device screen size is {width}x{height}."
+
+    cmd = f"input tap {x} {y}"
+    success, output = await run_shell(cmd)
+    invalidate_screen_caches()
 
     # Add delay after tap operation for TV loading
     if delay_seconds > 0:
@@ -130,8 +173,10 @@ async def swipe_screen(x1: int, y1: int, x2: int, y2: int, duration_ms: int = 30
     if duration_ms < 0:
         return "Duration must be a positive value"
 
-    cmd = f"adb shell input swipe {x1} {y1} {x2} {y2} {duration_ms}"
-    success, output = await run_command(cmd)
+    cmd = f"input swipe {x1} {y1} {x2} {y2} {duration_ms}"
+    # The input command only returns once the gesture has finished
+    success, output = await run_shell(cmd, timeout=duration_ms / 1000 + COMMAND_TIMEOUT)
+    invalidate_screen_caches()
 
     # Add delay after swipe operation for TV loading
     if delay_seconds > 0:
@@ -186,8 +231,9 @@ async def press_key(keycode: str, delay_seconds: float = 2.0):
     # Check if the keycode is in our common keycodes
     actual_keycode = common_keycodes.get(keycode.lower(), keycode)
 
-    cmd = f"adb shell input keyevent {actual_keycode}"
-    success, output = await run_command(cmd)
+    cmd = f"input keyevent {actual_keycode}"
+    success, output = await run_shell(cmd)
+    invalidate_screen_caches()
 
     # Add delay after key press operation for TV loading
     if delay_seconds > 0:
@@ -250,10 +296,10 @@ async def input_text(text: str, delay_seconds: float = 2.0):
             }, ensure_ascii=False)
 
     # Method 1: Try with the standard input text command first
-    # Need to properly escape special characters for the shell
-    escaped_text = text.replace('"', '\\"')
-    cmd = f'adb shell input text "{escaped_text}"'
-    success, output = await run_command(cmd)
+    # Quote for the device shell so $, backticks and quotes are typed literally
+    cmd = f"input text {shlex.quote(text)}"
+    success, output = await run_shell(cmd)
+    invalidate_screen_caches()
 
     # If successful, return success
     if success:
@@ -273,8 +319,9 @@ async def input_text(text: str, delay_seconds: float = 2.0):
     try:
         # URL encode the text to handle special characters properly
         encoded_text = urllib.parse.quote(text)
-        uri_cmd = f'adb shell am broadcast -a ADB_INPUT_TEXT --es msg "{encoded_text}"'
-        uri_success, uri_output = await run_command(uri_cmd)
+        uri_cmd = f'am broadcast -a ADB_INPUT_TEXT --es msg "{encoded_text}"'
+        uri_success, uri_output = await run_shell(uri_cmd)
+        invalidate_screen_caches()
         
         if uri_success:
             # Add delay after text input operation for TV loading
@@ -294,17 +341,16 @@ async def input_text(text: str, delay_seconds: float = 2.0):
         # Input each character individually
         for char in text:
             if char == ' ':
-                char_cmd = "adb shell input keyevent 62"  # Space keycode
+                char_cmd = "input keyevent 62"  # Space keycode
             else:
-                # Escape any quotes in the character
-                escaped_char = char.replace('"', '\\"')
-                char_cmd = f'adb shell input text "{escaped_char}"'
+                char_cmd = f"input text {shlex.quote(char)}"
             
-            char_success, char_output = await run_command(char_cmd)
+            char_success, char_output = await run_shell(char_cmd)
             if not char_success:
                 logger.warning(f"Failed to input character '{char}': {char_output}")
             # Add a small delay between characters
             await asyncio.sleep(0.2)
+        invalidate_screen_caches()
         
         success_msg = f"Successfully input text (char-by-char): '{original_text}'"
         if original_text != text:
@@ -329,9 +375,10 @@ async def input_text(text: str, delay_seconds: float = 2.0):
                     logger.warning(f"Unsupported character '{char}' in keyevent method")
                     continue
                 
-                key_cmd = f"adb shell input keyevent {keycode}"
-                await run_command(key_cmd)
+                key_cmd = f"input keyevent {keycode}"
+                await run_shell(key_cmd)
                 await asyncio.sleep(0.2)
+            invalidate_screen_caches()
             
             # Add delay after text input operation for TV loading
             if delay_seconds > 0:
@@ -368,6 +415,7 @@ async def open_url(url: str, delay_seconds: float = 2.0):
 
     cmd = f'adb shell am start -a android.intent.action.VIEW -d "{url}"'
     success, output = await run_command(cmd)
+    invalidate_screen_caches()
 
     # Add delay after URL opening for TV loading
     if delay_seconds > 0:
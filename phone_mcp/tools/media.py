@@ -5,7 +5,8 @@ import subprocess
 import os.path
 import time
 import threading
-from ..core import run_command
+from typing import Tuple
+from ..core import run_command, adb_prefix
 from ..config import SCREENSHOT_PATH, RECORDING_PATH, COMMAND_TIMEOUT
 
 
@@ -82,47 +83,103 @@ async def take_screenshot() -> str:
         else:
             return f"Screenshot taken and saved to device at {storage_path}"
     else:
-        # Direct capture to stdout as a last resort - platform independent approach
-        import tempfile
-        import os
-
-        # Create a temporary file to store the output
-        temp_file = os.path.join(tempfile.gettempdir(), "screenshot_temp.png")
+        # Direct capture to stdout as a last resort - platform independent approach.
+        # exec-out is binary-safe, so no line-ending repair or temp file is needed
         screenshot_file = "./screenshot_direct.png"
-
-        # First capture to temp file
-        cmd = f"adb shell screencap -p > {temp_file}"
-        direct_success, direct_output = await run_command(cmd)
+        direct_success, data = await take_screenshot_raw()
 
         if direct_success:
             try:
-                # Open and process the file to handle line ending differences (instead of using sed)
-                with open(temp_file, "rb") as f_in:
-                    data = f_in.read()
-
-                # Replace \r\n with \n (Windows-safe approach)
-                if b"\r\n" in data:
-                    data = data.replace(b"\r\n", b"\n")
-                elif b"\r" in data:
-                    data = data.replace(b"\r", b"")
-
-                # Write the processed data
                 with open(screenshot_file, "wb") as f_out:
                     f_out.write(data)
 
-                # Remove temp file
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-
                 return "Screenshot taken and saved to ./screenshot_direct.png"
             except Exception as e:
                 return f"Screenshot captured but failed to process: {str(e)}"
         else:
+            direct_output = data.decode("utf-8", errors="replace")
             return f"Failed to take screenshot: {direct_output}. Make sure the device is properly connected."
 
 
+async def take_screenshot_raw() -> Tuple[bool, bytes]:
+    """Capture the current screen as PNG bytes without touching device storage.
+
+    Streams ``screencap`` output over ``adb exec-out`` so callers that only need
+    the image data (e.g. to base64-encode it into a response) skip the file
+    round-trip and message parsing done by take_screenshot.
+
+    Returns:
+        Tuple[bool, bytes]: (True, PNG bytes) on success, or (False, error output)
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *adb_prefix(), "exec-out", "screencap", "-p",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        return False, str(e).encode()
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), COMMAND_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return False, b"Screenshot capture timed out"
+
+    if process.returncode != 0 or not stdout:
+        return False, stderr
+    return True, stdout
+
+
+async def record_screen_raw(duration_seconds: int, output_file: str) -> Tuple[bool, str]:
+    """Stream a raw H.264 screen recording straight into a local file.
+
+    ``screenrecord`` writes to stdout over ``adb exec-out``, so the recording
+    never touches device storage and needs no separate pull afterwards.
+    Older devices that cannot write H.264 to stdout fail here, and callers
+    should fall back to recording on the device.
+
+    Args:
+        duration_seconds: Recording length in seconds
+        output_file: Local path that receives the H.264 stream. The data is a bare
+            elementary stream, not an MP4 container, so name it ``.h264``
+
+    Returns:
+        Tuple[bool, str]: (True, output_file) on success, or (False, error message).
+        No file is left behind on failure.
+    """
+    try:
+        f = open(output_file, "wb")
+    except OSError as e:
+        return False, str(e)
+
+    with f:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *adb_prefix(), "exec-out", "screenrecord",
+                "--time-limit", str(duration_seconds), "--output-format=h264", "-",
+                stdout=f,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            process, stderr = None, str(e).encode()
+        else:
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(), duration_seconds + COMMAND_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                stderr = b"Screen recording timed out"
+
+    if process is None or process.returncode != 0 or os.path.getsize(output_file) == 0:
+        os.remove(output_file)
+        return False, stderr.decode("utf-8", errors="replace")
+    return True, output_file
+
+
 def _download_recording_background(storage_path: str, duration_seconds: int):
     """Background thread function for downloading the screen recording
     
@@ -4,6 +4,7 @@ import asyncio
 import subprocess
 import json
 from ..core import run_command
+from .interactions import get_screen_size_cached
 from ..config import DEFAULT_COUNTRY_CODE
 
 
@@ -47,20 +48,11 @@ async def send_text_message(phone_number: str, message: str) -> str:
     # Give the app time to open (increased wait time)
     await asyncio.sleep(3)
 
-    # Get screen dimensions
-    screen_cmd = "adb shell wm size"
-    screen_success, screen_output = await run_command(screen_cmd)
-
-    width, height = 1080, 2340  # Default values for common phones
-
-    if screen_success and "Physical size:" in screen_output:
-        try:
-            # Example output: "Physical size: 1080x2340"
-            size_str = screen_output.split("Physical size:")[1].strip()
-            width, height = map(int, size_str.split("x"))
-        except:
-            # If parsing fails, use default values
-            pass
+    # Get screen dimensions (queried once per session)
+    screen_size = await get_screen_size_cached()
+    # Default values for common phones
+    width = screen_size.get("width") or 1080
+    height = screen_size.get("height") or 2340
 
     # Try different methods to send the message
 
@@ -5,25 +5,36 @@ Provides integration with Omniparser server for visual UI element recognition
 
 import asyncio
 import base64
+import hashlib
 import json
 import logging
 import re
 import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union, Tuple
 from dataclasses import dataclass
 from pydantic import BaseModel, Field
 
 import requests
-from PIL import Image
 import tempfile
 import os
 
-from ..core import run_command
-from .media import take_screenshot
+from ..core import run_command, run_shell
+from ..config import INPUT_COMMAND_TIMEOUT
+from .media import take_screenshot, take_screenshot_raw
 from .interactions import tap_screen, swipe_screen
+from .ui import invalidate_screen_caches
 
 logger = logging.getLogger("phone_mcp")
 
+# Device commands for the element actions of execute_action_by_uuid
+_ELEMENT_ACTION_COMMANDS = {
+    "tap": "input tap {x} {y}",
+    "long_press": "input swipe {x} {y} {x} {y} 1000",
+    # Both taps in one shell invocation, so they land within the double-tap window
+    "double_tap": "input tap {x} {y}; input tap {x} {y}",
+}
+
 
 class ParseRequest(BaseModel):
     """Request model for Omniparser server communication"""
@@ -177,10 +188,14 @@ class OmniparserClient:
 class OmniparserScreenAnalyzer:
     """Enhanced screen analyzer using Omniparser for visual element recognition"""
     
+    # Number of analyses kept by screenshot digest
+    _digest_cache_size = 32
+    
     def __init__(self, omniparser_client: OmniparserClient):
         self.client = omniparser_client
         self._screen_cache = {}
         self._cache_timeout = 5.0  # Cache for 5 seconds
+        self._digest_cache = OrderedDict()  # sha256 of screenshot -> analysis
         self.counter = 0
     async def get_screen_size(self) -> Tuple[int, int]:
         """Get screen dimensions using ADB"""
@@ -238,50 +253,15 @@ class OmniparserScreenAnalyzer:
             if not screenshot_file:
                 raise Exception("Could not determine screenshot file path from result")
             
-            # Convert screenshot to base64
+            # Read screenshot data
             try:
                 with open(screenshot_file, 'rb') as f:
                     image_data = f.read()
-                    base64_image = base64.b64encode(image_data).decode('utf-8')
             except Exception as e:
                 raise Exception(f"Failed to read screenshot file {screenshot_file}: {str(e)}")
             
             self.counter += 1
-            
-            # Parse with Omniparser
-            parse_result = await self.client.parse_screen(base64_image, use_paddleocr)
-            self.counter += 1
-            # Get screen dimensions
-            screen_width, screen_height = await self.get_screen_size()
-            
-            # Process elements
-            elements = []
-            parsed_content = parse_result.get("parsed_content_list", [])
-            
-            for item in parsed_content:
-                element = OmniElement(
-                    uuid=item.get("uuid", ""),
-                    type=item.get("type", ""),
-                    bbox=item.get("bbox", []),
-                    interactivity=item.get("interactivity", False),
-                    content=item.get("content", ""),
-                    source=item.get("source", "")
-                )
-                elements.append(element)
-            self.counter += 1
-            result = {
-                "status": "success",
-                "message": "Screen analyzed successfully with Omniparser",
-                "timestamp": current_time,
-                "screen_size": {"width": screen_width, "height": screen_height},
-                "elements": [elem.to_dict() for elem in elements],
-                "element_count": len(elements),
-                "interactive_count": len([e for e in elements if e.interactivity]),
-                "text_count": len([e for e in elements if e.type == "text"]),
-                "icon_count": len([e for e in elements if e.type == "icon"]),
-                "latency": parse_result.get("latency", 0),
-                "raw_omniparser_result": parse_result
-            }
+            result = await self._analyze_image(image_data, use_paddleocr, current_time)
             
             # Cache the result
             if use_cache:
@@ -297,6 +277,91 @@ class OmniparserScreenAnalyzer:
                 "timestamp": time.time()
             }
     
+    async def _analyze_image(self,
+                             image_data: bytes,
+                             use_paddleocr: Optional[bool],
+                             current_time: float) -> Dict[str, Any]:
+        """Parse screenshot bytes with Omniparser into an analysis result"""
+        base64_image = base64.b64encode(image_data).decode('utf-8')
+        
+        # Parse with Omniparser
+        parse_result = await self.client.parse_screen(base64_image, use_paddleocr)
+        self.counter += 1
+        # Get screen dimensions
+        screen_width, screen_height = await self.get_screen_size()
+        
+        # Process elements
+        elements = []
+        parsed_content = parse_result.get("parsed_content_list", [])
+        
+        for item in parsed_content:
+            element = OmniElement(
+                uuid=item.get("uuid", ""),
+                type=item.get("type", ""),
+                bbox=item.get("bbox", []),
+                interactivity=item.get("interactivity", False),
+                content=item.get("content", ""),
+                source=item.get("source", "")
+            )
+            elements.append(element)
+        self.counter += 1
+        result = {
+            "status": "success",
+            "message": "Screen analyzed successfully with Omniparser",
+            "timestamp": current_time,
+            "screen_size": {"width": screen_width, "height": screen_height},
+            "elements": [elem.to_dict() for elem in elements],
+            "element_count": len(elements),
+            "interactive_count": len([e for e in elements if e.interactivity]),
+            "text_count": len([e for e in elements if e.type == "text"]),
+            "icon_count": len([e for e in elements if e.type == "icon"]),
+            "latency": parse_result.get("latency", 0),
+            "raw_omniparser_result": parse_result
+        }
+        
+        return result
+    
+    async def analyze_current_screen(self, use_paddleocr: Optional[bool] = None) -> Dict[str, Any]:
+        """Capture and analyze the screen, reusing the analysis of an identical screenshot"""
+        success, image_data = await take_screenshot_raw()
+        if not success:
+            logger.error(f"Screen analysis failed: {image_data.decode(errors='replace')}")
+            return {
+                "status": "error",
+                "message": f"Failed to analyze screen: Failed to take screenshot: {image_data.decode(errors='replace')}",
+                "timestamp": time.time()
+            }
+        return await self.analyze_screenshot(image_data, use_paddleocr)
+    
+    async def analyze_screenshot(self, image_data: bytes, use_paddleocr: Optional[bool] = None) -> Dict[str, Any]:
+        """Analyze already captured screenshot bytes, reusing the analysis of an identical screenshot
+        
+        Lets a caller analyze one capture several ways (e.g. without and then
+        with OCR) without taking another screenshot.
+        """
+        try:
+            digest = hashlib.sha256(image_data).digest()
+            cache_key = (digest, use_paddleocr)
+            cached = self._digest_cache.get(cache_key)
+            if cached is not None:
+                self._digest_cache.move_to_end(cache_key)
+                logger.info("Using cached screen analysis for unchanged screenshot")
+                return cached
+            
+            result = await self._analyze_image(image_data, use_paddleocr, time.time())
+            self._digest_cache[cache_key] = result
+            if len(self._digest_cache) > self._digest_cache_size:
+                self._digest_cache.popitem(last=False)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Screen analysis failed: {e}")
+            return {
+                "status": "error",
+                "message": f"Failed to analyze screen: {str(e)}",
+                "timestamp": time.time()
+            }
+    
     async def find_elements_by_content(self, content: str, partial_match: bool = True) -> List[OmniElement]:
         """Find elements by content text"""
         try:
@@ -444,6 +509,49 @@ class OmniparserInteractionManager:
                 "message": f"Failed to tap element {uuid}: {str(e)}"
             })
     
+    async def execute_action_by_uuid(self,
+                                     uuid: str,
+                                     action: str = "tap",
+                                     bias: bool = False,
+                                     analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Tap, long-press or double-tap an element by UUID
+        
+        Args:
+            uuid: Element UUID to act on
+            action: 'tap', 'long_press' or 'double_tap'
+            bias: If True, apply upward bias for program/video content
+            analysis: Analysis the UUID was taken from. UUIDs differ between
+                Omniparser runs, so without it the element is looked up in a
+                fresh capture and may not be found.
+        """
+        command = _ELEMENT_ACTION_COMMANDS.get(action)
+        if command is None:
+            return {"status": "error", "message": f"Unsupported element action: {action}"}
+        
+        if analysis is not None:
+            self.last_analysis = analysis
+            self.last_analysis_time = time.time()
+        element = await self.find_element_by_uuid(uuid)
+        if not element:
+            return {"status": "error", "message": f"Element with UUID {uuid} not found"}
+        
+        screen_size = self.last_analysis.get("screen_size", {})
+        x, y = element.get_screen_coordinates(
+            screen_size.get("width", 1080), screen_size.get("height", 1920), bias
+        )
+        success, output = await run_shell(command.format(x=x, y=y), timeout=INPUT_COMMAND_TIMEOUT)
+        invalidate_screen_caches()
+        
+        bias_info = " (with bias correction)" if bias else ""
+        return {
+            "status": "success" if success else "error",
+            "message": f"{action} on element {uuid} at ({x}, {y}){bias_info}",
+            "element": element.to_dict(),
+            "coordinates": {"x": x, "y": y},
+            "bias_applied": bias,
+            "output": output
+        }
+    
     async def get_element_info(self, uuid: str) -> str:
         """Get detailed information about an element"""
         try:
@@ -4,23 +4,297 @@ Screen Interface Module - Provides functions for screen analysis and interaction
 Integrates multiple tools for UI analysis, element search, and device interaction.
 """
 
-import json
+import asyncio
+import base64
+import hashlib
 import logging
 import time
-from typing import Dict, List, Any, Optional, Tuple, Union
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, List, Any, Mapping, Optional, Tuple, Union
 
 # Import base functionality modules
-from .ui import dump_ui, find_element_by_text, find_element_by_id
+from .ui import (
+    dump_ui, find_element_by_text, find_element_by_id,
+    invalidate_screen_caches, register_screen_cache_clearer, _BOUNDS_RE,
+)
 from .ui_enhanced import (
     find_element_by_content_desc, find_element_by_class, 
-    find_clickable_elements, wait_for_element, scroll_to_element
+    find_clickable_elements, wait_for_element_eventdriven, scroll_to_element
+)
+from .interactions import (
+    tap_screen, swipe_screen, press_key, input_text,
+    get_screen_size_cached, clear_screen_size_cache,
 )
-from .interactions import tap_screen, swipe_screen, press_key, input_text, get_screen_size
-from .media import take_screenshot
-from ..core import run_command
+from .media import take_screenshot_raw
+from ..core import run_command, run_shell, json_dumps, json_loads, mcp_tool_errors
+from ..config import COMMAND_TIMEOUT
 
 logger = logging.getLogger("phone_mcp")
 
+# Maximum number of tap suggestions returned by analyze_screen
+MAX_SUGGESTED_ACTIONS = 10
+
+# Fields reported for each entry of analyze_screen's notable_clickables
+NOTABLE_KEYS = ("text", "content_desc", "center_x", "center_y")
+_get_notable = itemgetter(*NOTABLE_KEYS)
+
+# Upper bounds (seconds) for adb-backed calls so a wedged adb server cannot
+# stall the caller indefinitely. Actions include the post-action delay of the
+# interaction helpers (2s by default).
+_ADB_TIMEOUT_UI = 15.0
+_ADB_TIMEOUT_ACTION = 10.0
+
+# dump_ui output size (characters) above which tree normalization is moved off
+# the event loop; roughly 500 elements of pretty-printed JSON
+_OFFLOAD_MIN_DUMP_SIZE = 150000
+
+# Short-lived cache for UI queries. analyze_screen -> get_screen_info and agent
+# loops frequently ask for the same screen several times in a row; any action
+# that may change the screen invalidates the cache.
+_UI_CACHE_TTL = 0.5  # seconds
+_ui_cache = {"ui_dump": None}
+
+
+# Serialized analyze_screen results keyed by a fingerprint of the UI dump they
+# were computed from, so repeated analysis of an unchanged screen is a lookup
+_ANALYSIS_CACHE_SIZE = 8
+_analysis_cache: "OrderedDict[Tuple[bytes, int, bool], str]" = OrderedDict()
+
+# Recent analyze_screen results keyed by the focused window. Checking the focus
+# is a single dumpsys call, much cheaper than a UI dump, so results reused
+# within a short window skip the dump entirely.
+_ANALYSIS_FOCUS_TTL = 1.5  # seconds
+_focus_analysis_cache: "OrderedDict[Tuple[str, int, bool], Tuple[float, str]]" = OrderedDict()
+
+
+def _clear_screen_caches() -> None:
+    """Drop the UI query and analysis results cached by this module"""
+    for key in _ui_cache:
+        _ui_cache[key] = None
+    _analysis_cache.clear()
+    _focus_analysis_cache.clear()
+
+
+register_screen_cache_clearer(_clear_screen_caches)
+
+
+async def _cached_query(key: str, query) -> str:
+    """Return a cached result for key, or await query() and cache its result
+    
+    Args:
+        key (str): Cache slot name in _ui_cache
+        query: Coroutine function performing the actual adb query
+        
+    Returns:
+        str: Raw result string of the query
+    """
+    entry = _ui_cache.get(key)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < _UI_CACHE_TTL:
+        return entry[1]
+    
+    result = await query()
+    _ui_cache[key] = (time.monotonic(), result)
+    return result
+
+
+async def _cached_dump() -> str:
+    """Cached wrapper around dump_ui"""
+    return await _cached_query("ui_dump", dump_ui)
+
+
+async def _current_focus() -> Optional[str]:
+    """Return the device's mCurrentFocus line as a cheap screen fingerprint
+    
+    Returns:
+        Optional[str]: The focus line, or None if it could not be read
+    """
+    try:
+        success, output = await asyncio.wait_for(
+            run_shell("dumpsys window | grep mCurrentFocus"), _ADB_TIMEOUT_ACTION
+        )
+    except asyncio.TimeoutError:
+        return None
+    focus = output.strip() if success else ""
+    return focus or None
+
+
+def invalidate_screen_size_cache() -> None:
+    """Forget the cached screen size so the next call queries the device again"""
+    clear_screen_size_cache()
+    _analysis_cache.clear()
+    _focus_analysis_cache.clear()
+
+
+# Pre-serialized error responses for fixed messages
+_ERR_TAP_PARAMS = json_dumps({"status": "error", "message": "Missing required x and y coordinates for tap action"})
+_ERR_SWIPE_PARAMS = json_dumps({"status": "error", "message": "Missing coordinates required for swipe"})
+_ERR_KEY_PARAM = json_dumps({"status": "error", "message": "Missing key parameter"})
+_ERR_TEXT_PARAM = json_dumps({"status": "error", "message": "Missing text content parameter"})
+_ERR_FIND_VALUE = json_dumps({"status": "error", "message": "Finding element requires a search value"})
+_ERR_WAIT_VALUE = json_dumps({"status": "error", "message": "Waiting for element requires a search value"})
+_ERR_SCROLL_VALUE = json_dumps({"status": "error", "message": "Scrolling to find requires a search value"})
+_ERR_NO_COORDINATES = json_dumps({"status": "error", "message": "Element does not have valid coordinates"})
+_ERR_UI_DATA = json_dumps({"status": "error", "message": "Failed to process UI data"})
+
+
+def _parse_bounds(bounds: Any) -> Optional[Tuple[int, int, int, int, int, int]]:
+    """Parse a single "[x1,y1][x2,y2]" bounds string
+    
+    Returns:
+        (x1, y1, x2, y2, center_x, center_y), or None if bounds is not a valid bounds string
+    """
+    m = _BOUNDS_RE.match(bounds) if isinstance(bounds, str) else None
+    if m is None:
+        return None
+    x1, y1, x2, y2 = map(int, m.groups())
+    return (x1, y1, x2, y2, (x1 + x2) >> 1, (y1 + y2) >> 1)
+
+
+def _parse_bounds_batch(bounds_list: List[Any]) -> List[Optional[Tuple[int, int, int, int, int, int]]]:
+    """Parse many bounds strings in one pass
+    
+    Args:
+        bounds_list (List[Any]): Bounds values as found in the UI dump
+        
+    Returns:
+        List of (x1, y1, x2, y2, center_x, center_y) tuples, aligned with the input.
+        Entries that cannot be parsed are None.
+    """
+    match = _BOUNDS_RE.match
+    parsed = []
+    append = parsed.append
+    for bounds in bounds_list:
+        m = match(bounds) if isinstance(bounds, str) else None
+        if m is None:
+            append(None)
+            continue
+        x1, y1, x2, y2 = map(int, m.groups())
+        append((x1, y1, x2, y2, (x1 + x2) >> 1, (y1 + y2) >> 1))
+    return parsed
+
+
+def _filter_clickable(ui_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Select clickable elements from an already parsed UI dump
+    
+    Equivalent to find_clickable_elements() but without a second UI dump.
+    Every returned element carries center_x/center_y (-1 when the bounds
+    cannot be parsed), so consumers never need to parse bounds again.
+    
+    Args:
+        ui_data (Dict[str, Any]): Parsed dump_ui result
+        
+    Returns:
+        List[Dict[str, Any]]: Elements marked as clickable
+    """
+    if ui_data.get("status") != "success":
+        return []
+    
+    clickables = []
+    for elem in ui_data.get("elements", []):
+        if not elem.get("clickable", False):
+            continue
+        if "center_x" not in elem:
+            coords = _parse_bounds(elem.get("bounds"))
+            if coords is not None:
+                elem["center_x"] = coords[4]
+                elem["center_y"] = coords[5]
+            else:
+                elem["center_x"] = -1
+                elem["center_y"] = -1
+        clickables.append(elem)
+    return clickables
+
+
+def _has_semantic_content(elem: Dict[str, Any]) -> bool:
+    """Whether an element carries information of its own (text, id, description or clickability)"""
+    return bool(
+        (elem.get("text") or "").strip()
+        or elem.get("resource_id")
+        or elem.get("content_desc")
+        or elem.get("clickable")
+    )
+
+
+def _prune_elements(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop layout-only nodes that contribute nothing to understanding the screen
+    
+    A single control is usually spread over several nodes (container, background,
+    icon, text). dump_ui returns a flat list, so the hierarchy is reconstructed from
+    bounds containment: a node without text, resource_id, content_desc or
+    clickability is kept only if it contains at least one node that has them.
+    This is the fixed point of repeatedly removing empty leaf nodes.
+    
+    Args:
+        elements (List[Dict[str, Any]]): Elements from dump_ui
+        
+    Returns:
+        List[Dict[str, Any]]: Remaining elements in their original order
+    """
+    parsed_bounds = _parse_bounds_batch([e.get("bounds", "") for e in elements])
+    semantic_flags = [_has_semantic_content(e) for e in elements]
+    semantic_rects = [
+        coords for coords, semantic in zip(parsed_bounds, semantic_flags)
+        if semantic and coords is not None
+    ]
+    
+    pruned = []
+    for elem, coords, semantic in zip(elements, parsed_bounds, semantic_flags):
+        if semantic:
+            pruned.append(elem)
+            continue
+        if coords is None:
+            continue
+        x1, y1, x2, y2 = coords[0], coords[1], coords[2], coords[3]
+        for rect in semantic_rects:
+            if x1 <= rect[0] and y1 <= rect[1] and rect[2] <= x2 and rect[3] <= y2:
+                pruned.append(elem)
+                break
+    return pruned
+
+
+def _normalize_element(elem_data: Dict[str, Any], coords: Optional[Tuple[int, int, int, int, int, int]] = None) -> Dict[str, Any]:
+    """Convert a raw UI dump element into the dictionary format returned to callers
+    
+    Produces the same fields as UIElement(elem_data).to_dict() without creating
+    an intermediate object. center_x/center_y are always present and set to -1
+    when the bounds cannot be parsed, so callers can test them with a plain
+    comparison instead of key lookups.
+    
+    Args:
+        elem_data (Dict[str, Any]): Element dictionary from dump_ui
+        coords (Tuple, optional): Pre-parsed bounds from _parse_bounds_batch
+        
+    Returns:
+        Dict[str, Any]: Normalized element dictionary
+    """
+    get = elem_data.get
+    bounds = get("bounds", "")
+    result = {
+        "text": get("text", ""),
+        "resource_id": get("resource_id", ""),
+        "class_name": get("class_name", ""),
+        "content_desc": get("content_desc", ""),
+        "clickable": get("clickable", False),
+        "bounds": bounds,
+    }
+    
+    if coords is None:
+        coords = _parse_bounds(bounds)
+    
+    if coords is not None:
+        result["center_x"] = coords[4]
+        result["center_y"] = coords[5]
+    else:
+        result["center_x"] = -1
+        result["center_y"] = -1
+    
+    return result
+
+
 class UIElement:
     """Class representing a UI element with its properties and interaction methods
     
@@ -28,64 +302,58 @@ class UIElement:
     calculating element coordinates, and providing methods to interact with the element.
     
     Attributes:
-        data (dict): Raw element data dictionary
         text (str): Element text content
         resource_id (str): Element resource ID for identification
         class_name (str): Element class/type
         content_desc (str): Element content description (accessibility text)
         clickable (bool): Whether the element is marked as clickable
         bounds (str): Element boundary coordinates string in format "[x1,y1][x2,y2]"
-        x1 (int): Left coordinate (if bounds successfully parsed)
-        y1 (int): Top coordinate (if bounds successfully parsed)
-        x2 (int): Right coordinate (if bounds successfully parsed)
-        y2 (int): Bottom coordinate (if bounds successfully parsed)
-        center_x (int): X coordinate of element center (if bounds successfully parsed)
-        center_y (int): Y coordinate of element center (if bounds successfully parsed)
+        x1 (int): Left coordinate (None if bounds could not be parsed)
+        y1 (int): Top coordinate (None if bounds could not be parsed)
+        x2 (int): Right coordinate (None if bounds could not be parsed)
+        y2 (int): Bottom coordinate (None if bounds could not be parsed)
+        center_x (int): X coordinate of element center (None if bounds could not be parsed)
+        center_y (int): Y coordinate of element center (None if bounds could not be parsed)
     """
     
-    def __init__(self, element_data: Dict[str, Any]):
+    __slots__ = (
+        "text", "resource_id", "class_name", "content_desc", "clickable", "bounds",
+        "x1", "y1", "x2", "y2", "center_x", "center_y",
+    )
+    
+    # Keys copied verbatim into to_dict()
+    _DICT_KEYS = ("text", "resource_id", "class_name", "content_desc", "clickable", "bounds")
+    
+    def __init__(self, element_data: Dict[str, Any], coords: Optional[Tuple[int, int, int, int, int, int]] = None):
         """Initialize UI element
         
         Args:
             element_data (Dict[str, Any]): Dictionary containing element properties from UI dump
+            coords (Tuple, optional): Pre-parsed (x1, y1, x2, y2, center_x, center_y) from
+                                      _parse_bounds_batch. When given, bounds are not parsed again.
             
         Notes:
             Coordinate parsing failures are logged but don't raise exceptions.
-            Check for existence of center_x/center_y attributes before attempting coordinate-based operations.
+            Coordinate attributes are None when the bounds could not be parsed.
         """
-        self.data = element_data or {}  # Ensure we have a dictionary even if None is passed
-        self.text = self.data.get("text", "")
-        self.resource_id = self.data.get("resource_id", "")
-        self.class_name = self.data.get("class_name", "")
-        self.content_desc = self.data.get("content_desc", "")
-        self.clickable = self.data.get("clickable", False)
-        self.bounds = self.data.get("bounds", "")
+        data = element_data or {}  # Ensure we have a dictionary even if None is passed
+        self.text = data.get("text", "")
+        self.resource_id = data.get("resource_id", "")
+        self.class_name = data.get("class_name", "")
+        self.content_desc = data.get("content_desc", "")
+        self.clickable = data.get("clickable", False)
+        self.bounds = data.get("bounds", "")
         
         # Parse boundaries to get coordinates
-        if self.bounds and isinstance(self.bounds, str):
-            try:
-                coords = self.bounds.replace("[", "").replace("]", "").split(",")
-                if len(coords) == 4:
-                    self.x1 = int(coords[0])
-                    self.y1 = int(coords[1])
-                    self.x2 = int(coords[2])
-                    self.y2 = int(coords[3])
-                    self.center_x = (self.x1 + self.x2) // 2
-                    self.center_y = (self.y1 + self.y2) // 2
-            except Exception as e:
-                logger.warning(f"Failed to parse element boundaries: {self.bounds}, error: {str(e)}")
-        elif self.bounds and isinstance(self.bounds, dict):
-            # If bounds is in dictionary format, try to extract coordinates from it
-            try:
-                if all(k in self.bounds for k in ["left", "top", "right", "bottom"]):
-                    self.x1 = int(self.bounds.get("left", 0))
-                    self.y1 = int(self.bounds.get("top", 0))
-                    self.x2 = int(self.bounds.get("right", 0))
-                    self.y2 = int(self.bounds.get("bottom", 0))
-                    self.center_x = (self.x1 + self.x2) // 2
-                    self.center_y = (self.y1 + self.y2) // 2
-            except Exception as e:
-                logger.warning(f"Failed to parse element boundaries from dictionary: {self.bounds}, error: {str(e)}")
+        if coords is None and self.bounds:
+            coords = _parse_bounds(self.bounds)
+            if coords is None:
+                logger.warning(f"Failed to parse element boundaries: {self.bounds}")
+        if coords is not None:
+            self.x1, self.y1, self.x2, self.y2, self.center_x, self.center_y = coords
+        else:
+            self.x1 = self.y1 = self.x2 = self.y2 = None
+            self.center_x = self.center_y = None
             
     def to_dict(self) -> Dict[str, Any]:
         """Convert UI element to dictionary format for JSON serialization
@@ -93,16 +361,9 @@ class UIElement:
         Returns:
             Dictionary containing all element attributes
         """
-        result = {
-            "text": self.text,
-            "resource_id": self.resource_id,
-            "class_name": self.class_name,
-            "content_desc": self.content_desc,
-            "clickable": self.clickable,
-            "bounds": self.bounds,
-        }
+        result = {key: getattr(self, key) for key in self._DICT_KEYS}
         
-        if hasattr(self, "center_x") and hasattr(self, "center_y"):
+        if self.center_x is not None:
             result["center_x"] = self.center_x
             result["center_y"] = self.center_y
             
@@ -117,87 +378,154 @@ class UIElement:
         Returns:
             str: JSON string with operation result
         """
-        if hasattr(self, "center_x") and hasattr(self, "center_y"):
+        if self.center_x is not None:
             return await tap_screen(self.center_x, self.center_y)
-        return json.dumps({"status": "error", "message": "Element does not have valid coordinates"})
+        return _ERR_NO_COORDINATES
 
 
-async def get_screen_info(include_screenshot: bool = True, max_elements: int = 100) -> str:
-    """Get detailed information about the current screen, including UI hierarchy and screenshot
+def _normalize_tree(ui_dump: str, max_elements: int, prune: bool) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse a dump_ui result and build the element lists of get_screen_info
     
-    This function obtains comprehensive screen information by retrieving the UI hierarchy,
-    taking a screenshot, and parsing all visible elements.
+    Synchronous so it can run in a worker thread for large UI trees.
+    
+    Only the number of considered elements is reported for the full tree, so
+    no per-element dict is built for it; just the text-bearing elements are
+    normalized, in a single pass.
+    
+    Every element in the returned lists has a fixed key set: text elements
+    always carry text, bounds, center_x and center_y, and clickable elements
+    always carry center_x and center_y. Consumers such as analyze_screen rely
+    on this and index those keys directly instead of calling .get().
     
     Args:
-        include_screenshot (bool, optional): Whether to include a base64-encoded screenshot. Defaults to True.
-        max_elements (int, optional): Maximum number of elements to include in the result. Defaults to 100.
+        ui_dump (str): JSON string returned by dump_ui
+        max_elements (int): Maximum number of elements to consider
+        prune (bool): Drop layout-only nodes before applying max_elements
+        
+    Returns:
+        Tuple of (element_count, text_elements, clickable_elements)
+        
+    Raises:
+        ValueError: If ui_dump is not valid JSON
+    """
+    ui_data = json_loads(ui_dump)
+    
+    # Get clickable elements from the tree we already have rather than
+    # dumping the UI a second time through find_clickable_elements
+    clickable_elements = _filter_clickable(ui_data)
+    
+    element_count = 0
+    text_elements = []
+    
+    if "elements" in ui_data:
+        element_list = ui_data["elements"]
+        if prune:
+            element_list = _prune_elements(element_list)
+        
+        # Limit elements to prevent overflow
+        if len(element_list) > max_elements:
+            element_list = element_list[:max_elements]
+        element_count = len(element_list)
+        
+        text_append = text_elements.append
+        for elem_data in element_list:
+            text = elem_data.get("text", "")
+            if not (text and text.strip()):
+                continue
+            bounds = elem_data.get("bounds", "")
+            coords = _parse_bounds(bounds)
+            text_append({
+                "text": text,
+                "bounds": bounds,
+                "center_x": coords[4] if coords is not None else -1,
+                "center_y": coords[5] if coords is not None else -1,
+            })
+    
+    return element_count, text_elements, clickable_elements
+
+
+async def _provided(value: Any) -> Any:
+    """Awaitable returning an already available value"""
+    return value
+
+
+async def _get_screen_info_dict(include_screenshot: bool = True, max_elements: int = 100, prune: bool = False,
+                                ui_dump: Optional[str] = None) -> Dict[str, Any]:
+    """Collect screen information as a dictionary
+    
+    Shared implementation of get_screen_info, also used directly by analyze_screen
+    so the result does not have to be serialized and parsed again.
+    
+    Args:
+        include_screenshot (bool, optional): Whether to include a screenshot. Defaults to True.
+        max_elements (int, optional): Maximum number of elements to include. Defaults to 100.
+        prune (bool, optional): Drop layout-only nodes before applying max_elements. Defaults to False.
+        ui_dump (str, optional): dump_ui result already fetched by the caller. Defaults to None.
     
     Returns:
-        str: JSON string containing screen information:
-            {
-                "status": "success" or "error",
-                "message": "Success/Error message",
-                "screen_size": {"width": int, "height": int},
-                "all_elements_count": int,
-                "clickable_elements_count": int,
-                "text_elements_count": int,
-                "text_elements": [
-                    {"text": str, "bounds": str, "center_x": int, "center_y": int, ...}
-                ],
-                "clickable_elements": [
-                    {"text": str, "bounds": str, "center_x": int, "center_y": int, ...}
-                ],
-                "timestamp": int
-            }
+        Dict[str, Any]: Screen information in the format documented on get_screen_info
     """
+    # The screenshot is the slowest adb call; only take it when requested and
+    # let it run in the background while the UI tree is fetched and processed
+    screenshot_task = asyncio.create_task(take_screenshot_raw()) if include_screenshot else None
     try:
+        # UI tree and screen size are independent adb queries, so run them
+        # concurrently instead of one after another
+        ui_dump, size_result = await asyncio.gather(
+            asyncio.wait_for(_cached_dump(), _ADB_TIMEOUT_UI) if ui_dump is None else _provided(ui_dump),
+            asyncio.wait_for(get_screen_size_cached(), _ADB_TIMEOUT_ACTION),
+            return_exceptions=True
+        )
+        
         # Get UI tree
-        ui_dump = await dump_ui()
-        ui_data = json.loads(ui_dump)
+        if isinstance(ui_dump, asyncio.TimeoutError):
+            logger.error("Timed out waiting for UI dump")
+            if screenshot_task is not None:
+                screenshot_task.cancel()
+            return {
+                "status": "error",
+                "message": f"adb timeout: UI dump did not finish within {_ADB_TIMEOUT_UI} seconds"
+            }
+        elif isinstance(ui_dump, Exception):
+            logger.warning(f"UI dump failed: {str(ui_dump)}")
+            ui_dump = "{}"
+        
+        # Parsing and normalizing the tree is pure CPU work; for large dumps run
+        # it in a worker thread so the event loop (and the screenshot task)
+        # keeps making progress
+        if len(ui_dump) >= _OFFLOAD_MIN_DUMP_SIZE:
+            element_count, text_elements, clickable_elements = await asyncio.to_thread(
+                _normalize_tree, ui_dump, max_elements, prune
+            )
+        else:
+            element_count, text_elements, clickable_elements = _normalize_tree(ui_dump, max_elements, prune)
         
         # Get screen size
-        size_result = await get_screen_size()
-        screen_size = json.loads(size_result)
+        screen_size = {}
+        if isinstance(size_result, Exception):
+            logger.warning(f"Failed to get screen size: {str(size_result)}")
+        else:
+            screen_size = size_result
         
         # Default screen size if not available
         if not screen_size.get("width") or not screen_size.get("height"):
             screen_size = {"width": 1080, "height": 1920}  # Default fallback values
         
-        # Get clickable elements
-        clickable_result = await find_clickable_elements()
-
-        clickable_data = json.loads(clickable_result)
-        clickable_elements = clickable_data.get("elements", []) if clickable_data.get("status") == "success" else []
-        
-        # Extract text elements and process all elements
-        text_elements = []
-        all_elements = []
-        
-        if "elements" in ui_data:
-            # Limit elements to prevent overflow
-            element_list = ui_data["elements"][:max_elements] if len(ui_data["elements"]) > max_elements else ui_data["elements"]
-            
-            for elem_data in element_list:
-                element = UIElement(elem_data)
-                all_elements.append(element.to_dict())
-                
-                # If element has text, add to text elements list
-                if element.text and element.text.strip():
-                    text_element = {
-                        "text": element.text,
-                        "bounds": element.bounds
-                    }
-                    if hasattr(element, "center_x") and hasattr(element, "center_y"):
-                        text_element["center_x"] = element.center_x
-                        text_element["center_y"] = element.center_y
-                    text_elements.append(text_element)
-        
-        # Take a screenshot for reference if needed
+        # Collect the screenshot started above. The PNG bytes are encoded
+        # exactly once, here, rather than passing through an intermediate
+        # JSON payload.
         screenshot_base64 = ""
-        if include_screenshot:
-            screenshot_result = await take_screenshot()
-            screenshot_data = json.loads(screenshot_result)
-            screenshot_base64 = screenshot_data.get("data", "") if screenshot_data.get("status") == "success" else ""
+        if screenshot_task is not None:
+            try:
+                shot_ok, shot_data = await asyncio.wait_for(screenshot_task, _ADB_TIMEOUT_UI)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out waiting for screenshot")
+                shot_ok, shot_data = False, b""
+            screenshot_task = None
+            if shot_ok:
+                screenshot_base64 = base64.b64encode(shot_data).decode("ascii")
+            else:
+                logger.warning(f"Screenshot capture failed: {shot_data.decode(errors='replace')}")
         
         # Build result
         result = {
@@ -207,7 +535,7 @@ async def get_screen_info(include_screenshot: bool = True, max_elements: int = 1
                 "width": screen_size.get("width", 0),
                 "height": screen_size.get("height", 0),
             },
-            "all_elements_count": len(all_elements),
+            "all_elements_count": element_count,
             "clickable_elements_count": len(clickable_elements),
             "text_elements_count": len(text_elements),
             "text_elements": text_elements,
@@ -219,16 +547,267 @@ async def get_screen_info(include_screenshot: bool = True, max_elements: int = 1
         if include_screenshot:
             result["screenshot"] = screenshot_base64
         
-        return json.dumps(result, ensure_ascii=False)
+        return result
     except Exception as e:
         logger.error(f"Error parsing UI information: {str(e)}")
-        return json.dumps({
+        if screenshot_task is not None:
+            screenshot_task.cancel()
+        return {
             "status": "error",
             "message": f"Failed to get screen information: {str(e)}"
+        }
+
+
+def _dumps_with_screenshot(result: Dict[str, Any]) -> str:
+    """Serialize a result dict, appending its screenshot field verbatim
+    
+    The base64 screenshot can be megabytes long. Its alphabet never needs JSON
+    escaping, so it is spliced onto the serialized remainder of the result
+    instead of being scanned and copied by the JSON encoder.
+    
+    Args:
+        result (Dict[str, Any]): Result dict; it is not modified
+        
+    Returns:
+        str: JSON string equivalent to serializing the original dict
+    """
+    screenshot = result.get("screenshot")
+    if screenshot is None:
+        return json_dumps(result)
+    rest = {key: value for key, value in result.items() if key != "screenshot"}
+    if not rest:
+        return f'{{"screenshot":"{screenshot}"}}'
+    return f'{json_dumps(rest)[:-1]},"screenshot":"{screenshot}"}}'
+
+
+async def get_screen_info(include_screenshot: bool = True, max_elements: int = 100, prune: bool = False) -> str:
+    """Get detailed information about the current screen, including UI hierarchy and screenshot
+    
+    This function obtains comprehensive screen information by retrieving the UI hierarchy,
+    taking a screenshot, and parsing all visible elements.
+    
+    Args:
+        include_screenshot (bool, optional): Whether to include a base64-encoded screenshot. Defaults to True.
+        max_elements (int, optional): Maximum number of elements to include in the result. Defaults to 100.
+        prune (bool, optional): Drop layout-only nodes (no text, resource_id, content_desc or
+                                clickability, and containing no such node). Defaults to False.
+    
+    Returns:
+        str: JSON string containing screen information:
+            {
+                "status": "success" or "error",
+                "message": "Success/Error message",
+                "screen_size": {"width": int, "height": int},
+                "all_elements_count": int,
+                "clickable_elements_count": int,
+                "text_elements_count": int,
+                "text_elements": [
+                    {"text": str, "bounds": str, "center_x": int, "center_y": int, ...}
+                ],
+                "clickable_elements": [
+                    {"text": str, "bounds": str, "center_x": int, "center_y": int, ...}
+                ],
+                "timestamp": int
+            }
+            center_x/center_y of text elements are -1 when the element bounds could not be parsed.
+    """
+    return _dumps_with_screenshot(await _get_screen_info_dict(include_screenshot, max_elements, prune))
+
+
+async def _analyze_screen_dict(include_screenshot: bool = False, max_elements: int = 50, prune: bool = False,
+                               ui_dump: Optional[str] = None) -> Dict[str, Any]:
+    """Build the analyze_screen result as a dict
+    
+    Used directly by internal callers that inspect the result, so it is not
+    serialized and parsed again. Unlike analyze_screen this is not cached and
+    exceptions propagate to the caller.
+    
+    Args:
+        include_screenshot (bool, optional): Whether to include a screenshot. Defaults to False.
+        max_elements (int, optional): Maximum number of UI elements to process. Defaults to 50.
+        prune (bool, optional): Drop layout-only nodes before analysis. Defaults to False.
+        ui_dump (str, optional): dump_ui result already fetched by the caller. Defaults to None.
+    
+    Returns:
+        Dict[str, Any]: Analysis in the format documented on analyze_screen
+    """
+    # Get screen info as base for analysis
+    screen_info = await _get_screen_info_dict(include_screenshot=include_screenshot, max_elements=max_elements,
+                                              prune=prune, ui_dump=ui_dump)
+    
+    if screen_info.get("status") != "success":
+        return screen_info
+    
+    # Get screen height, with fallback to default
+    screen_height = screen_info.get("screen_size", {}).get("height", 1920)
+    if screen_height <= 0:
+        screen_height = 1920  # Default value if invalid
+        
+    top_threshold = screen_height * 0.25
+    bottom_threshold = screen_height * 0.75
+    
+    # De-duplicate text elements and bucket them by screen region in a
+    # single pass. Only elements with coordinates are placed in a region;
+    # placed[text] remembers where, so a replaced entry can be dropped.
+    texts_by_region = {
+        "top": [],
+        "middle": [],
+        "bottom": []
+    }
+    unique_texts = {}
+    placed = {}
+    replaced = False
+    
+    # Text elements share one key set (see _normalize_tree), so keys are
+    # indexed directly
+    for text_elem in screen_info["text_elements"]:
+        raw_text = text_elem["text"]
+        text = raw_text.strip()
+        if not text:
+            continue
+        y_pos = text_elem["center_y"]
+        
+        # Keep the first occurrence, unless a later one has coordinates while it doesn't
+        existing = unique_texts.get(text)
+        if existing is not None:
+            if not (y_pos > 0 and existing["center_y"] <= 0):
+                continue
+            slot = placed.pop(text, None)
+            if slot is not None:
+                slot[0][slot[1]] = None
+                replaced = True
+        unique_texts[text] = text_elem
+        
+        x_pos = text_elem["center_x"]
+        if x_pos < 0:
+            continue
+        if y_pos < top_threshold:
+            bucket = texts_by_region["top"]
+        elif y_pos > bottom_threshold:
+            bucket = texts_by_region["bottom"]
+        else:
+            bucket = texts_by_region["middle"]
+        placed[text] = (bucket, len(bucket))
+        bucket.append({"text": raw_text, "center_x": x_pos, "center_y": y_pos})
+    
+    if replaced:
+        for region, bucket in texts_by_region.items():
+            texts_by_region[region] = [t for t in bucket if t is not None]
+    
+    filtered_text_elements = list(unique_texts.values())
+    
+    # Identify UI patterns
+    ui_patterns = []
+    
+    # Check if it's a list view
+    if len(texts_by_region["middle"]) > 3:
+        # Pattern checks only need the vertical positions, so pull them
+        # out once into a flat int array instead of indexing each dict
+        middle_ys = array("i", [t["center_y"] for t in texts_by_region["middle"]])
+        # Track the spread of consecutive vertical gaps in one pass,
+        # stopping as soon as the spacing is too uneven for a list
+        prev_y = None
+        min_diff = max_diff = None
+        for y in middle_ys:
+            if prev_y is not None:
+                diff = abs(y - prev_y)
+                if min_diff is None:
+                    min_diff = max_diff = diff
+                elif diff < min_diff:
+                    min_diff = diff
+                elif diff > max_diff:
+                    max_diff = diff
+                if max_diff - min_diff >= 20:
+                    break
+            prev_y = y
+        
+        if min_diff is not None and max_diff - min_diff < 20:
+            ui_patterns.append("list_view")
+    
+    # Check if there's a bottom navigation bar
+    # Clickable elements already carry center_y (see _filter_clickable),
+    # so no bounds parsing is needed here
+    bottom_clickables = [
+        e for e in screen_info["clickable_elements"]
+        if e["center_y"] > bottom_threshold
+    ]
+            
+    if len(bottom_clickables) >= 3:
+        ui_patterns.append("bottom_navigation")
+    
+    # Predict possible actions
+    suggested_actions = []
+    
+    # Suggest clicking obvious buttons, skipping repeated labels and
+    # keeping the list short enough to be useful
+    seen_texts = set()
+    
+    def _button_texts():
+        for elem in screen_info.get("clickable_elements", []):
+            elem_text = elem.get("text")
+            if elem_text and len(elem_text) < 20 and elem_text not in seen_texts:
+                seen_texts.add(elem_text)
+                yield elem_text
+    
+    suggested_actions.extend(
+        {
+            "action": "tap_element", 
+            "element_text": elem_text,
+            "description": f"Click button: {elem_text}"
+        }
+        for elem_text in islice(_button_texts(), MAX_SUGGESTED_ACTIONS)
+    )
+    
+    # For list views, suggest scrolling
+    if "list_view" in ui_patterns:
+        suggested_actions.append({
+            "action": "swipe", 
+            "description": "Scroll down the list"
         })
+    
+    # Build list of notable clickable elements; centers were computed
+    # when the clickable elements were collected
+    notable_clickables = []
+    for e in screen_info["clickable_elements"][:10]:
+        try:
+            text, content_desc, center_x, center_y = _get_notable(e)
+        except KeyError:
+            # Elements not produced by dump_ui may lack text/content_desc
+            text, content_desc = e.get("text", ""), e.get("content_desc", "")
+            center_x, center_y = e["center_x"], e["center_y"]
+        if center_x >= 0:
+            notable_clickables.append({"text": text, "content_desc": content_desc,
+                                       "center_x": center_x, "center_y": center_y})
+        elif text or content_desc:
+            # Only add elements with center_x and center_y, or with meaningful text/content_desc
+            notable_clickables.append({"text": text, "content_desc": content_desc})
+    
+    # Build AI-friendly output
+    screen_analysis = {
+        "status": "success",
+        "message": "Successfully analyzed screen content",
+        "screen_size": screen_info["screen_size"],
+        "screen_analysis": {
+            "text_elements": {
+                "total": len(filtered_text_elements),
+                "by_region": texts_by_region,
+                "all_text": [t["text"] for t in filtered_text_elements]
+            },
+            "ui_patterns": ui_patterns,
+            "clickable_count": screen_info.get("clickable_elements_count", 0),
+            "notable_clickables": notable_clickables
+        },
+        "suggested_actions": suggested_actions,
+    }
+    
+    if include_screenshot:
+        screen_analysis["screenshot"] = screen_info.get("screenshot", "")
+    
+    return screen_analysis
 
 
-async def analyze_screen(include_screenshot: bool = False, max_elements: int = 50) -> str:
+@mcp_tool_errors("Failed to analyze screen")
+async def analyze_screen(include_screenshot: bool = False, max_elements: int = 50, prune: bool = False) -> str:
     """Analyze the current screen and provide structured information about UI elements
     
     This function captures the current screen state and returns a detailed analysis
@@ -239,6 +818,8 @@ async def analyze_screen(include_screenshot: bool = False, max_elements: int = 5
                                           Default is False to reduce response size.
         max_elements (int, optional): Maximum number of UI elements to process.
                                     Default is 50 to limit processing time and response size.
+        prune (bool, optional): Drop layout-only UI nodes before analysis so max_elements
+                              covers more meaningful elements. Default is False.
     
     Returns:
         str: JSON string with the analysis result containing:
@@ -292,182 +873,367 @@ async def analyze_screen(include_screenshot: bool = False, max_elements: int = 5
         # Get detailed analysis including more elements
         detailed_result = await analyze_screen(max_elements=100)
     """
-    try:
-        # Get screen info as base for analysis
-        screen_info_str = await get_screen_info(include_screenshot=include_screenshot, max_elements=max_elements)
-        screen_info = json.loads(screen_info_str)
-        
-        if screen_info.get("status") != "success":
-            return screen_info_str
-        
-        # Process text elements by screen region
-        texts_by_region = {
-            "top": [],
-            "middle": [],
-            "bottom": []
-        }
+    # Without a screenshot the analysis depends only on the UI dump, so an
+    # unchanged screen can be answered from the analysis cache
+    ui_dump = None
+    cache_key = None
+    focus_key = None
+    if not include_screenshot:
+        focus = await _current_focus()
+        if focus is not None:
+            focus_key = (focus, max_elements, prune)
+            entry = _focus_analysis_cache.get(focus_key)
+            if entry is not None and time.monotonic() - entry[0] < _ANALYSIS_FOCUS_TTL:
+                return entry[1]
         
-        # Get screen height, with fallback to default
-        screen_height = screen_info.get("screen_size", {}).get("height", 1920)
-        if screen_height <= 0:
-            screen_height = 1920  # Default value if invalid
-            
-        top_threshold = screen_height * 0.25
-        bottom_threshold = screen_height * 0.75
-        
-        # Filter and organize text elements by region
-        filtered_text_elements = []
-        unique_texts = {}
-        
-        for text_elem in screen_info.get("text_elements", []):
-            text = text_elem.get("text", "").strip()
-            if text:
-                # If text doesn't exist yet, or new element has coordinates while old doesn't
-                if text not in unique_texts or (
-                        "center_y" in text_elem and 
-                        text_elem["center_y"] and 
-                        not unique_texts[text].get("center_y")):
-                    unique_texts[text] = text_elem
-        
-        filtered_text_elements = list(unique_texts.values())
-        
-        # Classify elements by screen region
-        for text_elem in filtered_text_elements:
-            y_pos = text_elem.get("center_y", 0)
-            
-            if y_pos < top_threshold:
-                texts_by_region["top"].append(text_elem)
-            elif y_pos > bottom_threshold:
-                texts_by_region["bottom"].append(text_elem)
-            else:
-                texts_by_region["middle"].append(text_elem)
+        try:
+            ui_dump = await asyncio.wait_for(_cached_dump(), _ADB_TIMEOUT_UI)
+        except asyncio.TimeoutError:
+            return json_dumps({
+                "status": "error",
+                "message": f"adb timeout: UI dump did not finish within {_ADB_TIMEOUT_UI} seconds"
+            })
+        fingerprint = hashlib.blake2b(ui_dump.encode("utf-8"), digest_size=16).digest()
+        cache_key = (fingerprint, max_elements, prune)
+        cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            _analysis_cache.move_to_end(cache_key)
+            return cached
+    
+    screen_analysis = await _analyze_screen_dict(include_screenshot=include_screenshot, max_elements=max_elements,
+                                                 prune=prune, ui_dump=ui_dump)
+    if screen_analysis.get("status") != "success":
+        return json_dumps(screen_analysis)
+    
+    result = _dumps_with_screenshot(screen_analysis)
+    if cache_key is not None:
+        _analysis_cache[cache_key] = result
+        if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    if focus_key is not None:
+        _focus_analysis_cache[focus_key] = (time.monotonic(), result)
+        _focus_analysis_cache.move_to_end(focus_key)
+        if len(_focus_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _focus_analysis_cache.popitem(last=False)
+    return result
+
+
+# Numeric interaction parameters and the defaults used when a value cannot be
+# converted. Parameters without a default (coordinates) are dropped instead, so
+# the handler reports them as missing.
+_INT_PARAMS = frozenset(("x", "y", "x1", "y1", "x2", "y2", "duration", "timeout", "max_swipes"))
+_FLOAT_PARAMS = frozenset(("interval",))
+_PARAM_DEFAULTS = {"duration": 300, "timeout": 30, "max_swipes": 5, "interval": 1.0}
+
+
+def _normalize_params(params: Any) -> Dict[str, Any]:
+    """Turn non-dict interaction parameters into a new dictionary
+    
+    Slow path of interact_with_screen for callers that pass params as a JSON
+    string or as another mapping type.
+    
+    Args:
+        params: JSON object string or mapping
         
-        # Identify UI patterns
-        ui_patterns = []
+    Returns:
+        Dict[str, Any]: Newly created parameters dictionary
         
-        # Check if it's a list view
-        if len(texts_by_region["middle"]) > 3:
-            middle_texts = texts_by_region["middle"]
-            y_positions = [t.get("center_y") for t in middle_texts if "center_y" in t]
-            
-            if y_positions and len(y_positions) > 1:
-                y_diffs = [abs(y_positions[i] - y_positions[i-1]) for i in range(1, len(y_positions))]
-                if y_diffs and max(y_diffs) - min(y_diffs) < 20:
-                    ui_patterns.append("list_view")
-        
-        # Check if there's a bottom navigation bar
-        bottom_clickables = []
-        for e in screen_info.get("clickable_elements", []):
-            try:
-                bounds = e.get("bounds", "")
-                if isinstance(bounds, str) and bounds:
-                    y_value = int(bounds.split(",")[1].replace("]", ""))
-                    if y_value > bottom_threshold:
-                        bottom_clickables.append(e)
-                elif isinstance(bounds, dict) and "top" in bounds:
-                    if int(bounds["top"]) > bottom_threshold:
-                        bottom_clickables.append(e)
-            except (IndexError, ValueError):
+    Raises:
+        ValueError: If params cannot be interpreted as a parameters object
+    """
+    if isinstance(params, (str, bytes)):
+        params = json_loads(params) if params.strip() else {}
+    if isinstance(params, Mapping):
+        return dict(params)
+    raise ValueError(f"params must be an object, got {type(params).__name__}")
+
+
+def _coerce_params(params: Dict[str, Any], copy: bool = True) -> Dict[str, Any]:
+    """Convert numeric interaction parameters given as strings to numbers
+    
+    MCP clients frequently send numbers as strings (e.g. {"x": "540"}).
+    The caller's dict is never modified when copy is True; it is only copied
+    once a value actually needs converting, so well-typed params are returned
+    as-is without allocating.
+    
+    Args:
+        params (Dict[str, Any]): Parameters passed to interact_with_screen
+        copy (bool): Copy before modifying; pass False when params is already a private dict
+        
+    Returns:
+        Dict[str, Any]: Params with numeric values converted
+    """
+    result = params
+    for key, value in (params.items() if copy else list(params.items())):
+        if key in _INT_PARAMS:
+            if type(value) is int:
+                continue
+        elif key in _FLOAT_PARAMS:
+            if type(value) is float:
                 continue
-                
-        if len(bottom_clickables) >= 3:
-            ui_patterns.append("bottom_navigation")
+        else:
+            continue
+        if result is params and copy:
+            result = dict(params)
+        try:
+            number = float(value)
+            result[key] = int(number) if key in _INT_PARAMS else number
+        except (TypeError, ValueError):
+            if key in _PARAM_DEFAULTS:
+                logger.warning(f"Parameter '{key}' must be a number. Using default {_PARAM_DEFAULTS[key]}.")
+                result[key] = _PARAM_DEFAULTS[key]
+            else:
+                logger.warning(f"Parameter '{key}' must be a number. Ignoring value {value!r}.")
+                del result[key]
+    return result
+
+
+async def _find_by_text_cached(text: str, partial: bool = False) -> List[Dict[str, Any]]:
+    """Find elements by text using the cached UI dump
+    
+    Same matching rules as find_element_by_text, but served from the short-lived
+    UI cache so a tap right after analyze_screen does not dump the UI again.
+    
+    Args:
+        text (str): Text to search for
+        partial (bool): Match elements containing the text instead of exact matches
         
-        # Predict possible actions
-        suggested_actions = []
+    Returns:
+        List[Dict[str, Any]]: Matching elements, empty if none or if the dump failed
+    """
+    try:
+        ui_data = json_loads(await _cached_dump())
+    except ValueError:
+        return []
+    if not isinstance(ui_data, dict) or ui_data.get("status") != "success":
+        return []
+    
+    matches = []
+    for element in ui_data.get("elements", []):
+        element_text = element.get("text", "")
+        if (partial and text in element_text) or element_text == text:
+            matches.append(element)
+    return matches
+
+
+# Probes tried by the "any" find method, in priority order: (method, element key, partial match)
+_ANY_FIND_PROBES = (
+    ("text", "text", True),
+    ("content_desc", "content_desc", True),
+    ("id", "resource_id", True),
+)
+
+
+async def _find_any(value: str) -> str:
+    """Find elements by text, content description or resource ID in one UI dump
+    
+    All probes are evaluated against the same (cached) dump, so trying several
+    selectors costs a single uiautomator round-trip instead of one per method.
+    The first probe with matches wins.
+    
+    Args:
+        value (str): Value to search for
         
-        # Suggest clicking obvious buttons
-        for elem in screen_info.get("clickable_elements", []):
-            if elem.get("text") and len(elem.get("text")) < 20:
-                suggested_actions.append({
-                    "action": "tap_element", 
-                    "element_text": elem.get("text"),
-                    "description": f"Click button: {elem.get('text')}"
-                })
-        
-        # For list views, suggest scrolling
-        if "list_view" in ui_patterns:
-            suggested_actions.append({
-                "action": "swipe", 
-                "description": "Scroll down the list"
+    Returns:
+        str: JSON string in the find_element_by_* format plus "matched_by"
+    """
+    ui_dump = await _cached_dump()
+    try:
+        ui_data = json_loads(ui_dump)
+    except ValueError:
+        return _ERR_UI_DATA
+    if not isinstance(ui_data, dict) or ui_data.get("status") != "success":
+        return ui_dump
+    
+    elements = ui_data.get("elements", [])
+    for method, key, partial in _ANY_FIND_PROBES:
+        matches = [
+            e for e in elements
+            if (partial and value in (e.get(key) or "")) or e.get(key) == value
+        ]
+        if matches:
+            return json_dumps({
+                "status": "success",
+                "query": value,
+                "matched_by": method,
+                "count": len(matches),
+                "elements": matches,
             })
-        
-        # Build list of notable clickable elements
-        notable_clickables = []
-        clickable_limit = min(10, len(screen_info.get("clickable_elements", [])))
-        for e in screen_info.get("clickable_elements", [])[:clickable_limit]:
-            try:
-                clickable_item = {
-                    "text": e.get("text", ""), 
-                    "content_desc": e.get("content_desc", "")
-                }
-                
-                # If the element already has calculated center point coordinates, use them directly
-                if "center_x" in e and "center_y" in e:
-                    clickable_item["center_x"] = e["center_x"]
-                    clickable_item["center_y"] = e["center_y"]
-                # Otherwise try to calculate from bounds
-                elif "bounds" in e:
-                    bounds = e["bounds"]
-                    if isinstance(bounds, str):
-                        coords = bounds.replace("[", "").replace("]", "").split(",")
-                        if len(coords) == 4:
-                            x1 = int(coords[0])
-                            y1 = int(coords[1])
-                            x2 = int(coords[2])
-                            y2 = int(coords[3])
-                            clickable_item["center_x"] = (x1 + x2) // 2
-                            clickable_item["center_y"] = (y1 + y2) // 2
-                    elif isinstance(bounds, dict) and all(k in bounds for k in ["left", "top", "right", "bottom"]):
-                        x1 = int(bounds["left"])
-                        y1 = int(bounds["top"])
-                        x2 = int(bounds["right"])
-                        y2 = int(bounds["bottom"])
-                        clickable_item["center_x"] = (x1 + x2) // 2
-                        clickable_item["center_y"] = (y1 + y2) // 2
-                
-                # Only add elements with center_x and center_y, or with meaningful text/content_desc
-                if ("center_x" in clickable_item and "center_y" in clickable_item) or clickable_item["text"] or clickable_item["content_desc"]:
-                    notable_clickables.append(clickable_item)
-            except Exception:
+    return json_dumps({
+        "status": "success",
+        "query": value,
+        "matched_by": None,
+        "count": 0,
+        "elements": [],
+    })
+
+
+async def _tap_element_by_text(element_text: str, partial: bool = False) -> Dict[str, Any]:
+    """Tap the first element whose text matches element_text
+    
+    Returns:
+        Dict[str, Any]: Result dict; interact_with_screen serializes it
+    """
+    matches = await _find_by_text_cached(element_text, partial)
+    for match in matches:
+        # dump_ui already provides the center; parse the bounds only if it is missing
+        center_x = match.get("center_x")
+        center_y = match.get("center_y")
+        if center_x is None or center_x < 0:
+            coords = _parse_bounds(match.get("bounds"))
+            if coords is None:
                 continue
+            center_x, center_y = coords[4], coords[5]
         
-        # Build AI-friendly output
-        screen_analysis = {
-            "status": "success",
-            "message": "Successfully analyzed screen content",
-            "screen_size": screen_info["screen_size"],
-            "screen_analysis": {
-                "text_elements": {
-                    "total": len(filtered_text_elements),
-                    "by_region": {
-                        "top": [{"text": t.get("text"), "center_x": t.get("center_x"), "center_y": t.get("center_y")} 
-                                for t in texts_by_region["top"] if "center_x" in t and "center_y" in t],
-                        "middle": [{"text": t.get("text"), "center_x": t.get("center_x"), "center_y": t.get("center_y")} 
-                                for t in texts_by_region["middle"] if "center_x" in t and "center_y" in t],
-                        "bottom": [{"text": t.get("text"), "center_x": t.get("center_x"), "center_y": t.get("center_y")} 
-                                for t in texts_by_region["bottom"] if "center_x" in t and "center_y" in t]
-                    },
-                    "all_text": [t.get("text", "") for t in filtered_text_elements]
-                },
-                "ui_patterns": ui_patterns,
-                "clickable_count": screen_info.get("clickable_elements_count", 0),
-                "notable_clickables": notable_clickables
-            },
-            "suggested_actions": suggested_actions,
+        tap_result = await tap_screen(center_x, center_y)
+        invalidate_screen_caches()
+        if tap_result.startswith("Successfully"):
+            return {
+                "status": "success",
+                "message": f"Tapped element '{element_text}' at ({center_x}, {center_y})",
+                "element": _normalize_element(match)
+            }
+        return {
+            "status": "error",
+            "message": tap_result
         }
+    
+    return {
+        "status": "error",
+        "message": f"No element with text '{element_text}' found on screen"
+    }
+
+
+async def _handle_tap(params: Dict[str, Any]) -> str:
+    """Handle the "tap" action of interact_with_screen"""
+    if params.get("element_text"):
+        return json_dumps(await _tap_element_by_text(params["element_text"], params.get("partial", False)))
+    if "x" in params and "y" in params:
+        result = await tap_screen(params["x"], params["y"])
+        invalidate_screen_caches()
+        return result
+    return _ERR_TAP_PARAMS
+
+
+async def _handle_swipe(params: Dict[str, Any]) -> str:
+    """Handle the "swipe" action of interact_with_screen"""
+    if all(k in params for k in ("x1", "y1", "x2", "y2")):
+        duration = params.get("duration", 300)
+        result = await swipe_screen(
+            params["x1"], params["y1"], 
+            params["x2"], params["y2"], 
+            duration
+        )
+        invalidate_screen_caches()
+        return result
+    return _ERR_SWIPE_PARAMS
+
+
+async def _handle_key(params: Dict[str, Any]) -> str:
+    """Handle the "key" action of interact_with_screen"""
+    if "keycode" in params:
+        result = await press_key(params["keycode"])
+        invalidate_screen_caches()
+        return result
+    return _ERR_KEY_PARAM
+
+
+async def _handle_text(params: Dict[str, Any]) -> str:
+    """Handle the "text" action of interact_with_screen"""
+    if "content" in params:
+        result = await input_text(params["content"])
+        invalidate_screen_caches()
+        return result
+    return _ERR_TEXT_PARAM
+
+
+# Search method -> coroutine factory taking (value, params), used by the "find" action
+_FIND_METHODS = {
+    "text": lambda value, params: find_element_by_text(value, params.get("partial", True)),
+    "id": lambda value, params: find_element_by_id(value),
+    "content_desc": lambda value, params: find_element_by_content_desc(value, params.get("partial", True)),
+    "class": lambda value, params: find_element_by_class(value),
+    "clickable": lambda value, params: find_clickable_elements(),
+    "any": lambda value, params: _find_any(value),
+}
+
+
+async def _handle_find(params: Dict[str, Any]) -> str:
+    """Handle the "find" action of interact_with_screen"""
+    method = params.get("method", "text")
+    value = params.get("value", "")
+    
+    if not value and method != "clickable":
+        return _ERR_FIND_VALUE
         
-        return json.dumps(screen_analysis, ensure_ascii=False)
-        
-    except Exception as e:
-        logger.error(f"Error analyzing screen: {str(e)}")
-        return json.dumps({
-            "status": "error",
-            "message": f"Failed to analyze screen: {str(e)}"
+    finder = _FIND_METHODS.get(method)
+    if finder is None:
+        return json_dumps({
+            "status": "error", 
+            "message": f"Unsupported search method: {method}"
         })
+    return await finder(value, params)
+
+
+async def _handle_wait(params: Dict[str, Any]) -> str:
+    """Handle the "wait" action of interact_with_screen"""
+    method = params.get("method", "text")
+    value = params.get("value", "")
+    timeout = params.get("timeout", 30)
+    interval = params.get("interval", 1.0)
+    
+    if not value:
+        return _ERR_WAIT_VALUE
+        
+    return await wait_for_element_eventdriven(method, value, timeout, interval_seconds=interval)
+
+
+async def _handle_scroll(params: Dict[str, Any]) -> str:
+    """Handle the "scroll" action of interact_with_screen"""
+    method = params.get("method", "text")
+    value = params.get("value", "")
+    direction = params.get("direction", "down")
+    max_swipes = params.get("max_swipes", 5)
+    
+    if not value:
+        return _ERR_SCROLL_VALUE
+        
+    result = await scroll_to_element(method, value, direction, max_swipes)
+    invalidate_screen_caches()
+    return result
+
 
+# Action name -> handler used by interact_with_screen
+_HANDLERS = {
+    "tap": _handle_tap,
+    "swipe": _handle_swipe,
+    "key": _handle_key,
+    "text": _handle_text,
+    "find": _handle_find,
+    "wait": _handle_wait,
+    "scroll": _handle_scroll,
+}
 
+# Per-action timeouts. Tap may dump the UI first (element_text) and text input
+# can issue several adb calls for long or non-ASCII content. wait and scroll are
+# bounded by their own timeout and max_swipes parameters, so they are not cut off here.
+_ACTION_TIMEOUTS = {
+    "tap": _ADB_TIMEOUT_UI + _ADB_TIMEOUT_ACTION,
+    "text": COMMAND_TIMEOUT,
+    "find": _ADB_TIMEOUT_UI,
+    "wait": None,
+    "scroll": None,
+}
 
+
+def _action_timeout(action: str, params: Dict[str, Any]) -> Optional[float]:
+    """Timeout for one interact_with_screen action; a swipe also gets its own duration"""
+    if action == "swipe":
+        return params.get("duration", 300) / 1000 + _ADB_TIMEOUT_ACTION
+    return _ACTION_TIMEOUTS.get(action, _ADB_TIMEOUT_ACTION)
+
+
+@mcp_tool_errors("Interaction operation failed")
 async def interact_with_screen(action: str, params: Dict[str, Any]) -> str:
     """Execute screen interaction actions
     
@@ -483,10 +1249,14 @@ async def interact_with_screen(action: str, params: Dict[str, Any]) -> str:
             - "wait": Wait for element to appear
             - "scroll": Scroll to find element
             
-        params (Dict[str, Any]): Parameters dictionary with action-specific values:
+        params (Dict[str, Any]): Parameters dictionary with action-specific values
+                                 (a JSON object string is also accepted). It is treated
+                                 as read-only and never modified:
             For "tap" action:
                 - x (int): X coordinate to tap
                 - y (int): Y coordinate to tap
+                - element_text (str, optional): Tap the element with this text instead of coordinates
+                - partial (bool, optional): Partial text matching for element_text, defaults to False
             
             For "swipe" action:
                 - x1 (int): Start X coordinate
@@ -504,7 +1274,8 @@ async def interact_with_screen(action: str, params: Dict[str, Any]) -> str:
                               Direct Chinese character input may fail on some devices.
             
             For "find" action:
-                - method (str): Search method, one of: "text", "id", "content_desc", "class", "clickable"
+                - method (str): Search method, one of: "text", "id", "content_desc", "class", "clickable", "any"
+                  ("any" tries text, content_desc and id against a single UI dump)
                 - value (str): Text/value to search for (not required for method="clickable")
                 - partial (bool, optional): Use partial matching, defaults to True (for text/content_desc)
             
@@ -544,6 +1315,9 @@ async def interact_with_screen(action: str, params: Dict[str, Any]) -> str:
         # Tap by coordinates
         result = await interact_with_screen("tap", {"x": 100, "y": 200})
         
+        # Tap element by its text
+        result = await interact_with_screen("tap", {"element_text": "Save"})
+        
         # Swipe down
         result = await interact_with_screen("swipe", 
                                            {"x1": 500, "y1": 300, 
@@ -577,110 +1351,22 @@ async def interact_with_screen(action: str, params: Dict[str, Any]) -> str:
                                             "max_swipes": 8})
     """
     try:
-        if action == "tap":
-            if "x" in params and "y" in params:
-                return await tap_screen(params["x"], params["y"])
-            else:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Missing required x and y coordinates for tap action"
-                }, ensure_ascii=False)
-                
-        elif action == "swipe":
-            if all(k in params for k in ["x1", "y1", "x2", "y2"]):
-                duration = params.get("duration", 300)
-                return await swipe_screen(
-                    params["x1"], params["y1"], 
-                    params["x2"], params["y2"], 
-                    duration
-                )
-            else:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Missing coordinates required for swipe"
-                }, ensure_ascii=False)
-                
-        elif action == "key":
-            if "keycode" in params:
-                return await press_key(params["keycode"])
-            else:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Missing key parameter"
-                }, ensure_ascii=False)
-                
-        elif action == "text":
-            if "content" in params:
-                return await input_text(params["content"])
-            else:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Missing text content parameter"
-                }, ensure_ascii=False)
-                
-        elif action == "find":
-            method = params.get("method", "text")
-            value = params.get("value", "")
-            
-            if not value and method != "clickable":
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Finding element requires a search value"
-                }, ensure_ascii=False)
-                
-            if method == "text":
-                return await find_element_by_text(value, params.get("partial", True))
-            elif method == "id":
-                return await find_element_by_id(value)
-            elif method == "content_desc":
-                return await find_element_by_content_desc(value, params.get("partial", True))
-            elif method == "class":
-                return await find_element_by_class(value)
-            elif method == "clickable":
-                return await find_clickable_elements()
-            else:
-                return json.dumps({
-                    "status": "error", 
-                    "message": f"Unsupported search method: {method}"
-                }, ensure_ascii=False)
-                
-        elif action == "wait":
-            method = params.get("method", "text")
-            value = params.get("value", "")
-            timeout = params.get("timeout", 30)
-            interval = params.get("interval", 1.0)
-            
-            if not value:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Waiting for element requires a search value"
-                }, ensure_ascii=False)
-                
-            return await wait_for_element(method, value, timeout, interval)
-            
-        elif action == "scroll":
-            method = params.get("method", "text")
-            value = params.get("value", "")
-            direction = params.get("direction", "down")
-            max_swipes = params.get("max_swipes", 5)
-            
-            if not value:
-                return json.dumps({
-                    "status": "error", 
-                    "message": "Scrolling to find requires a search value"
-                }, ensure_ascii=False)
-                
-            return await scroll_to_element(method, value, direction, max_swipes)
-            
-        else:
-            return json.dumps({
+        handler = _HANDLERS.get(action)
+        if handler is None:
+            return json_dumps({
                 "status": "error", 
                 "message": f"Unsupported interaction action: {action}"
-            }, ensure_ascii=False)
-            
-    except Exception as e:
-        logger.error(f"Error executing interaction action {action}: {str(e)}")
-        return json.dumps({
+            })
+        if params is None:
+            params = {}
+        elif type(params) is dict:
+            params = _coerce_params(params)
+        else:
+            params = _coerce_params(_normalize_params(params), copy=False)
+        return await asyncio.wait_for(handler(params), _action_timeout(action, params))
+    except asyncio.TimeoutError:
+        logger.error(f"Interaction action {action} timed out")
+        return json_dumps({
             "status": "error",
-            "message": f"Interaction operation failed: {str(e)}"
-        }) 
\ No newline at end of file
+            "message": f"adb timeout while executing {action} action"
+        })
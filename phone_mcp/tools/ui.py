@@ -3,24 +3,190 @@ This module provides functions to inspect and interact with UI elements on the d
 """
 
 import asyncio
+import io
 import json
 import re
-import os
-import tempfile
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 import logging
-from ..core import run_command, check_device_connection
+from ..core import run_shell, adb_batch, adb_prefix, check_device_connection, json_dumps, json_loads
+from ..config import COMMAND_TIMEOUT
+
+try:
+    from lxml import etree as lxml_etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
 
 logger = logging.getLogger("phone_mcp")
 
+# Element bounds as written by uiautomator: "[x1,y1][x2,y2]", tolerating
+# a space after the comma from hand-written or reformatted bounds
+_BOUNDS_RE = re.compile(r"\[(-?\d+),\s*(-?\d+)\]\[(-?\d+),\s*(-?\d+)\]")
+
+# Device path reported by "uiautomator dump" (the typo is uiautomator's own)
+_DUMP_PATH_RE = re.compile(r"UI hierchary dumped to: (.*\.xml)")
+
+# Recent dump_ui results shared by the find_element_by_* helpers, so a chain of
+# selector lookups on the same screen costs one UI dump. Entries are keyed by
+# the focused window, expire quickly and are dropped by any tap, swipe, key
+# press or text input. Maps focus -> (timestamp, dump), least recent first.
+_UI_TREE_CACHE_TTL = 1.5  # seconds
+_UI_TREE_CACHE_SIZE = 8
+_ui_tree_cache = OrderedDict()
+
+def _iterparse_ui_xml(source):
+    """Stream (event, element) pairs from a UI dump, using lxml when it is installed
+
+    With lxml, recover=True tolerates the occasional malformed attribute
+    that makes ElementTree reject the whole dump.
+
+    Args:
+        source: Path or binary file object holding the dump XML
+    """
+    if HAS_LXML:
+        return lxml_etree.iterparse(source, events=("start", "end"), recover=True, huge_tree=True)
+    return ET.iterparse(source, events=("start", "end"))
+
+
+def _iter_ui_xml_elements(source):
+    """Yield the elements of a UI dump in document order, parents before children
 
-async def dump_ui():
+    Attributes are complete when an element is yielded; each node is cleared
+    once its end tag has been seen, so memory stays bounded on large dumps.
+
+    Raises:
+        SyntaxError: If the XML cannot be parsed (ET.ParseError or lxml's XMLSyntaxError)
+    """
+    for event, elem in _iterparse_ui_xml(source):
+        if event == "start":
+            yield elem
+            continue
+        elem.clear()
+        if HAS_LXML:
+            # Drop already-processed siblings still referenced by the parent
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _parse_ui_elements(source):
+    """Convert a UI dump into the element dicts returned by dump_ui
+
+    Elements are streamed with _iter_ui_xml_elements, so the list keeps
+    document order and the parsed tree is never held in full.
+
+    Args:
+        source: Path or binary file object holding the dump XML
+
+    Raises:
+        SyntaxError: If the XML cannot be parsed (ET.ParseError or lxml's XMLSyntaxError)
+    """
+    elements = []
+    append = elements.append
+    match_bounds = _BOUNDS_RE.match
+    for elem in _iter_ui_xml_elements(source):
+        get = elem.attrib.get
+        bounds = get('bounds', '')
+        element_data = {
+            "resource_id": get('resource-id', ''),
+            "class_name": get('class', ''),
+            "package": get('package', ''),
+            "content_desc": get('content-desc', ''),
+            "text": get('text', ''),
+            "clickable": get('clickable', 'false').lower() == 'true',
+            "bounds": bounds
+        }
+        
+        # Parse bounds if available
+        if bounds:
+            m = match_bounds(bounds)
+            if m:
+                x1, y1, x2, y2 = m.groups()
+                element_data["center_x"] = (int(x1) + int(x2)) // 2
+                element_data["center_y"] = (int(y1) + int(y2)) // 2
+            else:
+                logger.warning(f"Failed to parse element boundaries: {bounds}")
+        
+        append(element_data)
+    return elements
+
+
+async def _exec_out(*args):
+    """Run ``adb exec-out`` and return its raw stdout bytes
+
+    Returns:
+        bytes: Command output, or None if adb could not be started or timed out
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *adb_prefix(), "exec-out", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        logger.debug(f"adb exec-out unavailable: {str(e)}")
+        return None
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), COMMAND_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    return stdout
+
+
+def _parse_ui_dump_bytes(data):
+    """Parse dump XML embedded in command output into element dicts
+
+    Returns:
+        list: Element dicts as built by _parse_ui_elements, or None if no
+              complete hierarchy is present
+    """
+    # Streamed dumps are followed by "UI hierchary dumped to: /dev/tty"
+    start = data.find(b"<?xml")
+    if start == -1:
+        start = data.find(b"<hierarchy")
+    end = data.rfind(b"</hierarchy>")
+    if start == -1 or end == -1:
+        return None
+    return _parse_ui_elements(io.BytesIO(data[start:end + len(b"</hierarchy>")]))
+
+
+async def _dump_ui_stream():
+    """Dump the UI hierarchy straight to stdout with ``adb exec-out``
+
+    Avoids writing the dump to device storage and reading it back, which costs
+    a second adb round-trip.
+
+    Returns:
+        list: Element dicts as built by _parse_ui_elements, or None if streaming
+              is not supported or failed (callers then fall back to dump-to-file)
+    """
+    stdout = await _exec_out("uiautomator", "dump", "/dev/tty")
+    if stdout is None:
+        return None
+
+    try:
+        return _parse_ui_dump_bytes(stdout)
+    except (SyntaxError, ValueError) as e:
+        logger.debug(f"Failed to parse streamed UI dump: {str(e)}")
+        return None
+
+
+async def dump_ui(minimal=False):
     """Dump the current UI hierarchy from the device.
     
     This function captures the current UI state of the device screen and returns
     it in a structured format. It uses the uiautomator tool to create an XML dump
     of the UI hierarchy.
     
+    Args:
+        minimal (bool): If True, leave out empty and false fields of each element
+                        and return compact (non-indented) JSON. Elements keep
+                        their bounds and center, so tap_element accepts them as-is.
+    
     Returns:
         str: JSON string containing:
             {
@@ -46,130 +212,227 @@ async def dump_ui():
         - Device connection errors
         - Permission errors when accessing UI
         - XML parsing errors
-        - File system errors when handling temporary files
+        - adb errors when reading the dump back from the device
     
     Notes:
         - Requires USB debugging to be enabled
         - Device screen must be on and unlocked
         - May fail if the app has special security measures
     """
-    # Check for connected device
-    connection_status = await check_device_connection()
+    connection_status, dump_data = await _dump_ui_checked()
+    if dump_data is None:
+        return connection_status
+
+    if minimal and "elements" in dump_data:
+        dump_data["elements"] = [
+            {key: value for key, value in element.items() if value != "" and value is not False}
+            for element in dump_data["elements"]
+        ]
+        return json_dumps(dump_data)
+    return json_dumps(dump_data, indent=True)
+
+
+async def _dump_ui_checked():
+    """Check the device connection and dump the UI concurrently
+
+    The connection check is a separate ``adb devices`` call, so its round-trip
+    overlaps with the dump instead of preceding it. A dump taken while no
+    device is ready is discarded.
+
+    Returns:
+        tuple: (connection message, None) if the device is not ready,
+               otherwise (None, dump dict as returned by _dump_ui_data)
+    """
+    connection_status, dump_data = await asyncio.gather(
+        check_device_connection(), _dump_ui_data(), return_exceptions=True
+    )
+    if isinstance(connection_status, BaseException):
+        raise connection_status
     if "ready" not in connection_status:
         logger.error("Device not connected or not ready")
-        return connection_status
+        return connection_status, None
+    if isinstance(dump_data, BaseException):
+        raise dump_data
+    return None, dump_data
 
-    # Create temp file path
-    try:
-        temp_dir = tempfile.gettempdir()
-        temp_file = os.path.join(temp_dir, "ui_dump.xml")
-        logger.debug(f"Temp file path: {temp_file}")
-    except Exception as e:
-        error_msg = f"Failed to create temp file: {str(e)}"
-        logger.error(error_msg)
-        return json.dumps({
-            "status": "error",
-            "message": error_msg
-        }, indent=2)
+
+async def _dump_ui_data():
+    """Dump the UI hierarchy of a connected device (see dump_ui)
+
+    Returns:
+        dict: The dump_ui result before serialization
+    """
+    # Stream the dump directly when the device supports it
+    elements = await _dump_ui_stream()
+    if elements is not None:
+        return {
+            "status": "success",
+            "elements": elements
+        }
 
     # Execute UI dump on device
     logger.debug("Starting UI dump on device")
-    cmd = "adb shell uiautomator dump"
-    success, output = await run_command(cmd)
+    success, output = await run_shell("uiautomator dump")
     logger.debug(f"UI dump command result: {success}, output: {output}")
 
     if not success:
         error_msg = f"UI dump failed: {output}"
         logger.error(error_msg)
-        return json.dumps({
+        return {
             "status": "error",
             "message": error_msg
-        }, indent=2)
+        }
 
     # Get dump file path
     device_file_path = ""
-    match = re.search(r"UI hierchary dumped to: (.*\.xml)", output)
+    match = _DUMP_PATH_RE.search(output)
     if not match:
         error_msg = "Could not find dump file path"
         logger.error(error_msg)
-        return json.dumps({
+        return {
             "status": "error",
             "message": error_msg
-        }, indent=2)
+        }
         
     device_file_path = match.group(1)
     logger.debug(f"Device dump file path: {device_file_path}")
 
-    # Pull file from device
-    cmd = f"adb pull {device_file_path} {temp_file}"
-    success, output = await run_command(cmd)
-    
-    if not success:
-        error_msg = f"Could not pull dump file from device: {output}"
+    # Read the dump file back over exec-out; no local temp file is needed
+    data = await _exec_out("cat", device_file_path)
+    if data is None:
+        error_msg = "Could not read dump file from device"
         logger.error(error_msg)
-        return json.dumps({
+        return {
             "status": "error",
             "message": error_msg
-        }, indent=2)
+        }
 
-    # Parse XML file
+    # Parse XML
     try:
-        tree = ET.parse(temp_file)
-        root = tree.getroot()
-        
-        elements = []
-        for elem in root.iter():
-            element_data = {
-                "resource_id": elem.attrib.get('resource-id', ''),
-                "class_name": elem.attrib.get('class', ''),
-                "package": elem.attrib.get('package', ''),
-                "content_desc": elem.attrib.get('content-desc', ''),
-                "text": elem.attrib.get('text', ''),
-                "clickable": elem.attrib.get('clickable', 'false').lower() == 'true',
-                "bounds": elem.attrib.get('bounds', '')
+        elements = _parse_ui_dump_bytes(data)
+        if elements is None:
+            error_msg = f"Could not read dump file from device: {data[:200].decode('utf-8', 'replace')}"
+            logger.error(error_msg)
+            return {
+                "status": "error",
+                "message": error_msg
             }
-            
-            # Parse bounds if available
-            bounds = elem.attrib.get('bounds', '')
-            if bounds:
-                try:
-                    bounds = bounds.replace('][', ',').replace('[', '').replace(']', '')
-                    coords = bounds.split(',')
-                    if len(coords) == 4:
-                        x1, y1, x2, y2 = map(int, coords)
-                        element_data["center_x"] = (x1 + x2) // 2
-                        element_data["center_y"] = (y1 + y2) // 2
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"Failed to parse element boundaries: {bounds}, error: {str(e)}")
-            
-            elements.append(element_data)
         
-        return json.dumps({
+        return {
             "status": "success",
             "elements": elements
-        }, indent=2)
+        }
         
-    except ET.ParseError as e:
+    except SyntaxError as e:
+        # ET.ParseError and lxml's XMLSyntaxError both derive from SyntaxError
         error_msg = f"Failed to parse XML file: {str(e)}"
         logger.error(error_msg)
-        return json.dumps({
+        return {
             "status": "error",
             "message": error_msg
-        }, indent=2)
+        }
     except Exception as e:
         error_msg = f"Error processing UI dump: {str(e)}"
         logger.error(error_msg)
-        return json.dumps({
+        return {
             "status": "error",
             "message": error_msg
-        }, indent=2)
-    finally:
-        # Clean up temp file
-        try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        except Exception as e:
-            logger.warning(f"Failed to clean up temp file: {str(e)}")
+        }
+
+
+def invalidate_ui_tree_cache():
+    """Forget the cached UI dumps used by the find_element_by_* helpers"""
+    _ui_tree_cache.clear()
+
+
+# Callbacks that drop screen-derived caches held by other modules. Modules
+# importing this one register here instead of being imported back, which
+# keeps every input path able to clear every cache without an import cycle.
+_screen_cache_clearers = [invalidate_ui_tree_cache]
+
+
+def register_screen_cache_clearer(clear):
+    """Register a callback run by invalidate_screen_caches"""
+    _screen_cache_clearers.append(clear)
+
+
+def invalidate_screen_caches():
+    """Drop every cached view of the screen after an input changed it"""
+    for clear in _screen_cache_clearers:
+        clear()
+
+
+async def _current_focus_fingerprint():
+    """Return the mCurrentFocus line of the device, or None if it cannot be read"""
+    success, output = await run_shell("dumpsys window | grep mCurrentFocus")
+    focus = output.strip() if success else ""
+    return focus or None
+
+
+async def _get_ui_dump_entry():
+    """Return the cache entry for the current window
+
+    Entries are lists of [timestamp, dump_ui JSON string or None, decoded dump
+    or None, lookup index or None]. A fresh dump is held as a dict and only
+    serialized when a caller asks for the string; entries for a device that
+    is not connected carry just the connection message.
+
+    The focused window is checked first (one cheap dumpsys call); a dump younger
+    than _UI_TREE_CACHE_TTL for the same window is reused without re-dumping.
+    Entries that cannot be cached are returned without being stored.
+    """
+    focus = await _current_focus_fingerprint()
+    if focus is not None:
+        entry = _ui_tree_cache.get(focus)
+        if entry is not None:
+            if time.monotonic() - entry[0] < _UI_TREE_CACHE_TTL:
+                _ui_tree_cache.move_to_end(focus)
+                return entry
+            del _ui_tree_cache[focus]
+
+    connection_status, dump_data = await _dump_ui_checked()
+    if dump_data is None:
+        return [time.monotonic(), connection_status, None, None]
+
+    entry = [time.monotonic(), None, dump_data, None]
+    # Only cache real dumps
+    if focus is not None and dump_data.get("status") == "success":
+        _ui_tree_cache[focus] = entry
+        if len(_ui_tree_cache) > _UI_TREE_CACHE_SIZE:
+            _ui_tree_cache.popitem(last=False)
+    return entry
+
+
+def _ui_dump_response(entry):
+    """Return the dump_ui JSON string of a cache entry, serializing it on first use"""
+    if entry[1] is None:
+        entry[1] = json_dumps(entry[2], indent=True)
+    return entry[1]
+
+
+async def get_ui_dump_cached():
+    """Return a dump_ui result, reusing one taken moments ago on the same window.
+
+    Returns:
+        str: JSON string in the dump_ui format
+    """
+    return _ui_dump_response(await _get_ui_dump_entry())
+
+
+def _get_ui_dump_index(entry):
+    """Return the (text -> positions, resource id -> positions) index of a decoded entry
+
+    Built once per cached dump, so repeated lookups only scan the distinct
+    texts and ids instead of every element.
+    """
+    if entry[3] is None:
+        by_text = {}
+        by_id = {}
+        for i, element in enumerate(entry[2].get("elements", [])):
+            by_text.setdefault(element.get("text", ""), []).append(i)
+            by_id.setdefault(element.get("resource_id", ""), []).append(i)
+        entry[3] = (by_text, by_id)
+    return entry[3]
 
 
 def process_ui_xml(xml_content):
@@ -181,13 +444,16 @@ def process_ui_xml(xml_content):
     Returns:
         str: JSON string with simplified UI elements
     """
-    # Parse the XML
-    root = ET.fromstring(xml_content)
+    # Stream the XML; the first element is the root, which is not a node
+    nodes = _iter_ui_xml_elements(io.BytesIO(xml_content.encode("utf-8")))
+    next(nodes, None)
 
     # Extract elements into a simplified structure
     elements = []
 
-    for node in root.findall(".//node"):
+    for node in nodes:
+        if node.tag != "node":
+            continue
         element = {}
 
         # Extract key attributes
@@ -224,7 +490,7 @@ def process_ui_xml(xml_content):
             
             # Also extract parsed bounds
             bounds_str = node.attrib["bounds"]
-            bounds_match = re.match(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]", bounds_str)
+            bounds_match = _BOUNDS_RE.match(bounds_str)
             if bounds_match:
                 x1, y1, x2, y2 = map(int, bounds_match.groups())
                 element["bounds_parsed"] = {
@@ -243,8 +509,8 @@ def process_ui_xml(xml_content):
     if not elements:
         logger.warning("No UI elements found")
         
-    return json.dumps(
-        {"status": "success", "count": len(elements), "elements": elements}, indent=2
+    return json_dumps(
+        {"status": "success", "count": len(elements), "elements": elements}, indent=True
     )
 
 
@@ -259,99 +525,133 @@ async def find_element_by_text(text, partial_match=False):
     Returns:
         str: JSON string with matching elements or error message
     """
-    # Get the full UI dump first
-    dump_response = await dump_ui()
-
-    try:
-        dump_data = json.loads(dump_response)
-
-        if dump_data.get("status") != "success":
-            return dump_response  # Return error from dump_ui
-
-        # Find matching elements
-        matches = []
-        for element in dump_data.get("elements", []):
-            element_text = element.get("text", "")
-
-            if (partial_match and text in element_text) or element_text == text:
-                matches.append(element)
-
-        return json.dumps(
-            {
-                "status": "success",
-                "query": text,
-                "partial_match": partial_match,
-                "count": len(matches),
-                "elements": matches,
-            },
-            indent=2,
-        )
-    except json.JSONDecodeError:
-        return json.dumps(
+    # Get the full UI dump first (shared with other lookups on the same screen)
+    entry = await _get_ui_dump_entry()
+    dump_data = entry[2]
+    if dump_data is None:
+        return json_dumps(
             {
                 "status": "error",
                 "message": "Failed to process UI data",
-                "raw_response": dump_response[
+                "raw_response": _ui_dump_response(entry)[
                     :500
                 ],  # Include part of the raw response for debugging
             },
-            indent=2,
+            indent=True,
         )
 
+    if dump_data.get("status") != "success":
+        return _ui_dump_response(entry)  # Return error from dump_ui
+
+    # Find matching elements, in document order
+    elements = dump_data.get("elements", [])
+    by_text = _get_ui_dump_index(entry)[0]
+    if partial_match:
+        positions = sorted(i for key, idx in by_text.items() if text in key for i in idx)
+    else:
+        positions = by_text.get(text, ())
+    matches = [elements[i] for i in positions]
+
+    return json_dumps(
+        {
+            "status": "success",
+            "query": text,
+            "partial_match": partial_match,
+            "count": len(matches),
+            "elements": matches,
+        },
+        indent=True,
+    )
+
 
 async def find_element_by_id(resource_id, package_name=None):
     """Find UI element by resource ID.
 
     Args:
-        resource_id (str): Resource ID to search for
+        resource_id (str): Resource ID to search for. Matches any ID containing it,
+                           except that a full ID (e.g. "com.example:id/title")
+                           present on screen returns only its exact matches.
         package_name (str, optional): Package name to limit search to
 
     Returns:
         str: JSON string with matching elements or error message
     """
-    # Get the full UI dump first
-    dump_response = await dump_ui()
-
-    try:
-        dump_data = json.loads(dump_response)
-
-        if dump_data.get("status") != "success":
-            return dump_response  # Return error from dump_ui
-
-        # Find matching elements
-        matches = []
-        for element in dump_data.get("elements", []):
-            element_id = element.get("resource_id", "")
-            element_package = element.get("package", "")
-
-            # Check if ID matches and (no package filter or package matches)
-            if resource_id in element_id and (
-                package_name is None or package_name in element_package
-            ):
-                matches.append(element)
-
-        return json.dumps(
-            {
-                "status": "success",
-                "query": resource_id,
-                "package_filter": package_name,
-                "count": len(matches),
-                "elements": matches,
-            },
-            indent=2,
-        )
-    except json.JSONDecodeError:
-        return json.dumps(
+    # Get the full UI dump first (shared with other lookups on the same screen)
+    entry = await _get_ui_dump_entry()
+    dump_data = entry[2]
+    if dump_data is None:
+        return json_dumps(
             {
                 "status": "error",
                 "message": "Failed to process UI data",
-                "raw_response": dump_response[
+                "raw_response": _ui_dump_response(entry)[
                     :500
                 ],  # Include part of the raw response for debugging
             },
-            indent=2,
+            indent=True,
         )
 
+    if dump_data.get("status") != "success":
+        return _ui_dump_response(entry)  # Return error from dump_ui
+
+    # Find matching elements, in document order
+    elements = dump_data.get("elements", [])
+    by_id = _get_ui_dump_index(entry)[1]
+    matches = []
+    if ":id/" in resource_id and resource_id in by_id:
+        # Full ID: an exact hit is a dict lookup, no scan needed
+        matches = [
+            elements[i] for i in by_id[resource_id]
+            if package_name is None or package_name in elements[i].get("package", "")
+        ]
+
+    if not matches:
+        positions = sorted(i for key, idx in by_id.items() if resource_id in key for i in idx)
+
+        # Check package filter
+        matches = [
+            elements[i] for i in positions
+            if package_name is None or package_name in elements[i].get("package", "")
+        ]
+
+    return json_dumps(
+        {
+            "status": "success",
+            "query": resource_id,
+            "package_filter": package_name,
+            "count": len(matches),
+            "elements": matches,
+        },
+        indent=True,
+    )
+
+
+def _element_center(element):
+    """Return the (x, y) center of an element dict, or None if it cannot be determined"""
+    # Try to get center coordinates directly
+    center_x = element.get("center_x")
+    center_y = element.get("center_y")
+    
+    if not center_x or not center_y:
+        # Check for parsed bounds
+        bounds_parsed = element.get("bounds_parsed")
+        if bounds_parsed:
+            center_x = (bounds_parsed.get("left", 0) + bounds_parsed.get("right", 0)) // 2
+            center_y = (bounds_parsed.get("top", 0) + bounds_parsed.get("bottom", 0)) // 2
+        else:
+            # Try to parse from bounds string
+            bounds = element.get("bounds", "")
+            if bounds and isinstance(bounds, str):
+                bounds_match = _BOUNDS_RE.match(bounds)
+                if bounds_match:
+                    x1, y1, x2, y2 = map(int, bounds_match.groups())
+                    center_x = (x1 + x2) // 2
+                    center_y = (y1 + y2) // 2
+
+    if not center_x or not center_y:
+        return None
+    return center_x, center_y
+
 
 async def tap_element(element_json):
     """Tap on a UI element by using its center coordinates.
@@ -363,45 +663,78 @@ async def tap_element(element_json):
         str: Success or error message
     """
     try:
-        element = json.loads(element_json)
-        
-        # Try to get center coordinates directly
-        center_x = element.get("center_x")
-        center_y = element.get("center_y")
+        element = json_loads(element_json)
         
-        if not center_x or not center_y:
-            # Check for parsed bounds
-            bounds_parsed = element.get("bounds_parsed")
-            if bounds_parsed:
-                center_x = (bounds_parsed.get("left", 0) + bounds_parsed.get("right", 0)) // 2
-                center_y = (bounds_parsed.get("top", 0) + bounds_parsed.get("bottom", 0)) // 2
-            else:
-                # Try to parse from bounds string
-                bounds = element.get("bounds", "")
-                if bounds and isinstance(bounds, str):
-                    bounds_match = re.match(r"\[(\d+),(\d+)\]\[(\d+),(\d+)\]", bounds)
-                    if bounds_match:
-                        x1, y1, x2, y2 = map(int, bounds_match.groups())
-                        center_x = (x1 + x2) // 2
-                        center_y = (y1 + y2) // 2
-
-        if not center_x or not center_y:
-            return json.dumps({
+        center = _element_center(element)
+        if center is None:
+            return json_dumps({
                 "status": "error",
                 "message": "Could not determine element coordinates"
             })
 
         # Now use our existing tap function
         from .interactions import tap_screen
-        return await tap_screen(center_x, center_y)
+        return await tap_screen(*center)
 
     except json.JSONDecodeError:
-        return json.dumps({
+        return json_dumps({
             "status": "error",
             "message": "Invalid element JSON format"
         })
     except Exception as e:
-        return json.dumps({
+        return json_dumps({
             "status": "error",
             "message": f"Error tapping element: {str(e)}"
         })
+
+
+async def tap_many(taps):
+    """Tap several elements or coordinates in order with a single adb shell round-trip.
+
+    The taps are sent as one ``&&`` chain, so there is no delay between them
+    and the chain stops at the first tap that fails.
+
+    Args:
+        taps (list): Entries to tap, each an element dict or element JSON string
+                     (as accepted by tap_element) or an [x, y] coordinate pair
+
+    Returns:
+        str: JSON string with "status", "count" of taps sent and an error
+             "message" if any entry could not be resolved or the taps failed
+    """
+    if not taps:
+        return json_dumps({
+            "status": "error",
+            "message": "No taps given"
+        })
+
+    commands = []
+    for i, tap in enumerate(taps):
+        try:
+            if isinstance(tap, str):
+                tap = json_loads(tap)
+            if isinstance(tap, dict):
+                center = _element_center(tap)
+            else:
+                center = (int(tap[0]), int(tap[1]))
+        except (ValueError, TypeError, IndexError, KeyError):
+            center = None
+        if center is None:
+            return json_dumps({
+                "status": "error",
+                "message": f"Could not determine coordinates for tap {i}"
+            })
+        commands.append(f"input tap {center[0]} {center[1]}")
+
+    success, output = await adb_batch(commands)
+    invalidate_screen_caches()
+
+    if not success:
+        return json_dumps({
+            "status": "error",
+            "message": f"Failed to tap screen: {output}"
+        })
+    return json_dumps({
+        "status": "success",
+        "count": len(commands)
+    })
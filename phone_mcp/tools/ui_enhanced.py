@@ -3,13 +3,28 @@ This module extends basic UI functionality with advanced features for UI testing
 """
 
 import asyncio
+import importlib.util
 import json
+import logging
 import re
 import time
 from typing import List, Dict, Any, Optional, Callable, Tuple, Union
-from .ui import dump_ui, tap_element, find_element_by_text, find_element_by_id
-from .interactions import swipe_screen, press_key, input_text
-from ..core import run_command, check_device_connection
+from .ui import (
+    dump_ui, _get_ui_dump_entry, _ui_dump_response, tap_element,
+    find_element_by_text, find_element_by_id, invalidate_ui_tree_cache,
+)
+from .interactions import swipe_screen, press_key, input_text, get_screen_size_cached
+from ..core import run_command, check_device_connection, adb_serial
+
+# uiautomator2 pulls in a large dependency tree, so only probe for it here and
+# import it the first time an event-driven wait actually needs it
+HAS_UIAUTOMATOR2 = importlib.util.find_spec("uiautomator2") is not None
+
+logger = logging.getLogger("phone_mcp")
+
+# uiautomator2 device handles by adb serial (None for the default device),
+# each connected on first use
+_u2_devices = {}
 
 
 async def find_element_by_content_desc(
@@ -24,45 +39,43 @@ async def find_element_by_content_desc(
     Returns:
         str: JSON string with matching elements or error message
     """
-    # Get the full UI dump
-    dump_response = await dump_ui()
-
-    try:
-        dump_data = json.loads(dump_response)
-
-        if dump_data.get("status") != "success":
-            return dump_response
-
-        # Find matching elements
-        matches = []
-        for element in dump_data.get("elements", []):
-            element_desc = element.get("content-desc", "")
-
-            if (
-                partial_match and content_desc in element_desc
-            ) or element_desc == content_desc:
-                matches.append(element)
-
-        return json.dumps(
-            {
-                "status": "success",
-                "query": content_desc,
-                "partial_match": partial_match,
-                "count": len(matches),
-                "elements": matches,
-            },
-            indent=2,
-        )
-    except json.JSONDecodeError:
+    # Get the full UI dump (shared with other lookups on the same screen)
+    entry = await _get_ui_dump_entry()
+    dump_data = entry[2]
+    if dump_data is None:
         return json.dumps(
             {
                 "status": "error",
                 "message": "Failed to process UI data",
-                "raw_response": dump_response[:500],
+                "raw_response": _ui_dump_response(entry)[:500],
             },
             indent=2,
         )
 
+    if dump_data.get("status") != "success":
+        return _ui_dump_response(entry)
+
+    # Find matching elements
+    matches = []
+    for element in dump_data.get("elements", []):
+        element_desc = element.get("content-desc", "")
+
+        if (
+            partial_match and content_desc in element_desc
+        ) or element_desc == content_desc:
+            matches.append(element)
+
+    return json.dumps(
+        {
+            "status": "success",
+            "query": content_desc,
+            "partial_match": partial_match,
+            "count": len(matches),
+            "elements": matches,
+        },
+        indent=2,
+    )
+
 
 async def find_element_by_class(
     class_name: str, package_name: Optional[str] = None
@@ -76,46 +89,44 @@ async def find_element_by_class(
     Returns:
         str: JSON string with matching elements or error message
     """
-    # Get the full UI dump
-    dump_response = await dump_ui()
-
-    try:
-        dump_data = json.loads(dump_response)
-
-        if dump_data.get("status") != "success":
-            return dump_response
-
-        # Find matching elements
-        matches = []
-        for element in dump_data.get("elements", []):
-            element_class = element.get("class", "")
-            element_package = element.get("package", "")
-
-            if class_name in element_class and (
-                package_name is None or package_name in element_package
-            ):
-                matches.append(element)
-
-        return json.dumps(
-            {
-                "status": "success",
-                "query": class_name,
-                "package_filter": package_name,
-                "count": len(matches),
-                "elements": matches,
-            },
-            indent=2,
-        )
-    except json.JSONDecodeError:
+    # Get the full UI dump (shared with other lookups on the same screen)
+    entry = await _get_ui_dump_entry()
+    dump_data = entry[2]
+    if dump_data is None:
         return json.dumps(
             {
                 "status": "error",
                 "message": "Failed to process UI data",
-                "raw_response": dump_response[:500],
+                "raw_response": _ui_dump_response(entry)[:500],
             },
             indent=2,
         )
 
+    if dump_data.get("status") != "success":
+        return _ui_dump_response(entry)
+
+    # Find matching elements
+    matches = []
+    for element in dump_data.get("elements", []):
+        element_class = element.get("class", "")
+        element_package = element.get("package", "")
+
+        if class_name in element_class and (
+            package_name is None or package_name in element_package
+        ):
+            matches.append(element)
+
+    return json.dumps(
+        {
+            "status": "success",
+            "query": class_name,
+            "package_filter": package_name,
+            "count": len(matches),
+            "elements": matches,
+        },
+        indent=2,
+    )
+
 
 async def find_clickable_elements() -> str:
     """Find all clickable elements on the screen.
@@ -123,34 +134,32 @@ async def find_clickable_elements() -> str:
     Returns:
         str: JSON string with clickable elements or error message
     """
-    # Get the full UI dump
-    dump_response = await dump_ui()
-    print(dump_response)
-    try:
-        dump_data = json.loads(dump_response)
-
-        if dump_data.get("status") != "success":
-            return dump_response
-
-        # Find clickable elements
-        matches = []
-        for element in dump_data.get("elements", []):
-            if element.get("clickable", False):
-                matches.append(element)
-
-        return json.dumps(
-            {"status": "success", "count": len(matches), "elements": matches}, indent=2
-        )
-    except json.JSONDecodeError:
+    # Get the full UI dump (shared with other lookups on the same screen)
+    entry = await _get_ui_dump_entry()
+    dump_data = entry[2]
+    if dump_data is None:
         return json.dumps(
             {
                 "status": "error",
                 "message": "Failed to process UI data",
-                "raw_response": dump_response[:500],
+                "raw_response": _ui_dump_response(entry)[:500],
             },
             indent=2,
         )
 
+    if dump_data.get("status") != "success":
+        return _ui_dump_response(entry)
+
+    # Find clickable elements
+    matches = []
+    for element in dump_data.get("elements", []):
+        if element.get("clickable", False):
+            matches.append(element)
+
+    return json.dumps(
+        {"status": "success", "count": len(matches), "elements": matches}, indent=2
+    )
+
 
 async def wait_for_element(
     find_method: str,
@@ -195,6 +204,8 @@ async def wait_for_element(
 
     start_time = time.time()
     while time.time() - start_time < timeout_seconds:
+        # Each check needs a fresh dump, not the cached tree of the same window
+        invalidate_ui_tree_cache()
         # Call the appropriate find function
         try:
             if find_method == "clickable":
@@ -239,6 +250,84 @@ async def wait_for_element(
     )
 
 
+def _u2_selector(find_method: str, search_value: str, partial: bool) -> Optional[Dict[str, str]]:
+    """Translate a find method into uiautomator2 selector arguments, matching find_element_by_*"""
+    if find_method == "text":
+        return {"textContains": search_value} if partial else {"text": search_value}
+    if find_method == "content_desc":
+        return {"descriptionContains": search_value} if partial else {"description": search_value}
+    if find_method == "id":
+        return {"resourceIdMatches": f".*{re.escape(search_value)}.*"}
+    if find_method == "class":
+        return {"classNameMatches": f".*{re.escape(search_value)}.*"}
+    return None
+
+
+def _u2_wait(selector: Dict[str, str], timeout_seconds: float, serial: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Block until the selector matches on the device, returning the element info or None"""
+    device = _u2_devices.get(serial)
+    if device is None:
+        import uiautomator2
+
+        device = _u2_devices[serial] = uiautomator2.connect(serial)
+    element = device(**selector)
+    if element.wait(timeout=timeout_seconds):
+        return element.info
+    return None
+
+
+async def wait_for_element_eventdriven(
+    find_method: str,
+    search_value: str,
+    timeout_seconds: int = 30,
+    **kwargs,
+) -> str:
+    """Wait for an element to appear, letting the on-device UI automator do the waiting.
+
+    With uiautomator2 installed, the wait runs as a single waitForExists call on
+    the device, which returns as soon as the element appears instead of dumping
+    the whole UI every interval. Without it (or if the device agent cannot be
+    reached) this falls back to the polling wait_for_element.
+
+    Args:
+        find_method (str): Method to use: "text", "id", "content_desc", "class"
+        search_value (str): Value to search for
+        timeout_seconds (int): Maximum time to wait in seconds
+        **kwargs: Additional arguments for the find method (e.g. partial)
+
+    Returns:
+        str: JSON string with element if found, or error message
+    """
+    selector = _u2_selector(find_method, search_value, kwargs.get("partial", True))
+    if HAS_UIAUTOMATOR2 and selector is not None:
+        start_time = time.time()
+        try:
+            info = await asyncio.to_thread(_u2_wait, selector, timeout_seconds, adb_serial.get())
+        except Exception as e:
+            logger.warning(f"uiautomator2 wait failed, falling back to polling: {str(e)}")
+        else:
+            if info is not None:
+                return json.dumps(
+                    {
+                        "status": "success",
+                        "message": f"Element found after {time.time() - start_time:.1f} seconds",
+                        "element": info,
+                    },
+                    indent=2,
+                )
+            return json.dumps(
+                {
+                    "status": "error",
+                    "message": f"Element not found within {timeout_seconds} seconds",
+                    "find_method": find_method,
+                    "search_value": search_value,
+                },
+                indent=2,
+            )
+
+    return await wait_for_element(find_method, search_value, timeout_seconds, **kwargs)
+
+
 async def wait_until_element_gone(
     find_method: str,
     search_value: str,
@@ -281,6 +370,8 @@ async def wait_until_element_gone(
 
     start_time = time.time()
     while time.time() - start_time < timeout_seconds:
+        # Each check needs a fresh dump, not the cached tree of the same window
+        invalidate_ui_tree_cache()
         # Call the appropriate find function
         try:
             if find_method == "text":
@@ -363,14 +454,10 @@ async def scroll_to_element(
     # Get the appropriate find function
     find_func = find_methods[find_method]
 
-    # Get screen size for swipe calculations
-    screen_size_response = await run_command("adb shell wm size")
-    screen_width, screen_height = 1080, 1920  # Default values
-
-    if screen_size_response[0]:  # If command was successful
-        match = re.search(r"(\d+)x(\d+)", screen_size_response[1])
-        if match:
-            screen_width, screen_height = int(match.group(1)), int(match.group(2))
+    # Get screen size for swipe calculations (queried once per session)
+    screen_size = await get_screen_size_cached()
+    screen_width = screen_size.get("width") or 1080  # Default values
+    screen_height = screen_size.get("height") or 1920
 
     # Define swipe coordinates based on direction
     swipe_coords = {
@@ -3,22 +3,475 @@ Unified MCP Tools for Phone Control
 Consolidates all phone control functionality into 8 core tools for better LLM tool selection
 """
 
-import json
+import functools
 import logging
 from typing import Dict, Any, Optional, List, Union
 import asyncio
+import hashlib
 import os
+import re
+import shlex
 import tempfile
 import time
 from pathlib import Path
+from urllib.parse import urlencode
 
-from ..core import run_command, check_device_connection
+from ..core import (
+    run_command, run_shell, check_device_connection, DEVICE_READY_MESSAGE, adb_serial,
+    device_cache_key, json_dumps, json_loads,
+)
+from ..config import (
+    COMMAND_TIMEOUT,
+    INPUT_COMMAND_TIMEOUT,
+    INSTALL_TIMEOUT,
+    ACTIVITY_START_TIMEOUT,
+    DEVICE_QUERY_TIMEOUT,
+)
 from .omniparser_interface import get_omniparser_client, get_screen_analyzer, get_interaction_manager
 from .prompt_engineering import get_task_guidance, detect_bias_requirement
+from .media import take_screenshot_raw, record_screen_raw
+from .apps import _resolve_launcher_activity, _launcher_activity_cache
+from .ui import invalidate_screen_caches
 
 logger = logging.getLogger("phone_mcp")
 
+# Pre-serialized error responses for fixed messages
+_ERR_INVALID = json_dumps({"status": "error", "message": "Invalid action or missing parameters"})
+_ERR_INVALID_ACTION = json_dumps({"status": "error", "message": "Invalid action"})
 
+# Start of the output run_command and run_shell return when a command times out
+_TIMEOUT_OUTPUT_PREFIX = "Command timed out after "
+
+# Device commands that change what is on screen: input events, activity
+# launches and force-stops, app launches via monkey
+_SCREEN_CHANGING_RE = re.compile(r"(?:^|[;&|]\s*)(?:input|am|monkey)\s")
+
+# Results with more text than this are serialized off the event loop
+_INLINE_DUMPS_LIMIT = 4096
+
+# Actions that can run from coordinates alone, without analyzing the screen
+_COORDINATE_ACTIONS = {"tap", "long_press", "double_tap", "swipe", "scroll", "input_text"}
+
+# Foreground activity lines in `dumpsys activity activities` output
+_FOCUS_RE = re.compile(r"^.*\b(?:mResumedActivity|mFocusedApp|topResumedActivity)\b.*$", re.MULTILINE)
+
+# Key names accepted by phone_system_control press_key, mapped to Android keycodes
+_KEY_MAP = {
+    "home": "3", "back": "4", "menu": "82", "power": "26",
+    "volume_up": "24", "volume_down": "25", "recent_apps": "187"
+}
+
+# (analysis result, index) for the most recently searched analysis
+_element_index_cache: list = [None, None]
+
+# Target lookups answered without OCR (False) and escalated to PaddleOCR (True)
+_analysis_escalations = {False: 0, True: 0}
+
+# phone_web_browser navigation actions that are a single key press
+_BROWSER_KEYCODES = {
+    "back": 4,  # Back button
+    "forward": 125,  # Forward navigation (usually through the menu key)
+}
+_BROWSER_REFRESH_COMMAND = "input swipe 500 300 500 600"  # pull down gesture
+_GOOGLE_SEARCH = "https://www.google.com/search?"
+
+# Read-only build properties reported by get_system_info; fixed for the life of a device
+_SYSTEM_INFO_PROPS = ("ro.build.version.release", "ro.product.model", "ro.product.manufacturer")
+# Keyed by core.device_cache_key(), so a replaced or reconnected device is queried again
+_system_info_cache: Dict[tuple, Dict[str, str]] = {}
+
+# phone_device_info actions, their device shell command and the response field holding the output
+# dumpsys battery fields reported by get_battery, parsed in one regex pass
+_BATTERY_FIELDS = (
+    "level", "scale", "status", "health", "plugged", "temperature", "voltage",
+    "AC powered", "USB powered", "Wireless powered",
+)
+_BATTERY_RE = re.compile(rf"^\s*({'|'.join(_BATTERY_FIELDS)}):\s*(\S.*?)\s*$", re.M)
+# "key: value" pairs of the mWifiInfo line; quoted values (SSID) may contain commas
+_WIFI_INFO_FIELD_RE = re.compile(r'(?:^|, )([^:,]+): ("[^"]*"|[^,]*)')
+
+_DEVICE_INFO_COMMANDS = {
+    "get_system_info": "; ".join(f"echo {prop}=$(getprop {prop})" for prop in _SYSTEM_INFO_PROPS),
+    # Filter on the device so only the reported fields cross the adb transport
+    "get_battery": f"dumpsys battery | grep -E '{'|'.join(_BATTERY_FIELDS)}'",
+    "get_network": "dumpsys wifi | grep -E -m 2 'Wi-Fi is|mWifiInfo'",
+    "get_storage": "df -h /data /sdcard",
+}
+_DEVICE_INFO_FIELDS = {
+    "get_battery": "battery_info",
+    "get_network": "network_info",
+    "get_storage": "storage_info",
+}
+
+# Minimum gap between the two matching screenshots that count as a settled screen
+_SETTLE_SAMPLE_INTERVAL = 0.15
+
+# Monotonic time until which the last action's screen changes may still be in
+# progress, per adb serial (None for the default device)
+_settle_deadlines: Dict[Optional[str], float] = {}
+
+# Printed between batched commands so their output can be split apart again
+_BATCH_SENTINEL = "__SEP__"
+_BATCH_SPLIT_RE = re.compile(rf"{_BATCH_SENTINEL}(\d+)\n")
+
+# Installed packages from `pm list packages` per device serial, as (timestamp, [(lowercased, package)], token index)
+_PKG_CACHE_TTL = 30
+_pkg_cache: Dict[Optional[str], tuple] = {}
+
+
+async def _get_installed_packages() -> Optional[tuple]:
+    """Return installed packages, reusing a recent `pm list packages` result.
+
+    Returns:
+        ([(lowercased, package)], token -> packages index), or None if the
+        package list could not be read
+    """
+    cached = _pkg_cache.get(adb_serial.get())
+    if cached and time.monotonic() - cached[0] < _PKG_CACHE_TTL:
+        return cached[1], cached[2]
+
+    success, output = await _run_device_shell("pm list packages")
+    if not success:
+        return None
+
+    packages = []
+    token_index: Dict[str, List[str]] = {}
+    for line in output.splitlines():
+        if ":" not in line:
+            continue
+        package = line.split(":", 1)[1].strip()
+        package_lc = package.lower()
+        packages.append((package_lc, package))
+        for token in package_lc.split("."):
+            token_index.setdefault(token, []).append(package)
+
+    _pkg_cache[adb_serial.get()] = (time.monotonic(), packages, token_index)
+    return packages, token_index
+
+
+def _find_package(app_name: str, packages: List[tuple], token_index: Dict[str, List[str]]) -> Optional[str]:
+    """Find the package for an app name, trying whole package-name segments first."""
+    app_name_lc = app_name.lower()
+    by_token = token_index.get(app_name_lc)
+    if by_token:
+        return by_token[0]
+    return next((package for package_lc, package in packages if app_name_lc in package_lc), None)
+
+
+def _get_element_index(analysis: Dict[str, Any]) -> tuple:
+    """Return the (uuid -> element, [(content_lc, description_lc, element)]) index of an analysis
+
+    Built once per analysis; the analyzer hands back the same result object
+    while the screen is unchanged, so repeated lookups reuse it.
+    """
+    if _element_index_cache[0] is not analysis:
+        elements = analysis.get("elements", [])
+        by_uuid = {elem.get("uuid"): elem for elem in reversed(elements)}
+        lowered = [
+            (elem.get("content", "").lower(), elem.get("description", "").lower(), elem)
+            for elem in elements
+        ]
+        _element_index_cache[:] = [analysis, (by_uuid, lowered)]
+    return _element_index_cache[1]
+
+
+def _find_target_element(analysis: Dict[str, Any], target: str) -> Optional[Dict[str, Any]]:
+    """Find the element whose uuid equals target, else the first whose content or description contains it"""
+    by_uuid, lowered = _get_element_index(analysis)
+    target_lc = target.lower()
+    return by_uuid.get(target) or next(
+        (elem for content_lc, description_lc, elem in lowered
+         if target_lc in content_lc or target_lc in description_lc),
+        None
+    )
+
+
+def _element_screen_point(analysis: Dict[str, Any], elem: Dict[str, Any]) -> tuple:
+    """Convert an analysis element's normalized center to screen pixels"""
+    screen_size = analysis.get("screen_size", {})
+    return (
+        int(elem["center_x"] * screen_size.get("width", 1080)),
+        int(elem["center_y"] * screen_size.get("height", 1920)),
+    )
+
+
+async def _wait_for_screen_settle(timeout: float) -> None:
+    """Wait until two screenshots in a row are identical, or until timeout elapses.
+
+    Args:
+        timeout: Upper bound in seconds, the fixed delay this replaces
+    """
+    deadline = time.monotonic() + timeout
+    last_digest = None
+    while True:
+        sampled_at = time.monotonic()
+        success, image_data = await take_screenshot_raw()
+        if not success:
+            # No frames to compare; fall back to the fixed delay
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            return
+        digest = hashlib.sha256(image_data).digest()
+        if digest == last_digest:
+            return
+        last_digest = digest
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, max(0.0, _SETTLE_SAMPLE_INTERVAL - (time.monotonic() - sampled_at))))
+
+
+def _defer_screen_settle(delay_seconds: float) -> float:
+    """Record that the screen may still be changing for up to delay_seconds.
+
+    Returns:
+        The delay, echoed back to the caller as ready_after
+    """
+    serial = adb_serial.get()
+    _settle_deadlines[serial] = max(_settle_deadlines.get(serial, 0.0), time.monotonic() + delay_seconds)
+    return delay_seconds
+
+
+async def _await_pending_settle() -> None:
+    """Wait out what is left of a previous action's settle time, if anything."""
+    serial = adb_serial.get()
+    deadline = _settle_deadlines.get(serial, 0.0)
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        await _wait_for_screen_settle(remaining)
+        # Settled (possibly early); don't make the following call wait again
+        if _settle_deadlines.get(serial) == deadline:
+            del _settle_deadlines[serial]
+
+
+async def _run_device_shell(cmd: str, timeout: Optional[float] = None) -> tuple:
+    """run_shell, dropping cached UI trees and screen analyses after screen-changing commands.
+
+    The screen_interface and ui caches are keyed by the focused window, so a
+    tap or scroll inside the same activity would otherwise be answered with
+    the tree from before the action.
+    """
+    try:
+        return await run_shell(cmd, timeout=timeout)
+    finally:
+        if _SCREEN_CHANGING_RE.search(cmd):
+            invalidate_screen_caches()
+
+
+def _timeout_fields(success: bool, output: str, cmd: str) -> Dict[str, Any]:
+    """Extra response fields flagging a timed-out adb command, so the caller can retry it"""
+    if not success and output.startswith(_TIMEOUT_OUTPUT_PREFIX):
+        return {"timed_out": True, "cmd": cmd}
+    return {}
+
+
+def _text_size(obj, limit: int) -> int:
+    """Total length of the strings in obj, counting no further than limit."""
+    if isinstance(obj, str):
+        return len(obj)
+    if isinstance(obj, dict):
+        obj = obj.values()
+    elif not isinstance(obj, (list, tuple)):
+        return 0
+    size = 0
+    for value in obj:
+        size += _text_size(value, limit - size)
+        if size >= limit:
+            break
+    return size
+
+
+def _json_result(fn):
+    """Serialize a unified tool's dict result to JSON once, at the MCP boundary.
+
+    Results that are already JSON strings (the pre-serialized _ERR_* responses)
+    are passed through unchanged. Results carrying more than
+    _INLINE_DUMPS_LIMIT characters of text (element lists, command output)
+    are serialized in a worker thread so other tool calls are not stalled.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs) -> str:
+        result = await fn(*args, **kwargs)
+        if isinstance(result, str):
+            return result
+        if _text_size(result, _INLINE_DUMPS_LIMIT) >= _INLINE_DUMPS_LIMIT:
+            return await asyncio.to_thread(json_dumps, result)
+        return json_dumps(result)
+    return wrapper
+
+
+async def _fan_out(tool, serials: List[str], **kwargs) -> Dict[str, Any]:
+    """Run a unified tool on several devices concurrently.
+
+    Each device runs in its own task with adb_serial set, so the tool's adb
+    commands target that device only.
+
+    Returns:
+        Per-serial results; status is "success" only if every device succeeded
+    """
+    async def run_on(serial: str) -> Dict[str, Any]:
+        adb_serial.set(serial)
+        result = await tool.__wrapped__(**kwargs)
+        return json_loads(result) if isinstance(result, str) else result
+
+    outcomes = await asyncio.gather(*[run_on(serial) for serial in serials], return_exceptions=True)
+    results = {
+        serial: {"status": "error", "message": str(outcome)} if isinstance(outcome, BaseException) else outcome
+        for serial, outcome in zip(serials, outcomes)
+    }
+    all_ok = all(result.get("status") == "success" for result in results.values())
+    return {
+        "status": "success" if all_ok else "error",
+        "action": kwargs.get("action"),
+        "results": results
+    }
+
+
+def _search_url(search_query: str) -> str:
+    """Build the Google search URL for a phone_web_browser search"""
+    return _GOOGLE_SEARCH + urlencode({"q": search_query})
+
+
+def _open_url_command(url: Optional[str], search_query: Optional[str], count: int) -> Optional[str]:
+    return f"am start -a android.intent.action.VIEW -d {shlex.quote(url)}" if url else None
+
+
+def _search_command(url: Optional[str], search_query: Optional[str], count: int) -> Optional[str]:
+    if not search_query:
+        return None
+    return f"am start -a android.intent.action.VIEW -d {shlex.quote(_search_url(search_query))}"
+
+
+def _key_command(keycode: int, url: Optional[str], search_query: Optional[str], count: int) -> Optional[str]:
+    if not isinstance(count, int) or count < 1:
+        return None
+    # input keyevent injects several keycodes from one device process
+    return "input keyevent " + " ".join([str(keycode)] * count)
+
+
+def _refresh_command(url: Optional[str], search_query: Optional[str], count: int) -> Optional[str]:
+    if not isinstance(count, int) or count < 1:
+        return None
+    return "; ".join([_BROWSER_REFRESH_COMMAND] * count)
+
+
+# phone_web_browser action -> builder of its device shell command (None if parameters are missing)
+_BROWSER_ACTIONS = {
+    "open_url": _open_url_command,
+    "search": _search_command,
+    "refresh": _refresh_command,
+    **{action: functools.partial(_key_command, keycode) for action, keycode in _BROWSER_KEYCODES.items()},
+}
+
+
+def _browser_command(
+    action: Optional[str],
+    url: Optional[str] = None,
+    search_query: Optional[str] = None,
+    count: int = 1
+) -> Optional[str]:
+    """Return the device shell command for a phone_web_browser action, or None if it is invalid"""
+    builder = _BROWSER_ACTIONS.get(action)
+    return builder(url, search_query, count) if builder else None
+
+
+def _device_info_result(action: str, success: bool, output: str) -> Dict[str, Any]:
+    """Build the phone_device_info response for the output of one info command"""
+    if action == "get_system_info":
+        if not success:
+            return {"status": "error", "action": action, "output": output}
+        # One "prop=value" line per property
+        system_info = {}
+        for line in output.splitlines():
+            prop, _, value = line.partition("=")
+            if prop in _SYSTEM_INFO_PROPS:
+                system_info[prop] = value.strip()
+        cache_key = device_cache_key()
+        if cache_key is not None:
+            _system_info_cache[cache_key] = system_info
+        return {"status": "success", "action": action, "system_info": system_info}
+    return {
+        "status": "success" if success else "error",
+        "action": action,
+        _DEVICE_INFO_FIELDS[action]: _DEVICE_INFO_PARSERS[action](output) if success else output
+    }
+
+
+def _parse_battery(output: str) -> Dict[str, Any]:
+    """Parse ``dumpsys battery`` lines ("  level: 87") into a dict, with numbers as ints"""
+    return {
+        key: int(value) if value.lstrip("-").isdigit() else value
+        for key, value in _BATTERY_RE.findall(output)
+    }
+
+
+def _parse_network(output: str) -> Dict[str, Any]:
+    """Parse the filtered ``dumpsys wifi`` lines into the Wi-Fi state and the fields of mWifiInfo"""
+    network = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("Wi-Fi is"):
+            network["wifi"] = line[len("Wi-Fi is"):].strip()
+        elif line.startswith("mWifiInfo"):
+            for key, value in _WIFI_INFO_FIELD_RE.findall(line[len("mWifiInfo"):].strip()):
+                network[key.strip()] = value.strip().strip('"')
+    return network
+
+
+def _parse_storage(output: str) -> List[Dict[str, str]]:
+    """Parse ``df -h`` output into one dict per filesystem, keyed by the header columns"""
+    lines = output.strip().splitlines()
+    if not lines:
+        return []
+    header = lines[0].split()
+    if header[-2:] == ["Mounted", "on"]:
+        header[-2:] = ["Mounted on"]
+    return [dict(zip(header, line.split(None, len(header) - 1))) for line in lines[1:] if line.strip()]
+
+
+_DEVICE_INFO_PARSERS = {
+    "get_battery": _parse_battery,
+    "get_network": _parse_network,
+    "get_storage": _parse_storage,
+}
+
+
+async def _run_batch_actions(actions: List[Dict[str, Any]], commands: List[str]) -> Dict[str, Any]:
+    """Run the commands for a list of action steps in one round-trip and report each step"""
+    success, output, outputs = await _run_adb_script(commands)
+    if not success:
+        return {"status": "error", "action": "batch", "output": output}
+    return {
+        "status": "success" if all(ok for ok, _ in outputs) else "error",
+        "action": "batch",
+        "results": [
+            {"action": step.get("action"), "success": ok, "output": out}
+            for step, (ok, out) in zip(actions, outputs)
+        ]
+    }
+
+
+async def _run_adb_script(commands: List[str], timeout: Optional[float] = None) -> tuple:
+    """Run device shell commands in a single round-trip on the persistent adb shell.
+
+    Args:
+        commands: Commands without the ``adb shell`` prefix
+        timeout: Timeout in seconds for the whole script. Defaults to COMMAND_TIMEOUT.
+
+    Returns:
+        tuple: (success, output) for the whole script plus a (success, output)
+        pair for each command
+    """
+    script = "; ".join(f"{command}; echo {_BATCH_SENTINEL}$?" for command in commands)
+    success, output = await _run_device_shell(script, timeout=timeout)
+    if not success:
+        return success, output, []
+    # re.split with a group yields [output, exit code, output, exit code, ..., trailing]
+    parts = _BATCH_SPLIT_RE.split(output)
+    results = [(parts[i + 1] == "0", parts[i].strip()) for i in range(0, len(parts) - 1, 2)]
+    return success, output, results
+
+
+@_json_result
 async def phone_screen_interact(
     action: str,
     target: Optional[str] = None,
@@ -27,7 +480,8 @@ async def phone_screen_interact(
     use_omniparser: bool = True,
     server_url: str = "http://100.122.57.128:9333",
     bias: Optional[bool] = None,
-    delay_seconds: float = 2.0
+    delay_seconds: float = 2.0,
+    commands: Optional[List[str]] = None
 ) -> str:
     """
     ★★★ UNIFIED SCREEN INTERACTION - Use when Omniparser unavailable OR for coordinate-based actions
@@ -54,7 +508,9 @@ async def phone_screen_interact(
         use_omniparser: Use visual element recognition (recommended: True)
         server_url: Omniparser server URL
         bias: Apply bias correction for media content (auto-detected if not specified)
-        delay_seconds: Delay after action operation in seconds (default: 2.0s for TV loading)
+        delay_seconds: Maximum wait for the screen to settle after the action (default: 2.0s for TV loading);
+            paid at the start of the next unified tool call, reported as ready_after
+        commands: Raw device shell commands to run in one adb round-trip (action is ignored)
         
     Returns:
         JSON with interaction result and screen analysis
@@ -64,8 +520,26 @@ async def phone_screen_interact(
         - Input text: {"action": "input_text", "target": "search box", "text": "hello"}
         - Swipe gesture: {"action": "swipe", "coordinates": "500,800,500,200"}
         - Analyze screen: {"action": "analyze_only"}
+        - Batch commands: {"action": "batch", "commands": ["input tap 100 200", "input text hi"]}
     """
     try:
+        await _await_pending_settle()
+        if commands:
+            success, output, outputs = await _run_adb_script(commands)
+            result = {
+                "status": "success" if success and all(ok for ok, _ in outputs) else "error",
+                "action": "batch",
+                "results": [
+                    {"command": command, "success": ok, "output": out}
+                    for command, (ok, out) in zip(commands, outputs)
+                ],
+            }
+            if not success:
+                result["output"] = output
+            if delay_seconds > 0:
+                result["ready_after"] = _defer_screen_settle(delay_seconds)
+            return result
+
         # Auto-detect bias if not specified
         if bias is None and target:
             bias = detect_bias_requirement(target)
@@ -73,15 +547,37 @@ async def phone_screen_interact(
         # Get screen analyzer
         analyzer = get_screen_analyzer(server_url)
         
-        # Always analyze screen first for context
-        analysis_result = await analyzer.analyze_current_screen(use_paddleocr=True)
+        # Coordinate-only gestures need no element lookup, so skip the visual analysis
+        if coordinates and not target and action in _COORDINATE_ACTIONS:
+            analysis_result = None
+        elif target and action != "analyze_only":
+            # Try detection without OCR first; only pay for PaddleOCR if the target isn't found.
+            # Both passes analyze the same capture.
+            success, image_data = await take_screenshot_raw()
+            if not success:
+                return {
+                    "status": "error",
+                    "message": f"Failed to take screenshot: {image_data.decode(errors='replace')}"
+                }
+            analysis_result = await analyzer.analyze_screenshot(image_data, use_paddleocr=False)
+            escalate = _find_target_element(analysis_result, target) is None
+            _analysis_escalations[escalate] += 1
+            if escalate:
+                logger.info(
+                    f"Target '{target}' not found without OCR, escalating to PaddleOCR "
+                    f"({_analysis_escalations[True]}/{sum(_analysis_escalations.values())} lookups escalated)"
+                )
+                analysis_result = await analyzer.analyze_screenshot(image_data, use_paddleocr=True)
+        else:
+            # Analyze screen first for context (reused while the screenshot is unchanged)
+            analysis_result = await analyzer.analyze_current_screen(use_paddleocr=True)
         
         if action == "analyze_only":
-            return json.dumps({
+            return {
                 "status": "success",
                 "action": "analyze_only",
                 "analysis": analysis_result
-            })
+            }
         
         # Get interaction manager
         interaction_manager = get_interaction_manager(server_url)
@@ -91,20 +587,16 @@ async def phone_screen_interact(
         if action in ["tap", "long_press", "double_tap"]:
             if target:
                 # Find element by content and interact
-                elements = analysis_result.get("elements", [])
-                matching_element = None
-                for elem in elements:
-                    if (target.lower() in elem.get("content", "").lower() or 
-                        target.lower() in elem.get("description", "").lower() or
-                        target == elem.get("uuid")):
-                        matching_element = elem
-                        break
+                matching_element = _find_target_element(analysis_result, target)
                 
                 if matching_element:
+                    # Resolve the UUID in the analysis it came from; another run assigns new UUIDs
                     interaction_result = await interaction_manager.execute_action_by_uuid(
-                        matching_element["uuid"], action, bias=bias
+                        matching_element["uuid"], action, bias=bool(bias), analysis=analysis_result
                     )
                     result["interaction"] = interaction_result
+                    if interaction_result.get("status") != "success":
+                        result["status"] = "error"
                 else:
                     result["status"] = "error"
                     result["message"] = f"Element not found: {target}"
@@ -112,13 +604,14 @@ async def phone_screen_interact(
             elif coordinates:
                 # Direct coordinate interaction
                 x, y = map(int, coordinates.split(","))
-                cmd = f"adb shell input tap {x} {y}"
+                cmd = f"input tap {x} {y}"
                 if action == "long_press":
-                    cmd = f"adb shell input swipe {x} {y} {x} {y} 1000"
+                    cmd = f"input swipe {x} {y} {x} {y} 1000"
                 elif action == "double_tap":
-                    cmd = f"adb shell input tap {x} {y} && adb shell input tap {x} {y}"
+                    # Both taps in one shell invocation, so they land within the double-tap window
+                    cmd = f"input tap {x} {y}; input tap {x} {y}"
                 
-                success, output = await run_command(cmd)
+                success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
                 result["interaction"] = {"success": success, "output": output}
         
         elif action == "swipe":
@@ -126,58 +619,63 @@ async def phone_screen_interact(
                 coords = coordinates.split(",")
                 if len(coords) == 4:
                     x1, y1, x2, y2 = map(int, coords)
-                    cmd = f"adb shell input swipe {x1} {y1} {x2} {y2}"
-                    success, output = await run_command(cmd)
+                    cmd = f"input swipe {x1} {y1} {x2} {y2}"
+                    success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
                     result["interaction"] = {"success": success, "output": output}
         
         elif action == "scroll":
             # Default scroll gesture
-            cmd = "adb shell input swipe 500 800 500 200"
-            success, output = await run_command(cmd)
+            cmd = "input swipe 500 800 500 200"
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
             result["interaction"] = {"success": success, "output": output}
         
         elif action == "input_text" and text:
             # Input text at current focus or find input field
+            tap_point = None
             if target:
                 # Find input field and tap first
-                elements = analysis_result.get("elements", [])
-                input_element = None
-                for elem in elements:
-                    if ("input" in elem.get("content", "").lower() or
-                        "text" in elem.get("description", "").lower() or
-                        target.lower() in elem.get("content", "").lower()):
-                        input_element = elem
-                        break
+                _, lowered = _get_element_index(analysis_result)
+                target_lc = target.lower()
+                input_element = next(
+                    (elem for content_lc, description_lc, elem in lowered
+                     if "input" in content_lc or target_lc in content_lc or "text" in description_lc),
+                    None
+                )
                 
                 if input_element:
-                    # Tap on input field first
-                    await interaction_manager.execute_action_by_uuid(input_element["uuid"], "tap")
+                    # Tap on input field first, in the same shell line as the text
+                    tap_point = _element_screen_point(analysis_result, input_element)
+            elif coordinates:
+                tap_point = tuple(map(int, coordinates.split(",")))
             
-            # Input text
-            escaped_text = text.replace('"', '\\"').replace("'", "\\'")
-            cmd = f'adb shell input text "{escaped_text}"'
-            success, output = await run_command(cmd)
+            # Input text, folding the focusing tap (and a short on-device settle) into the same shell line
+            text_cmd = f"input text {shlex.quote(text)}"
+            if tap_point:
+                text_cmd = f"input tap {tap_point[0]} {tap_point[1]}; sleep 0.3; {text_cmd}"
+            success, output = await _run_device_shell(text_cmd)
             result["interaction"] = {"success": success, "output": output}
         
-        # Add delay after action operation for TV loading
+        # Let the screen settle (TV loading) before the next tool call instead of blocking this one
         if delay_seconds > 0 and action in ["tap", "long_press", "double_tap", "swipe", "scroll", "input_text"]:
-            await asyncio.sleep(delay_seconds)
+            result["ready_after"] = _defer_screen_settle(delay_seconds)
         
-        return json.dumps(result)
+        return result
         
     except Exception as e:
         logger.error(f"Screen interaction error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_app_control(
     action: str,
     app_name: Optional[str] = None,
     package_name: Optional[str] = None,
-    activity_name: Optional[str] = None
+    activity_name: Optional[str] = None,
+    serials: Optional[List[str]] = None
 ) -> str:
     """
     ★★ APP MANAGEMENT - Use for all app lifecycle operations
@@ -189,6 +687,7 @@ async def phone_app_control(
         app_name: App display name (for launch action)
         package_name: App package name (for specific package operations)
         activity_name: Specific activity to launch (for launch_activity)
+        serials: Device serials to run the action on concurrently (default: the only connected device)
         
     Returns:
         JSON with operation result
@@ -199,126 +698,144 @@ async def phone_app_control(
         - Stop app: {"action": "terminate", "package_name": "com.android.settings"}
         - Get current app: {"action": "get_current"}
     """
+    if serials:
+        return await _fan_out(
+            phone_app_control, serials, action=action, app_name=app_name,
+            package_name=package_name, activity_name=activity_name
+        )
+    
     try:
-        connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
+        await _await_pending_settle()
+        
+        installed = None
+        if action == "launch_app" and app_name:
+            # Read the package list while the connection check is in flight
+            connection_status, installed = await asyncio.gather(
+                check_device_connection(), _get_installed_packages(), return_exceptions=True
+            )
+            if isinstance(connection_status, BaseException):
+                raise connection_status
+        else:
+            connection_status = await check_device_connection()
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
         
         if action == "launch_app" and app_name:
             # Launch app by name - fixed to avoid shell command substitution issues
-            # First, get the package list
-            list_cmd = "adb shell pm list packages"
-            success, package_list = await run_command(list_cmd)
+            if isinstance(installed, BaseException):
+                logger.warning(f"Failed to read package list: {installed}")
+                installed = None
             
-            if not success:
-                return json.dumps({
+            if installed is None:
+                return {
                     "status": "error",
                     "action": "launch_app",
                     "app_name": app_name,
                     "output": "Failed to get package list"
-                })
+                }
             
             # Find package containing the app name
-            target_package = None
-            for line in package_list.strip().split('\n'):
-                if ':' in line and app_name.lower() in line.lower():
-                    target_package = line.split(':')[1].strip()
-                    break
+            target_package = _find_package(app_name, *installed)
             
             if not target_package:
-                return json.dumps({
+                return {
                     "status": "error",
                     "action": "launch_app",
                     "app_name": app_name,
                     "output": f"Package not found for app: {app_name}"
-                })
+                }
             
-            # Launch the app using the found package
-            cmd = f'adb shell monkey -p {target_package} -c android.intent.category.LAUNCHER 1'
-            success, output = await run_command(cmd)
-            return json.dumps({
+            # Launch the app's cached launcher component; monkey only if it cannot be resolved
+            component = await _resolve_launcher_activity(target_package)
+            if component:
+                cmd = f"am start -n {component}"
+            else:
+                cmd = f'monkey -p {target_package} -c android.intent.category.LAUNCHER 1'
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "launch_app",
                 "app_name": app_name,
                 "package": target_package,
                 "output": output
-            })
+            }
         
         elif action == "launch_activity" and package_name and activity_name:
             # Launch specific activity
-            cmd = f"adb shell am start -n {package_name}/{activity_name}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"am start -n {package_name}/{activity_name}"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "launch_activity",
                 "package_name": package_name,
                 "activity_name": activity_name,
                 "output": output
-            })
+            }
         
         elif action == "terminate" and package_name:
             # Terminate app gracefully
-            cmd = f"adb shell am force-stop {package_name}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"am force-stop {package_name}"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "terminate",
                 "package_name": package_name,
                 "output": output
-            })
+            }
         
         elif action == "force_stop" and package_name:
             # Force stop app
-            cmd = f"adb shell am kill {package_name}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"am kill {package_name}"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "force_stop",
                 "package_name": package_name,
                 "output": output
-            })
+            }
         
         elif action == "list_apps":
             # List all installed apps
-            cmd = "adb shell pm list packages -3"
-            success, output = await run_command(cmd)
+            cmd = "pm list packages -3"
+            success, output = await _run_device_shell(cmd)
             if success:
-                packages = [line.split(":")[1] for line in output.strip().split("\n") if ":" in line]
-                return json.dumps({
+                packages = [line.partition(":")[2].strip() for line in output.splitlines() if ":" in line]
+                return {
                     "status": "success",
                     "action": "list_apps",
                     "packages": packages,
                     "count": len(packages)
-                })
+                }
         
         elif action == "get_current":
             # Get current foreground app
-            cmd = "adb shell dumpsys window windows | grep -E 'mCurrentFocus|mFocusedApp'"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            # Filter on the host instead of forking grep on the device
+            success, output = await _run_device_shell("dumpsys activity activities")
+            if success:
+                output = "\n".join(match.group(0).strip() for match in _FOCUS_RE.finditer(output))
+            return {
                 "status": "success" if success else "error",
                 "action": "get_current",
                 "output": output
-            })
+            }
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        return _ERR_INVALID
         
     except Exception as e:
         logger.error(f"App control error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_system_control(
     action: str,
     key: Optional[str] = None,
     setting: Optional[str] = None,
-    value: Optional[str] = None
+    value: Optional[str] = None,
+    serials: Optional[List[str]] = None
 ) -> str:
     """
     ★★ SYSTEM CONTROL - Use for device settings, navigation, and system operations
@@ -330,6 +847,7 @@ async def phone_system_control(
         key: Key to press (for press_key action): 'home', 'back', 'menu', 'power', 'volume_up', 'volume_down'
         setting: System setting to modify (for setting actions)
         value: Value to set (for setting actions)
+        serials: Device serials to run the action on concurrently (default: the only connected device)
         
     Returns:
         JSON with operation result
@@ -340,91 +858,90 @@ async def phone_system_control(
         - Open settings: {"action": "open_settings"}
         - Press volume up: {"action": "press_key", "key": "volume_up"}
     """
+    if serials:
+        return await _fan_out(phone_system_control, serials, action=action, key=key, setting=setting, value=value)
+    
     try:
-        connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
+        await _await_pending_settle()
         
-        key_mappings = {
-            "home": "3", "back": "4", "menu": "82", "power": "26",
-            "volume_up": "24", "volume_down": "25", "recent_apps": "187"
-        }
+        connection_status = await check_device_connection()
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
         
         if action == "press_key" and key:
-            keycode = key_mappings.get(key.lower(), key)
-            cmd = f"adb shell input keyevent {keycode}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            keycode = _KEY_MAP.get(key.lower(), key)
+            cmd = f"input keyevent {keycode}"
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "press_key",
                 "key": key,
                 "output": output
-            })
+            }
         
         elif action in ["go_home", "home"]:
-            cmd = "adb shell input keyevent 3"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "input keyevent 3"
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "go_home",
                 "output": output
-            })
+            }
         
         elif action == "back":
-            cmd = "adb shell input keyevent 4"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "input keyevent 4"
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "back",
                 "output": output
-            })
+            }
         
         elif action == "open_settings":
-            cmd = "adb shell am start -a android.settings.SETTINGS"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "am start -a android.settings.SETTINGS"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "open_settings",
                 "output": output
-            })
+            }
         
         elif action == "recent_apps":
-            cmd = "adb shell input keyevent 187"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "input keyevent 187"
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "recent_apps",
                 "output": output
-            })
+            }
         
         elif action == "notifications":
-            cmd = "adb shell cmd statusbar expand-notifications"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "cmd statusbar expand-notifications"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "notifications",
                 "output": output
-            })
+            }
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        return _ERR_INVALID
         
     except Exception as e:
         logger.error(f"System control error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_file_operations(
     action: str,
     source_path: Optional[str] = None,
     destination_path: Optional[str] = None,
     apk_path: Optional[str] = None,
-    package_name: Optional[str] = None
+    package_name: Optional[str] = None,
+    serials: Optional[List[str]] = None
 ) -> str:
     """
     ★ FILE OPERATIONS - Use for file transfers, app installation, and storage management
@@ -437,6 +954,7 @@ async def phone_file_operations(
         destination_path: Destination path (for push/pull actions)
         apk_path: APK file path (for install action)
         package_name: Package name (for uninstall/clear_cache actions)
+        serials: Device serials to run the action on concurrently (default: the only connected device)
         
     Returns:
         JSON with operation result
@@ -447,110 +965,126 @@ async def phone_file_operations(
         - Push file: {"action": "push", "source_path": "/local/file", "destination_path": "/sdcard/file"}
         - Clear app cache: {"action": "clear_cache", "package_name": "com.example.app"}
     """
+    if serials:
+        return await _fan_out(
+            phone_file_operations, serials, action=action, source_path=source_path,
+            destination_path=destination_path, apk_path=apk_path, package_name=package_name
+        )
+    
     try:
+        await _await_pending_settle()
+        
         connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
         
         if action == "install" and apk_path:
             if not os.path.exists(apk_path):
-                return json.dumps({
+                return {
                     "status": "error",
                     "message": f"APK file not found: {apk_path}"
-                })
+                }
             
             cmd = f"adb install {apk_path}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            success, output = await run_command(cmd, timeout=INSTALL_TIMEOUT)
+            _pkg_cache.clear()
+            _launcher_activity_cache.clear()
+            return {
                 "status": "success" if success else "error",
                 "action": "install",
                 "apk_path": apk_path,
                 "output": output
-            })
+            }
         
         elif action == "uninstall" and package_name:
             cmd = f"adb uninstall {package_name}"
             success, output = await run_command(cmd)
-            return json.dumps({
+            _pkg_cache.clear()
+            _launcher_activity_cache.pop((adb_serial.get(), package_name), None)
+            return {
                 "status": "success" if success else "error",
                 "action": "uninstall",
                 "package_name": package_name,
                 "output": output
-            })
+            }
         
         elif action == "push" and source_path and destination_path:
             if not os.path.exists(source_path):
-                return json.dumps({
+                return {
                     "status": "error",
                     "message": f"Source file not found: {source_path}"
-                })
+                }
             
             cmd = f"adb push {source_path} {destination_path}"
             success, output = await run_command(cmd)
-            return json.dumps({
+            return {
                 "status": "success" if success else "error",
                 "action": "push",
                 "source_path": source_path,
                 "destination_path": destination_path,
                 "output": output
-            })
+            }
         
         elif action == "pull" and source_path and destination_path:
             cmd = f"adb pull {source_path} {destination_path}"
             success, output = await run_command(cmd)
-            return json.dumps({
+            return {
                 "status": "success" if success else "error",
                 "action": "pull",
                 "source_path": source_path,
                 "destination_path": destination_path,
                 "output": output
-            })
+            }
         
         elif action == "screenshot":
             # Take screenshot and save to temporary file
             timestamp = int(time.time())
-            temp_path = f"/tmp/screenshot_{timestamp}.png"
+            serial = adb_serial.get()
+            temp_path = f"/tmp/screenshot_{serial}_{timestamp}.png" if serial else f"/tmp/screenshot_{timestamp}.png"
             
-            cmd = f"adb shell screencap -p > {temp_path}"
-            success, output = await run_command(cmd)
+            # exec-out keeps the PNG bytes intact; write them in one atomic replace
+            success, image_data = await take_screenshot_raw()
+            if success:
+                fd, partial_path = tempfile.mkstemp(suffix=".png", dir=os.path.dirname(temp_path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(image_data)
+                os.replace(partial_path, temp_path)
             
             if success:
-                return json.dumps({
+                return {
                     "status": "success",
                     "action": "screenshot",
                     "file_path": temp_path,
                     "message": f"Screenshot saved to {temp_path}"
-                })
+                }
             else:
-                return json.dumps({
+                return {
                     "status": "error",
                     "action": "screenshot",
                     "message": "Failed to take screenshot"
-                })
+                }
         
         elif action == "clear_cache" and package_name:
-            cmd = f"adb shell pm clear {package_name}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"pm clear {package_name}"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "clear_cache",
                 "package_name": package_name,
                 "output": output
-            })
+            }
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        return _ERR_INVALID
         
     except Exception as e:
         logger.error(f"File operations error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_communication(
     action: str,
     phone_number: Optional[str] = None,
@@ -578,85 +1112,90 @@ async def phone_communication(
         - Add contact: {"action": "add_contact", "contact_name": "John", "phone_number": "1234567890"}
     """
     try:
+        await _await_pending_settle()
+        
         connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
         
         if action == "call" and phone_number:
-            cmd = f"adb shell am start -a android.intent.action.CALL -d tel:{phone_number}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"am start -a android.intent.action.CALL -d tel:{phone_number}"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "call",
                 "phone_number": phone_number,
                 "output": output
-            })
+            }
         
         elif action == "sms" and phone_number and message:
-            escaped_message = message.replace('"', '\\"')
-            cmd = f'adb shell am start -a android.intent.action.SENDTO -d sms:{phone_number} --es sms_body "{escaped_message}"'
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = (
+                f"am start -a android.intent.action.SENDTO -d {shlex.quote('sms:' + phone_number)} "
+                f"--es sms_body {shlex.quote(message)}"
+            )
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "sms",
                 "phone_number": phone_number,
                 "message": message,
                 "output": output
-            })
+            }
         
         elif action == "hang_up":
-            cmd = "adb shell input keyevent 6"  # KEYCODE_ENDCALL
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "input keyevent 6"  # KEYCODE_ENDCALL
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "hang_up",
                 "output": output
-            })
+            }
         
         elif action == "answer":
-            cmd = "adb shell input keyevent 5"  # KEYCODE_CALL
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "input keyevent 5"  # KEYCODE_CALL
+            success, output = await _run_device_shell(cmd, timeout=INPUT_COMMAND_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "answer",
                 "output": output
-            })
+            }
         
         elif action == "add_contact" and contact_name and phone_number:
-            cmd = f'adb shell am start -a android.intent.action.INSERT -t vnd.android.cursor.dir/contact -e name "{contact_name}" -e phone "{phone_number}"'
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = (
+                "am start -a android.intent.action.INSERT -t vnd.android.cursor.dir/contact "
+                f"-e name {shlex.quote(contact_name)} -e phone {shlex.quote(phone_number)}"
+            )
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "add_contact",
                 "contact_name": contact_name,
                 "phone_number": phone_number,
                 "output": output
-            })
+            }
         
         elif action == "get_contacts":
             # Open contacts app to view contacts
-            cmd = "adb shell am start -a android.intent.action.VIEW -d content://contacts/people"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "am start -a android.intent.action.VIEW -d content://contacts/people"
+            success, output = await _run_device_shell(cmd)
+            return {
                 "status": "success" if success else "error",
                 "action": "get_contacts",
                 "output": output,
                 "message": "Contacts app opened"
-            })
+            }
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        return _ERR_INVALID
         
     except Exception as e:
         logger.error(f"Communication error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_media_control(
     action: str,
     media_file: Optional[str] = None,
@@ -672,7 +1211,8 @@ async def phone_media_control(
         action: Action to perform: 'play_media', 'start_recording', 'stop_recording', 'take_photo', 'open_camera'
         media_file: Media file path to play
         recording_time: Recording duration in seconds
-        output_path: Output file path for recordings
+        output_path: Output file path for recordings. A .h264 path (the default) receives
+            a raw H.264 stream; any other path receives an MP4 recorded on the device
         
     Returns:
         JSON with operation result
@@ -684,93 +1224,110 @@ async def phone_media_control(
         - Open camera: {"action": "open_camera"}
     """
     try:
+        await _await_pending_settle()
+        
         connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
         
         if action == "play_media" and media_file:
-            cmd = f"adb shell am start -a android.intent.action.VIEW -d file://{media_file}"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = f"am start -a android.intent.action.VIEW -d file://{media_file}"
+            success, output = await _run_device_shell(cmd, timeout=ACTIVITY_START_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "play_media",
                 "media_file": media_file,
-                "output": output
-            })
+                "output": output,
+                **_timeout_fields(success, output, cmd)
+            }
         
         elif action == "start_recording":
             duration = recording_time or 30
-            output_file = output_path or f"/tmp/screen_recording_{int(time.time())}.mp4"
+            timestamp = int(time.time())
+            output_file = output_path or f"/tmp/screen_recording_{timestamp}.h264"
             
-            cmd = f"adb shell screenrecord --time-limit {duration} /sdcard/screen_recording.mp4"
-            success, output = await run_command(cmd)
+            # Stream H.264 straight to the local file; record on the device and pull if
+            # unsupported, or if the caller asked for a container format such as .mp4
+            success = False
+            if output_file.endswith(".h264"):
+                success, output = await record_screen_raw(duration, output_file)
+            if not success:
+                if output_file.endswith(".h264"):
+                    logger.info(f"Streaming screen recording failed, recording on device instead: {output}")
+                output_file = output_path or f"/tmp/screen_recording_{timestamp}.mp4"
+                cmd = f"adb shell screenrecord --time-limit {duration} /sdcard/screen_recording.mp4"
+                success, output = await run_command(cmd, timeout=duration + COMMAND_TIMEOUT)
+                
+                if success:
+                    # Pull the recording to local path
+                    pull_cmd = f"adb pull /sdcard/screen_recording.mp4 {output_file}"
+                    await run_command(pull_cmd)
             
             if success:
-                # Pull the recording to local path
-                pull_cmd = f"adb pull /sdcard/screen_recording.mp4 {output_file}"
-                await run_command(pull_cmd)
-                
-                return json.dumps({
+                return {
                     "status": "success",
                     "action": "start_recording",
                     "duration": duration,
                     "output_file": output_file,
                     "message": f"Screen recording saved to {output_file}"
-                })
+                }
             else:
-                return json.dumps({
+                return {
                     "status": "error",
                     "action": "start_recording",
                     "message": "Failed to start recording"
-                })
+                }
         
         elif action == "stop_recording":
             # Stop current recording
-            cmd = "adb shell pkill -f screenrecord"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "pkill -f screenrecord"
+            success, output = await _run_device_shell(cmd, timeout=DEVICE_QUERY_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "stop_recording",
-                "output": output
-            })
+                "output": output,
+                **_timeout_fields(success, output, cmd)
+            }
         
         elif action == "take_photo":
-            cmd = "adb shell am start -a android.media.action.IMAGE_CAPTURE"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "am start -a android.media.action.IMAGE_CAPTURE"
+            success, output = await _run_device_shell(cmd, timeout=ACTIVITY_START_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "take_photo",
                 "output": output,
-                "message": "Camera app opened for photo capture"
-            })
+                "message": "Camera app opened for photo capture",
+                **_timeout_fields(success, output, cmd)
+            }
         
         elif action == "open_camera":
-            cmd = "adb shell am start -a android.media.action.STILL_IMAGE_CAMERA"
-            success, output = await run_command(cmd)
-            return json.dumps({
+            cmd = "am start -a android.media.action.STILL_IMAGE_CAMERA"
+            success, output = await _run_device_shell(cmd, timeout=ACTIVITY_START_TIMEOUT)
+            return {
                 "status": "success" if success else "error",
                 "action": "open_camera",
-                "output": output
-            })
+                "output": output,
+                **_timeout_fields(success, output, cmd)
+            }
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        return _ERR_INVALID
         
     except Exception as e:
         logger.error(f"Media control error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_web_browser(
     action: str,
     url: Optional[str] = None,
     search_query: Optional[str] = None,
-    bookmark_title: Optional[str] = None
+    bookmark_title: Optional[str] = None,
+    actions: Optional[List[Dict[str, Any]]] = None,
+    count: int = 1
 ) -> str:
     """
     ★ WEB BROWSER - Use for web browsing, search, and URL operations
@@ -782,6 +1339,8 @@ async def phone_web_browser(
         url: URL to open
         search_query: Search query for search engines
         bookmark_title: Title for bookmark
+        actions: Several steps ({"action", "url", "search_query", "count"}) to run in one adb round-trip (action is ignored)
+        count: Number of times to repeat 'back', 'forward' or 'refresh'
         
     Returns:
         JSON with operation result
@@ -791,79 +1350,57 @@ async def phone_web_browser(
         - Search web: {"action": "search", "search_query": "weather today"}
         - Refresh page: {"action": "refresh"}
         - Go back: {"action": "back"}
+        - Go back three pages: {"action": "back", "count": 3}
+        - Open then refresh: {"action": "batch", "actions": [{"action": "open_url", "url": "https://example.com"}, {"action": "refresh"}]}
     """
     try:
-        connection_status = await check_device_connection()
-        if "ready" not in connection_status:
-            return json.dumps({"status": "error", "message": connection_status})
-        
-        if action == "open_url" and url:
-            cmd = f"adb shell am start -a android.intent.action.VIEW -d '{url}'"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "open_url",
-                "url": url,
-                "output": output
-            })
-        
-        elif action == "search" and search_query:
-            search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
-            cmd = f"adb shell am start -a android.intent.action.VIEW -d '{search_url}'"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "search",
-                "search_query": search_query,
-                "url": search_url,
-                "output": output
-            })
-        
-        elif action == "refresh":
-            # Refresh current page (pull down gesture)
-            cmd = "adb shell input swipe 500 300 500 600"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "refresh",
-                "output": output
-            })
-        
-        elif action == "back":
-            cmd = "adb shell input keyevent 4"  # Back button
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "back",
-                "output": output
-            })
+        await _await_pending_settle()
         
-        elif action == "forward":
-            # Forward navigation (usually through menu)
-            cmd = "adb shell input keyevent 125"  # Menu key
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "forward",
-                "output": output
-            })
-        
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action or missing parameters"
-        })
+        connection_status = await check_device_connection()
+        if connection_status != DEVICE_READY_MESSAGE:
+            return {"status": "error", "message": connection_status}
+        
+        if actions:
+            commands = [
+                _browser_command(step.get("action"), step.get("url"), step.get("search_query"), step.get("count", 1))
+                for step in actions
+            ]
+            if None in commands:
+                return {
+                    "status": "error",
+                    "message": f"Invalid action or missing parameters in step {commands.index(None)}"
+                }
+            return await _run_batch_actions(actions, commands)
+        
+        cmd = _browser_command(action, url, search_query, count)
+        if cmd is None:
+            return _ERR_INVALID
+        
+        timeout = INPUT_COMMAND_TIMEOUT * count if cmd.startswith("input ") else ACTIVITY_START_TIMEOUT
+        success, output = await _run_device_shell(cmd, timeout=timeout)
+        result = {"status": "success" if success else "error", "action": action}
+        result.update(_timeout_fields(success, output, cmd))
+        if action == "open_url":
+            result["url"] = url
+        elif action == "search":
+            result["search_query"] = search_query
+            result["url"] = _search_url(search_query)
+        result["output"] = output
+        return result
         
     except Exception as e:
         logger.error(f"Web browser error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
+        }
 
 
+@_json_result
 async def phone_device_info(
     action: str,
-    info_type: Optional[str] = None
+    info_type: Optional[str] = None,
+    actions: Optional[List[Dict[str, Any]]] = None
 ) -> str:
     """
     ★ DEVICE INFO - Use for device status, connection, and diagnostic information
@@ -873,6 +1410,7 @@ async def phone_device_info(
     Args:
         action: Action to perform: 'check_connection', 'get_system_info', 'get_battery', 'get_network', 'get_storage'
         info_type: Specific info type to retrieve
+        actions: Several info steps ({"action"}) to read in one adb round-trip (action is ignored)
         
     Returns:
         JSON with device information
@@ -882,73 +1420,60 @@ async def phone_device_info(
         - Get system info: {"action": "get_system_info"}
         - Get battery info: {"action": "get_battery"}
         - Get network info: {"action": "get_network"}
+        - Battery and storage: {"action": "batch", "actions": [{"action": "get_battery"}, {"action": "get_storage"}]}
     """
     try:
-        if action == "check_connection":
+        if action == "check_connection" and not actions:
             connection_status = await check_device_connection()
-            return json.dumps({
+            return {
                 "status": "success",
                 "action": "check_connection",
                 "connection_status": connection_status,
-                "connected": "ready" in connection_status
-            })
-        
-        elif action == "get_system_info":
-            cmd = "adb shell getprop"
-            success, output = await run_command(cmd)
-            
-            if success:
-                # Parse key system properties
-                lines = output.strip().split('\n')
-                system_info = {}
-                for line in lines:
-                    if '[' in line and ']' in line:
-                        key = line.split('[')[1].split(']')[0]
-                        value = line.split('[')[2].split(']')[0] if line.count('[') > 1 else ""
-                        if key in ['ro.build.version.release', 'ro.product.model', 'ro.product.manufacturer']:
-                            system_info[key] = value
-                
-                return json.dumps({
-                    "status": "success",
-                    "action": "get_system_info",
-                    "system_info": system_info
-                })
-        
-        elif action == "get_battery":
-            cmd = "adb shell dumpsys battery"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "get_battery",
-                "battery_info": output
-            })
-        
-        elif action == "get_network":
-            cmd = "adb shell dumpsys wifi"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "get_network",
-                "network_info": output
-            })
+                "connected": connection_status == DEVICE_READY_MESSAGE
+            }
+        
+        if actions:
+            steps = [step.get("action") for step in actions]
+            invalid = [step for step in steps if step not in _DEVICE_INFO_COMMANDS]
+            if invalid:
+                return {"status": "error", "message": f"Invalid action in batch: {invalid[0]}"}
+            commands = [_DEVICE_INFO_COMMANDS[step] for step in steps]
+            success, output, outputs = await _run_adb_script(commands, timeout=DEVICE_QUERY_TIMEOUT * len(commands))
+            if not success:
+                return {
+                    "status": "error",
+                    "action": "batch",
+                    "output": output,
+                    **_timeout_fields(success, output, "; ".join(commands))
+                }
+            results = [_device_info_result(step, ok, out) for step, (ok, out) in zip(steps, outputs)]
+            return {
+                "status": "success" if all(r["status"] == "success" for r in results) else "error",
+                "action": "batch",
+                "results": results
+            }
+        
+        if action == "get_system_info":
+            # Confirms the cached device is still the one connected (memoized)
+            connection_status = await check_device_connection()
+            if connection_status != DEVICE_READY_MESSAGE:
+                return {"status": "error", "message": connection_status}
+            system_info = _system_info_cache.get(device_cache_key())
+            if system_info is not None:
+                return {"status": "success", "action": action, "system_info": system_info}
         
-        elif action == "get_storage":
-            cmd = "adb shell df"
-            success, output = await run_command(cmd)
-            return json.dumps({
-                "status": "success" if success else "error",
-                "action": "get_storage",
-                "storage_info": output
-            })
+        if action in _DEVICE_INFO_COMMANDS:
+            cmd = _DEVICE_INFO_COMMANDS[action]
+            success, output = await _run_device_shell(cmd, timeout=DEVICE_QUERY_TIMEOUT)
+            result = _device_info_result(action, success, output)
+            result.update(_timeout_fields(success, output, cmd))
+            return result
         
-        return json.dumps({
-            "status": "error",
-            "message": "Invalid action"
-        })
+        return _ERR_INVALID_ACTION
         
     except Exception as e:
         logger.error(f"Device info error: {e}")
-        return json.dumps({
+        return {
             "status": "error",
             "message": str(e)
-        })
\ No newline at end of file
+        }
@@ -0,0 +1,56 @@
+import pytest
+
+from phone_mcp.tools import contacts
+
+
+class TestBatchedContactCreation:
+    """测试一次adb往返完成的联系人创建快速路径"""
+
+    @pytest.fixture
+    def device(self, monkeypatch):
+        """模拟adb批处理和联系人数量查询"""
+        state = {"batches": [], "batch_result": (True, "Starting: Intent { act=android.intent.action.INSERT }"),
+                 "counts": [0]}
+
+        async def fake_adb_batch(commands, timeout=None):
+            state["batches"].append(commands)
+            return state["batch_result"]
+
+        async def fake_count(name):
+            counts = state["counts"]
+            return counts.pop(0) if len(counts) > 1 else counts[0]
+
+        async def fake_corner():
+            return 972, 192
+
+        monkeypatch.setattr(contacts, "adb_batch", fake_adb_batch)
+        monkeypatch.setattr(contacts, "_count_contacts_named", fake_count)
+        monkeypatch.setattr(contacts, "_confirm_corner_coords", fake_corner)
+        monkeypatch.setattr(contacts, "_SAVE_CONFIRM_INTERVAL", 0)
+        return state
+
+    async def test_saved_contact_confirmed_by_provider(self, device):
+        """测试点击保存后联系人数量增加即视为保存成功"""
+        device["counts"] = [0, 0, 1]
+
+        assert await contacts._create_contact_batched("O'Brien", "123") == (True, True)
+        commands = device["batches"][0]
+        assert "'O'\"'\"'Brien'" in commands[0]
+        assert commands[-1] == "input tap 972 192"
+
+    async def test_intent_error_reports_not_launched(self, device):
+        """测试am start报错时表单未打开，交给慢速路径处理"""
+        device["batch_result"] = (False, "Error: Activity not started, unable to resolve Intent")
+
+        assert await contacts._create_contact_batched("Alice", "123") == (False, False)
+
+    async def test_failed_tap_keeps_launched_form(self, device):
+        """测试表单已打开但点击失败时不再打开第二个编辑器"""
+        device["batch_result"] = (False, "Starting: Intent { act=android.intent.action.INSERT }")
+
+        assert await contacts._create_contact_batched("Alice", "123") == (True, False)
+
+    async def test_unconfirmed_save(self, device):
+        """测试联系人数量始终未增加时报告未保存"""
+        assert await contacts._create_contact_batched("Alice", "123") == (True, False)
+        assert len(device["batches"]) == 1
@@ -0,0 +1,220 @@
+import asyncio
+import re
+
+import pytest
+
+from phone_mcp import core
+
+
+class FakeShellProcess:
+    """模拟adb shell进程：解析写入的脚本，按预设结果输出命令输出和哨兵行"""
+
+    SCRIPT_RE = re.compile(rb"\{ (.*)\n\} </dev/null 2>&1\necho (\S+)\$\?\n", re.S)
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.commands = []
+        self.returncode = None
+        self.stdin = self
+        self.stdout = asyncio.StreamReader()
+
+    def write(self, data):
+        match = self.SCRIPT_RE.fullmatch(data)
+        command, sentinel = match.group(1).decode(), match.group(2)
+        self.commands.append(command)
+        response = self.responses.get(command, ("", 0))
+        if response is None:
+            # 模拟一直不返回的命令
+            return
+        output, status = response
+        # 下一轮事件循环再输出，让并发的调用有机会交错
+        asyncio.get_running_loop().call_soon(
+            self.stdout.feed_data, output.encode() + sentinel + str(status).encode() + b"\n"
+        )
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    def kill(self):
+        self.returncode = -9
+        self.stdout.feed_eof()
+
+    async def wait(self):
+        return self.returncode
+
+
+@pytest.fixture
+def fake_shell(monkeypatch):
+    """替换create_subprocess_exec，记录启动的adb shell进程"""
+    processes = []
+    responses = {}
+
+    async def fake_create_subprocess_exec(*args, **kwargs):
+        assert args == ("adb", "shell")
+        process = FakeShellProcess(responses)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(core.asyncio, "create_subprocess_exec", fake_create_subprocess_exec)
+    return processes, responses
+
+
+class TestAdbShellSession:
+    """测试持久adb shell会话的哨兵分帧"""
+
+    async def test_output_and_status_framed_by_sentinel(self, fake_shell):
+        """测试输出和退出码按哨兵行切分，多条命令复用同一个shell"""
+        processes, responses = fake_shell
+        responses.update({"echo hi": ("hi\n", 0), "false": ("", 1), "printf x": ("x", 0)})
+        session = core.AdbShellSession()
+
+        assert await session.run("echo hi") == (True, "hi\n")
+        assert await session.run("false") == (False, "")
+        # 没有换行结尾的输出与哨兵在同一行
+        assert await session.run("printf x") == (True, "x")
+        assert len(processes) == 1
+        assert processes[0].commands == ["echo hi", "false", "printf x"]
+        await session.close()
+
+    async def test_timeout_replaces_shell(self, fake_shell):
+        """测试命令超时后丢弃shell，下一条命令启动新的shell"""
+        processes, responses = fake_shell
+        responses["sleep 100"] = None
+        session = core.AdbShellSession()
+
+        success, output = await session.run("sleep 100", timeout=0.05)
+        assert not success
+        assert "timed out" in output
+        assert processes[0].returncode is not None
+
+        assert await session.run("echo ok") == (True, "")
+        assert len(processes) == 2
+        await session.close()
+
+    async def test_idle_close_skips_running_command(self, fake_shell):
+        """测试空闲关闭不会打断正在执行的命令"""
+        processes, _ = fake_shell
+        session = core.AdbShellSession()
+        await session.run("echo ok")
+
+        async with session._lock:
+            await session._close_idle()
+            assert processes[0].returncode is None
+
+        await session._close_idle()
+        assert processes[0].returncode is not None
+
+
+class TestAdbShellPool:
+    """测试adb shell会话池"""
+
+    async def test_sequential_calls_reuse_one_shell(self, fake_shell):
+        """测试顺序调用总是复用最近使用的shell"""
+        processes, _ = fake_shell
+        pool = core.AdbShellPool(size=2)
+
+        for _ in range(3):
+            await pool.run("echo ok")
+
+        assert len(processes) == 1
+        await pool.close()
+
+    async def test_concurrent_calls_use_separate_shells(self, fake_shell):
+        """测试并发调用分到不同的shell，超出池大小的调用排队等待"""
+        processes, responses = fake_shell
+        responses.update({"echo a": ("a\n", 0), "echo b": ("b\n", 0), "echo c": ("c\n", 0)})
+        pool = core.AdbShellPool(size=2)
+
+        results = await asyncio.gather(pool.run("echo a"), pool.run("echo b"), pool.run("echo c"))
+
+        assert results == [(True, "a\n"), (True, "b\n"), (True, "c\n")]
+        assert len(processes) == 2
+        await pool.close()
+
+
+class TestDeviceConnectionPerSerial:
+    """测试按adb_serial区分的设备连接检查"""
+
+    @pytest.fixture
+    def fake_adb(self, monkeypatch):
+        """模拟只连接了设备A的adb，记录每次调用的命令和序列号"""
+        calls = []
+
+        async def fake_run_command(cmd, timeout=None):
+            serial = core.adb_serial.get()
+            calls.append((serial, cmd))
+            if cmd == "adb shell echo ready":
+                if serial == "A":
+                    return True, "ready\n"
+                return False, f"error: device '{serial}' not found"
+            if cmd == "adb devices":
+                return True, "List of devices attached\nA\tdevice\nC\toffline\n"
+            return False, "unexpected command"
+
+        monkeypatch.setattr(core, "run_command", fake_run_command)
+        monkeypatch.setattr(core, "_last_serial", None)
+        return calls
+
+    async def check(self, serial):
+        token = core.adb_serial.set(serial)
+        try:
+            return await core.check_device_connection()
+        finally:
+            core.adb_serial.reset(token)
+
+    async def test_concurrent_serials_get_their_own_verdict(self, fake_adb):
+        """测试并发检查两个序列号时，缺失的设备不会继承另一台设备的结果"""
+        status_a, status_b = await asyncio.gather(self.check("A"), self.check("B"))
+
+        assert status_a == core.DEVICE_READY_MESSAGE
+        assert status_b != core.DEVICE_READY_MESSAGE
+        # TTL内再次检查B仍然报告未连接
+        assert await self.check("B") != core.DEVICE_READY_MESSAGE
+
+    async def test_requested_serial_must_be_listed_as_device(self, fake_adb):
+        """测试指定序列号时，adb devices中其他设备或离线设备不算已连接"""
+        assert await self.check("C") != core.DEVICE_READY_MESSAGE
+        # 指定序列号的检查不会改写默认设备，也不会重启adb服务
+        assert core._last_serial is None
+        assert all("server" not in cmd for _, cmd in fake_adb)
+
+        assert await self.check(None) == core.DEVICE_READY_MESSAGE
+        assert core._last_serial == "A"
+
+    async def test_ready_verdict_reused_within_ttl(self, fake_adb):
+        """测试TTL内的重复检查直接复用“就绪”结果"""
+        assert await self.check("A") == core.DEVICE_READY_MESSAGE
+        probes = len(fake_adb)
+
+        assert await self.check("A") == core.DEVICE_READY_MESSAGE
+        assert len(fake_adb) == probes
+
+    async def test_concurrent_checks_share_one_probe(self, fake_adb):
+        """测试同一序列号的并发检查共享一次探测"""
+        statuses = await asyncio.gather(*[self.check("A") for _ in range(5)])
+
+        assert statuses == [core.DEVICE_READY_MESSAGE] * 5
+        assert fake_adb == [("A", "adb shell echo ready")]
+
+    async def test_invalidate_forces_new_probe(self, fake_adb):
+        """测试连接失效后重新探测，并更换设备缓存键"""
+        assert await self.check("A") == core.DEVICE_READY_MESSAGE
+        token = core.adb_serial.set("A")
+        try:
+            key = core.device_cache_key()
+        finally:
+            core.adb_serial.reset(token)
+        probes = len(fake_adb)
+
+        core.invalidate_device_connection()
+
+        assert await self.check("A") == core.DEVICE_READY_MESSAGE
+        assert len(fake_adb) == probes + 1
+        token = core.adb_serial.set("A")
+        try:
+            assert core.device_cache_key() != key
+        finally:
+            core.adb_serial.reset(token)
@@ -0,0 +1,40 @@
+from phone_mcp.tools.omniparser_interface import OmniparserScreenAnalyzer
+
+
+class TestScreenshotDigestCache:
+    """测试按截图摘要缓存的Omniparser分析结果"""
+
+    def make_analyzer(self, monkeypatch):
+        analyzer = OmniparserScreenAnalyzer(omniparser_client=None)
+        calls = []
+
+        async def fake_analyze_image(image_data, use_paddleocr, start_time):
+            calls.append((image_data, use_paddleocr))
+            return {"status": "success", "elements": [], "image": image_data}
+
+        monkeypatch.setattr(analyzer, "_analyze_image", fake_analyze_image)
+        return analyzer, calls
+
+    async def test_identical_screenshot_reuses_analysis(self, monkeypatch):
+        """测试相同截图只分析一次，OCR选项不同则分别分析"""
+        analyzer, calls = self.make_analyzer(monkeypatch)
+
+        first = await analyzer.analyze_screenshot(b"png-1", use_paddleocr=False)
+        second = await analyzer.analyze_screenshot(b"png-1", use_paddleocr=False)
+        await analyzer.analyze_screenshot(b"png-1", use_paddleocr=True)
+        await analyzer.analyze_screenshot(b"png-2", use_paddleocr=False)
+
+        assert second is first
+        assert calls == [(b"png-1", False), (b"png-1", True), (b"png-2", False)]
+
+    async def test_cache_is_bounded(self, monkeypatch):
+        """测试缓存超过容量时淘汰最久未使用的截图"""
+        analyzer, calls = self.make_analyzer(monkeypatch)
+        size = analyzer._digest_cache_size
+
+        for i in range(size + 1):
+            await analyzer.analyze_screenshot(b"png-%d" % i)
+        await analyzer.analyze_screenshot(b"png-0")
+
+        assert len(analyzer._digest_cache) == size
+        assert calls[-1] == (b"png-0", None)
@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+# 导入被测试的模块
+from phone_mcp.tools import screen_interface
+from phone_mcp.tools.screen_interface import (
+    UIElement,
+    analyze_screen,
+    _dumps_with_screenshot,
+    _normalize_element,
+    _parse_bounds_batch,
+    _prune_elements,
+)
+from phone_mcp.tools.ui import invalidate_screen_caches
+
+
+class TestBoundsParsing:
+    """测试元素边界解析"""
+
+    def test_parse_bounds_batch(self):
+        """测试批量解析边界字符串，无效值返回None"""
+        result = _parse_bounds_batch(["[0,0][100,200]", "invalid", None, "[10,20][30,40]"])
+
+        assert result[0] == (0, 0, 100, 200, 50, 100)
+        assert result[1] is None
+        assert result[2] is None
+        assert result[3] == (10, 20, 30, 40, 20, 30)
+
+    def test_normalize_element_matches_ui_element(self):
+        """测试_normalize_element与UIElement.to_dict输出一致"""
+        elem = {
+            "text": "设置",
+            "resource_id": "com.example:id/settings",
+            "class_name": "android.widget.TextView",
+            "content_desc": "",
+            "clickable": True,
+            "bounds": "[0,100][200,300]",
+        }
+
+        assert _normalize_element(elem) == UIElement(elem).to_dict()
+
+    def test_normalize_element_invalid_bounds(self):
+        """测试无法解析边界时中心坐标为-1"""
+        result = _normalize_element({"text": "abc", "bounds": ""})
+
+        assert result["center_x"] == -1
+        assert result["center_y"] == -1
+
+
+class TestElementPruning:
+    """测试冗余UI节点裁剪"""
+
+    def test_prune_keeps_containers_of_meaningful_nodes(self):
+        """测试保留包含有意义节点的容器，删除空的布局节点"""
+        elements = [
+            {"class_name": "FrameLayout", "bounds": "[0,0][1080,1920]"},
+            {"text": "确定", "bounds": "[100,100][300,200]"},
+            {"class_name": "ImageView", "bounds": "[500,500][600,600]"},
+            {"resource_id": "com.example:id/icon", "bounds": "[700,700][800,800]"},
+        ]
+
+        result = _prune_elements(elements)
+
+        assert elements[0] in result
+        assert elements[1] in result
+        assert elements[2] not in result
+        assert elements[3] in result
+
+
+class TestScreenshotSerialization:
+    """测试截图字段的JSON拼接"""
+
+    def test_dumps_with_screenshot_is_valid_json(self):
+        """测试拼接截图后的输出与直接序列化结果一致"""
+        result = {"status": "success", "text": "设置", "screenshot": "iVBORw0KGgo+/="}
+        expected = dict(result)
+
+        assert json.loads(_dumps_with_screenshot(result)) == expected
+
+    def test_dumps_with_screenshot_keeps_input(self):
+        """测试序列化不会从传入的（可能被缓存的）字典中移除截图"""
+        result = {"status": "success", "screenshot": "iVBORw0KGgo="}
+        _dumps_with_screenshot(result)
+
+        assert result == {"status": "success", "screenshot": "iVBORw0KGgo="}
+
+    def test_dumps_with_only_screenshot(self):
+        """测试只有截图字段时仍输出合法JSON"""
+        result = {"screenshot": "iVBORw0KGgo="}
+
+        assert json.loads(_dumps_with_screenshot(result)) == result
+
+
+class TestAnalysisCaches:
+    """测试analyze_screen的焦点缓存、UI树摘要缓存及其失效"""
+
+    @pytest.fixture
+    def device(self, monkeypatch):
+        """模拟焦点窗口和UI树，记录实际分析的次数"""
+        state = {"focus": "Window{1 com.example/.Main}", "dump": "<hierarchy/>", "analyses": 0}
+
+        async def fake_current_focus():
+            return state["focus"]
+
+        async def fake_cached_dump():
+            return state["dump"]
+
+        async def fake_analyze_screen_dict(include_screenshot=False, max_elements=50, prune=False, ui_dump=None):
+            state["analyses"] += 1
+            return {"status": "success", "dump": ui_dump}
+
+        monkeypatch.setattr(screen_interface, "_current_focus", fake_current_focus)
+        monkeypatch.setattr(screen_interface, "_cached_dump", fake_cached_dump)
+        monkeypatch.setattr(screen_interface, "_analyze_screen_dict", fake_analyze_screen_dict)
+        invalidate_screen_caches()
+        yield state
+        invalidate_screen_caches()
+
+    async def test_same_focus_reuses_result(self, device):
+        """测试焦点窗口不变时直接返回缓存结果"""
+        first = await analyze_screen()
+        second = await analyze_screen()
+
+        assert second == first
+        assert device["analyses"] == 1
+
+    async def test_same_dump_reuses_result(self, device):
+        """测试焦点变化但UI树相同时按摘要命中缓存"""
+        await analyze_screen()
+        device["focus"] = "Window{2 com.example/.Other}"
+        await analyze_screen()
+
+        assert device["analyses"] == 1
+
+    async def test_invalidation_forces_new_analysis(self, device):
+        """测试输入操作清空缓存后重新分析"""
+        await analyze_screen()
+        invalidate_screen_caches()
+        device["dump"] = "<hierarchy><node/></hierarchy>"
+        result = json.loads(await analyze_screen())
+
+        assert device["analyses"] == 2
+        assert result["dump"] == device["dump"]
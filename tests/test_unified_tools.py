@@ -0,0 +1,183 @@
+import json
+
+import pytest
+
+from phone_mcp.core import adb_serial, json_dumps
+from phone_mcp.tools import screen_interface, ui, unified_tools
+
+
+def _analysis(*contents):
+    """构造只包含给定文本元素的分析结果"""
+    return {
+        "status": "success",
+        "screen_size": {"width": 1000, "height": 2000},
+        "elements": [
+            {"uuid": f"u{i}", "content": content, "description": "", "bbox": [0.1, 0.1, 0.3, 0.2]}
+            for i, content in enumerate(contents)
+        ],
+    }
+
+
+class FakeAnalyzer:
+    """按是否启用OCR返回不同分析结果，并记录每次分析的截图数据"""
+
+    def __init__(self, without_ocr, with_ocr):
+        self.results = {False: without_ocr, True: with_ocr}
+        self.calls = []
+
+    async def analyze_screenshot(self, image_data, use_paddleocr=None):
+        self.calls.append((image_data, use_paddleocr))
+        return self.results[use_paddleocr]
+
+
+class FakeInteractionManager:
+    """记录执行的元素操作"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def execute_action_by_uuid(self, uuid, action="tap", bias=False, analysis=None):
+        self.calls.append((uuid, action, analysis))
+        return {"status": "success"}
+
+
+class TestTargetAnalysisEscalation:
+    """测试目标查找从无OCR分析升级到PaddleOCR"""
+
+    @pytest.fixture
+    def stubs(self, monkeypatch):
+        screenshots = []
+
+        async def fake_screenshot():
+            screenshots.append(b"png")
+            return True, b"png"
+
+        manager = FakeInteractionManager()
+        monkeypatch.setattr(unified_tools, "take_screenshot_raw", fake_screenshot)
+        monkeypatch.setattr(unified_tools, "get_interaction_manager", lambda url: manager)
+        monkeypatch.setattr(unified_tools, "_analysis_escalations", {False: 0, True: 0})
+        return screenshots, manager
+
+    def install_analyzer(self, monkeypatch, analyzer):
+        monkeypatch.setattr(unified_tools, "get_screen_analyzer", lambda url: analyzer)
+
+    async def test_escalates_on_same_screenshot(self, monkeypatch, stubs):
+        """测试无OCR找不到目标时，用同一张截图做OCR分析并在其结果上执行点击"""
+        screenshots, manager = stubs
+        ocr_analysis = _analysis("图标", "设置")
+        analyzer = FakeAnalyzer(_analysis("图标"), ocr_analysis)
+        self.install_analyzer(monkeypatch, analyzer)
+
+        result = json.loads(await unified_tools.phone_screen_interact(
+            "tap", target="设置", bias=False, delay_seconds=0
+        ))
+
+        assert result["status"] == "success"
+        assert screenshots == [b"png"]
+        assert analyzer.calls == [(b"png", False), (b"png", True)]
+        assert unified_tools._analysis_escalations == {False: 0, True: 1}
+        assert manager.calls == [("u1", "tap", ocr_analysis)]
+
+    async def test_no_escalation_when_found_without_ocr(self, monkeypatch, stubs):
+        """测试无OCR分析已找到目标时不再做OCR分析"""
+        screenshots, manager = stubs
+        analyzer = FakeAnalyzer(_analysis("设置"), None)
+        self.install_analyzer(monkeypatch, analyzer)
+
+        result = json.loads(await unified_tools.phone_screen_interact(
+            "tap", target="设置", bias=False, delay_seconds=0
+        ))
+
+        assert result["status"] == "success"
+        assert analyzer.calls == [(b"png", False)]
+        assert unified_tools._analysis_escalations == {False: 1, True: 0}
+        assert manager.calls[0][0] == "u0"
+
+
+@pytest.fixture
+def fake_shell(monkeypatch):
+    """替换unified_tools使用的run_shell，按预设输出返回并记录命令"""
+    calls = []
+    replies = {}
+
+    async def fake_run_shell(cmd, timeout=None):
+        calls.append(cmd)
+        return replies.get(cmd, (True, ""))
+
+    monkeypatch.setattr(unified_tools, "run_shell", fake_run_shell)
+    return calls, replies
+
+
+class TestAdbScript:
+    """测试单次往返执行多条命令时的退出码解析"""
+
+    async def test_splits_output_and_exit_codes(self, fake_shell):
+        """测试按哨兵拆分每条命令的输出和退出码"""
+        calls, replies = fake_shell
+        script = "getprop a; echo __SEP__$?; false; echo __SEP__$?; echo x; echo __SEP__$?"
+        replies[script] = (True, "1\n__SEP__0\n__SEP__1\nx\n__SEP__0\n")
+
+        success, _, outputs = await unified_tools._run_adb_script(["getprop a", "false", "echo x"])
+
+        assert success
+        assert calls == [script]
+        assert outputs == [(True, "1"), (False, ""), (True, "x")]
+
+    async def test_failed_script_has_no_results(self, fake_shell):
+        """测试整个脚本失败时不返回逐条结果"""
+        calls, replies = fake_shell
+        replies["echo x; echo __SEP__$?"] = (False, "Command timed out after 30 seconds")
+
+        success, output, outputs = await unified_tools._run_adb_script(["echo x"])
+
+        assert not success
+        assert output.startswith("Command timed out")
+        assert outputs == []
+
+
+class TestScreenCacheInvalidation:
+    """测试改变屏幕的命令会清空所有屏幕缓存"""
+
+    @pytest.fixture
+    def cached_screen(self):
+        ui._ui_tree_cache["focus"] = (0.0, "<hierarchy/>")
+        screen_interface._focus_analysis_cache[("focus", 50, False)] = (0.0, "{}")
+        yield
+        ui.invalidate_screen_caches()
+
+    async def test_input_command_clears_caches(self, fake_shell, cached_screen):
+        """测试input命令执行后清空UI树和分析缓存"""
+        await unified_tools._run_device_shell("input tap 1 2")
+
+        assert not ui._ui_tree_cache
+        assert not screen_interface._focus_analysis_cache
+
+    async def test_query_command_keeps_caches(self, fake_shell, cached_screen):
+        """测试只读查询命令不清空缓存"""
+        await unified_tools._run_device_shell("getprop ro.product.model")
+
+        assert ui._ui_tree_cache
+        assert screen_interface._focus_analysis_cache
+
+
+class TestFanOut:
+    """测试多设备并发执行"""
+
+    async def test_runs_each_serial_in_its_own_context(self):
+        """测试每台设备在各自的adb_serial下执行，单台失败不影响其他设备"""
+        async def tool(action):
+            serial = adb_serial.get()
+            if serial == "B":
+                raise RuntimeError("device offline")
+            return json_dumps({"status": "success", "serial": serial})
+        tool.__wrapped__ = tool
+
+        result = await unified_tools._fan_out(tool, ["A", "B", "C"], action="home")
+
+        assert result["status"] == "error"
+        assert result["action"] == "home"
+        assert result["results"]["A"] == {"status": "success", "serial": "A"}
+        assert result["results"]["B"] == {"status": "error", "message": "device offline"}
+        assert result["results"]["C"] == {"status": "success", "serial": "C"}
+        # 调用方自己的adb_serial不受影响
+        assert adb_serial.get() is None